@@ -1,82 +1,355 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
 import pandas as pd
 
-from enrich import find_website
+import dns_cache
+import enrich
+import http_client
+import metrics
+from checkpoint import Checkpoint
+from result_writer import ROW_COLUMN, open_result_writer, read_results, write_xlsx
+from enrich import SearchThrottled, find_website
+from domain_guess import candidate_domains
 from utils import infer_country_from_domain
-from page_fetcher import fetch_pages
-from email_enrich import extract_email_from_soups
-from country_enrich import detect_country
+from page_fetcher import fetch_pages, fetch_stats, iter_pages, reset_fetch_stats
+from email_enrich import extract_email_from_soups, is_preferred_email
+from country_enrich import CONFIDENCE_HIGH, detect_country
+from loader import load_table
+from prepass import plan_rows, summarize_plan
 
 
 # =========================
 # Configuration
 # =========================
-INPUT_FILE = "data/companies.xlsx"
-OUTPUT_FILE = "data/test_output.xlsx"
+INPUT_FILE = "data/companies.xlsx"     # .xlsx / .csv / .parquet / .jsonl
+RESULTS_FILE = "data/test_output.csv"   # rows streamed as they finish (.csv / .parquet)
+OUTPUT_FILE = "data/test_output.xlsx"   # final xlsx conversion | None = stream only
 
 MAX_ROWS = None        # None = all rows | number = test subset (e.g. 10 / 50)
 PRINT_PROGRESS = True
 
+MAX_WORKERS = 8        # companies enriched in parallel (1 = one at a time)
+MAX_CONNECTIONS = 32   # global cap on in-flight HTTP requests
+MAX_PER_HOST = 2       # in-flight HTTP requests to a single host
+HOST_DELAY = 0.25      # seconds between request starts on one host
+
+CHECKPOINT_FILE = "data/checkpoint.jsonl"
+CHECKPOINT_EVERY = 25  # finished rows per checkpoint append
+RESUME = True          # True = skip rows already finished in CHECKPOINT_FILE
+
+PREPASS = True         # True = skip network stages the input already answers
+LAZY_FETCH = True      # True = stop fetching a site's pages once the email is
+                       # a preferred role address and the country is high confidence
+
+PRERESOLVE = True      # True = resolve known and guessed hosts up front;
+                       # NXDOMAIN hosts are then skipped without a fetch
+
+THROTTLE_RETRY_PASSES = 2   # extra passes over rows whose search stayed throttled
+THROTTLE_COOLDOWN = 120     # seconds to let the search engine cool down first
+
+METRICS_FILE = "data/metrics.json"   # per-stage metrics export | None = off
+
+RESULT_COLUMNS = ["Inferred_Website", "Inferred_Country",
+                  "Country_Confidence", "Inferred_Email"]
+
+
+# =========================
+# Enrichment
+# =========================
+def enrich_company(company: str, suffix_country: str | None = None,
+                   website: str | None = None,
+                   paths: list[str] | None = None) -> dict:
+    """
+    Run the full pipeline for one company.
+    suffix_country comes from the batch company-name pre-pass; a known
+    website skips the search, and paths limits the pages fetched.
+    Returns the RESULT_COLUMNS values that were found.
+    """
+    # 1. Find website
+    site = website or find_website(company, suffix_country)
+
+    if not site:
+        return {}
+
+    cctld_country = infer_country_from_domain(site)
+
+    def extract(pages: dict) -> tuple:
+        # Email and country from the pages fetched so far
+        with metrics.stage("email"):
+            email = extract_email_from_soups(pages)
+        with metrics.stage("country"):
+            country, confidence = detect_country(
+                company_name=company,
+                website=site,
+                cctld_country=cctld_country,
+                pages=list(pages.values()),
+                suffix_country=suffix_country,
+            )
+        return email, country, confidence
+
+    # 2. Fetch and parse pages once (shared between email + country)
+    if LAZY_FETCH:
+        # 3./4. Extract as each page arrives; stop once good enough
+        pages = {}
+        email, country, confidence = extract(pages)
+        page_stream = iter_pages(site, paths)
+        for path, doc in page_stream:
+            pages[path] = doc
+            email, country, confidence = extract(pages)
+            if is_preferred_email(email) and confidence == CONFIDENCE_HIGH:
+                break
+        page_stream.close()
+    else:
+        pages = fetch_pages(site, paths)
+        # 3. Extract email / 4. detect country (all signals)
+        email, country, confidence = extract(pages)
+
+    return {
+        "Inferred_Website": site,
+        "Inferred_Email": email,
+        "Inferred_Country": country,
+        "Country_Confidence": confidence,
+    }
+
+
+def enrich_row(company: str, **options) -> dict:
+    """enrich_company timed as one "row" stage."""
+    with metrics.stage("row") as timer:
+        result = enrich_company(company, **options)
+        if not result:
+            timer.outcome = "no_website"
+        return result
+
+
+def enrich_jobs(jobs, finish) -> list:
+    """
+    Enrich (i, company, options) jobs in a bounded worker pool, calling
+    finish(i, company, result) as each completes (result is None after
+    an error). Jobs whose search stayed throttled are returned instead,
+    to be retried once the search engine has cooled down.
+    """
+    throttled = []
+    pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        futures = {
+            pool.submit(enrich_row, company, **options): (i, company, options)
+            for i, company, options in jobs
+        }
+        for future in as_completed(futures):
+            i, company, options = futures[future]
+            try:
+                result = future.result()
+            except SearchThrottled:
+                throttled.append((i, company, options))
+                continue
+            except Exception as e:
+                print(f"[{i}] {company} | Error: {e}")
+                result = None
+            finish(i, company, result)
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        pool.shutdown()
+    return throttled
+
+
+def merge_prepass(plan_row, result: dict) -> dict:
+    """
+    Combine pre-pass answers with a worker result: website and email
+    already in the input are kept, everything else is filled in from
+    the result, and the pre-pass country stands when the result has none.
+    """
+    merged = {}
+    if plan_row["Prepass_Country"]:
+        merged["Inferred_Country"] = plan_row["Prepass_Country"]
+        merged["Country_Confidence"] = plan_row["Prepass_Confidence"]
+    merged.update({k: v for k, v in result.items() if v is not None})
+    if plan_row["Known_Website"]:
+        merged["Inferred_Website"] = plan_row["Known_Website"]
+    if plan_row["Known_Email"]:
+        merged["Inferred_Email"] = plan_row["Known_Email"]
+    return merged
+
+
+def hosts_to_resolve(jobs) -> list[str]:
+    """Hosts the queued rows will fetch first: known sites and guesses."""
+    hosts = set()
+    for _, company, options in jobs:
+        if options.get("website"):
+            hosts.add(urlparse(options["website"]).hostname)
+        elif enrich.DOMAIN_GUESS:
+            hosts.update(candidate_domains(company, options["suffix_country"]))
+    hosts.discard(None)
+    return sorted(hosts)
+
+
+def print_progress(i, company: str, result: dict) -> None:
+    if not result:
+        print(f"[{i}] {company} | No valid website found")
+        return
+    print(f"[{i}] {company} | {result.get('Inferred_Website')} | "
+          f"{result.get('Inferred_Country')} ({result.get('Country_Confidence')}) | "
+          f"{result.get('Inferred_Email')}")
+
 
 # =========================
 # Main
 # =========================
 def main():
     # Load data
-    df = pd.read_excel(INPUT_FILE)
+    df = load_table(INPUT_FILE)
 
     # Optional limit for testing
     if MAX_ROWS:
         df = df.head(MAX_ROWS)
 
     # Ensure columns exist
-    for col in ["Inferred_Website", "Inferred_Country",
-                "Country_Confidence", "Inferred_Email"]:
+    for col in RESULT_COLUMNS:
         if col not in df.columns:
             df[col] = None
 
-    # Iterate companies
-    for i, row in df.iterrows():
-        company = str(row.get("Company Name", "")).strip()
+    http_client.configure_limits(MAX_CONNECTIONS, MAX_PER_HOST, HOST_DELAY)
+    http_client.reset_connection_stats()
+    reset_fetch_stats()
+    metrics.reset()
+
+    # Restore finished rows from a previous, interrupted run
+    checkpoint = Checkpoint(CHECKPOINT_FILE, CHECKPOINT_EVERY)
+    if RESUME:
+        done = checkpoint.load()
+    else:
+        checkpoint.reset()
+        done = {}
+
+    # Every row is streamed to RESULTS_FILE once it is settled; a resumed
+    # run appends, and read_results keeps the last copy of each row.
+    writer = open_result_writer(RESULTS_FILE, [ROW_COLUMN, *df.columns],
+                                append=bool(done))
+
+    def emit(i, result: dict) -> None:
+        writer.append({ROW_COLUMN: i, **df.loc[i].to_dict(), **result})
+
+    # Free signals first: suffix / ccTLD country and known answers for
+    # every row decide which network stages each row still needs
+    plan = plan_rows(df)
+    if PREPASS:
+        summary = summarize_plan(plan)
+        for key, value in summary.items():
+            metrics.count(f"prepass.{key}", value)
+        print(f"Pre-pass: {summary['offline_rows']} of {summary['rows']} rows "
+              f"need no network; {summary['requests_avoided']} requests avoided "
+              f"({summary['searches_avoided']} searches, "
+              f"{summary['page_fetches_avoided']} page fetches)")
 
-        if not company:
-            continue
+    try:
+        # Collect companies to enrich
+        jobs = []
+        resumed = 0
+        for i, row in df.iterrows():
+            company = str(row.get("Company Name", "")).strip()
+            if not company:
+                emit(i, {})
+                continue
 
-        # 1. Find website
-        site = find_website(company)
+            previous = done.get(i)
+            if previous and previous["company"] == company:
+                emit(i, previous["result"])
+                resumed += 1
+                continue
 
-        if not site:
+            row_plan = plan.loc[i]
+            options = {"suffix_country": row_plan["Suffix_Country"]}
+            if PREPASS:
+                if not row_plan["Needs_Search"] and not row_plan["Pages"]:
+                    emit(i, merge_prepass(row_plan, {}))
+                    continue
+                options["website"] = row_plan["Known_Website"]
+                options["paths"] = row_plan["Pages"]
+
+            jobs.append((i, company, options))
+
+        if resumed:
+            print(f"Resumed {resumed} finished rows from: {CHECKPOINT_FILE}")
+
+        if PRERESOLVE and jobs:
+            dns_cache.install()
+            with metrics.stage("dns"):
+                dns = dns_cache.preresolve(hosts_to_resolve(jobs))
+            for key, value in dns.items():
+                metrics.count(f"dns.{key}", value)
+            print(f"DNS: {dns['resolved']} hosts resolved, "
+                  f"{dns['nxdomain']} NXDOMAIN, {dns['failed']} left to the system")
+
+        def finish(i, company, result):
+            if result is None:
+                emit(i, {})
+                return
+            if PREPASS:
+                result = merge_prepass(plan.loc[i], result)
+            emit(i, result)
+            checkpoint.record(i, company, result)
             if PRINT_PROGRESS:
-                print(f"[{i}] {company} | No valid website found")
-            continue
-
-        df.at[i, "Inferred_Website"] = site
-
-        # 2. Fetch pages once (shared between email + country)
-        soups = fetch_pages(site)
-
-        # 3. Extract email from pre-fetched pages
-        email = extract_email_from_soups(soups)
-        df.at[i, "Inferred_Email"] = email
-
-        # 4. Detect country (all signals)
-        cctld_country = infer_country_from_domain(site)
-        soup_list = list(soups.values())
-        country, confidence = detect_country(
-            company_name=company,
-            website=site,
-            cctld_country=cctld_country,
-            soups=soup_list,
-        )
-        df.at[i, "Inferred_Country"] = country
-        df.at[i, "Country_Confidence"] = confidence
-
-        if PRINT_PROGRESS:
-            print(f"[{i}] {company} | {site} | "
-                  f"{country} ({confidence}) | {email}")
+                print_progress(i, company, result)
+
+        # Enrich in a bounded worker pool; results are streamed with their
+        # row label, so completion order does not matter. Rows the search
+        # engine kept throttling are queued again after a cooldown.
+        try:
+            throttled = enrich_jobs(jobs, finish)
+            for _ in range(THROTTLE_RETRY_PASSES):
+                if not throttled:
+                    break
+                metrics.count("search.requeued", len(throttled))
+                print(f"{len(throttled)} rows throttled by search; "
+                      f"retrying in {THROTTLE_COOLDOWN}s")
+                time.sleep(THROTTLE_COOLDOWN)
+                throttled = enrich_jobs(throttled, finish)
+        except KeyboardInterrupt:
+            print(f"\nInterrupted. Progress saved to: {CHECKPOINT_FILE}")
+            raise
+
+        # Still throttled: leave them blank for now, unrecorded, so the
+        # next run (which keeps the checkpoint) searches them again
+        for i, company, _ in throttled:
+            print(f"[{i}] {company} | Search still throttled")
+            emit(i, {})
+    finally:
+        writer.close()
+        checkpoint.flush()
 
     # Save results
-    df.to_excel(OUTPUT_FILE, index=False)
-    print(f"\nFinished. Output saved to: {OUTPUT_FILE}")
+    if OUTPUT_FILE:
+        numeric = [col for col in df.columns
+                   if pd.api.types.is_numeric_dtype(df[col])]
+        write_xlsx(read_results(RESULTS_FILE, numeric), OUTPUT_FILE)
+        print(f"\nFinished. Output saved to: {OUTPUT_FILE}")
+    else:
+        print(f"\nFinished. Results streamed to: {RESULTS_FILE}")
+    if throttled:
+        print(f"{len(throttled)} rows were left unsearched (throttled); "
+              f"rerun to retry them. Progress kept in: {CHECKPOINT_FILE}")
+    else:
+        checkpoint.reset()
+
+    report_metrics()
+
+
+def report_metrics() -> None:
+    """Fold run-wide stats into the metrics, print them and export JSON."""
+    for key, value in http_client.connection_stats().items():
+        metrics.count(f"http.{key}", value)
+    for key, value in fetch_stats().items():
+        metrics.count(f"pages.{key}", value)
+
+    snap = metrics.snapshot()
+    print()
+    print(metrics.summary_table(snap))
+    if METRICS_FILE:
+        metrics.write_json(METRICS_FILE, snap)
+        print(f"Metrics saved to: {METRICS_FILE}")
 
 
 # =========================
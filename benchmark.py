@@ -0,0 +1,154 @@
+"""
+Offline end-to-end throughput benchmark.
+Runs agent.main against a SyntheticWeb on localhost (synthetic company
+sites plus a fake DuckDuckGo) with all on-disk caches off, and reports
+companies per second, requests and searches per company, peak Python
+memory and result hit rates.
+"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+import agent
+import domain_guess
+import enrich
+import http_client
+import loader
+import search_limiter
+from result_writer import read_results
+from synthetic_web import SiteProfile, SyntheticWeb, company_name, route_all_hosts
+
+
+# =========================
+# Configuration
+# =========================
+COMPANIES = 200
+PROFILE = SiteProfile()
+
+# Agent limits for the run; None = keep agent's own setting
+MAX_WORKERS = None
+MAX_PER_HOST = None
+HOST_DELAY = None
+SEARCH_RATE = None   # starting search queries/s; None = search_limiter default
+DOMAIN_GUESS = True  # try <name>.<tld> before searching
+
+REPORT_FILE = None   # e.g. "data/benchmark.json" | None = print only
+
+
+@contextmanager
+def _patched(module, **values):
+    """Temporarily set module globals, restoring them afterwards."""
+    saved = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+def _limits() -> dict:
+    overrides = {"MAX_WORKERS": MAX_WORKERS, "MAX_PER_HOST": MAX_PER_HOST,
+                 "HOST_DELAY": HOST_DELAY}
+    return {name: value for name, value in overrides.items() if value is not None}
+
+
+def _search_limiter() -> search_limiter.AdaptiveRateLimiter:
+    """A fresh limiter, so each run starts from the same search rate."""
+    if SEARCH_RATE is None:
+        return search_limiter.AdaptiveRateLimiter()
+    return search_limiter.AdaptiveRateLimiter(
+        rate=SEARCH_RATE,
+        max_rate=max(SEARCH_RATE, search_limiter.SEARCH_MAX_RATE))
+
+
+def run_benchmark(companies: int = COMPANIES,
+                  profile: SiteProfile | None = None) -> dict:
+    """Enrich `companies` synthetic companies and return the report."""
+    profile = profile or PROFILE
+    with tempfile.TemporaryDirectory() as workdir, \
+            SyntheticWeb(profile) as web, route_all_hosts():
+        input_file = os.path.join(workdir, "companies.xlsx")
+        results_file = os.path.join(workdir, "results.csv")
+        pd.DataFrame(
+            {"Company Name": [company_name(n) for n in range(companies)]}
+        ).to_excel(input_file, index=False)
+
+        with _patched(agent, INPUT_FILE=input_file, RESULTS_FILE=results_file,
+                      OUTPUT_FILE=None, MAX_ROWS=None, PRINT_PROGRESS=False,
+                      RESUME=False, METRICS_FILE=None, PRERESOLVE=False,
+                      CHECKPOINT_FILE=os.path.join(workdir, "checkpoint.jsonl"),
+                      **_limits()), \
+                _patched(enrich, SEARCH_URL=web.search_url,
+                         SEARCH_CACHE_ENABLED=False, _search_cache=None,
+                         _search_limiter=_search_limiter(),
+                         DOMAIN_GUESS=DOMAIN_GUESS), \
+                _patched(domain_guess, GUESS_URL=web.guess_url), \
+                _patched(loader, SIDECAR_CACHE=False), \
+                _patched(http_client, CACHE_ENABLED=False, _cache=None,
+                         DEAD_HOSTS_ENABLED=False, _dead_hosts=None,
+                         # Anything that still reached a cache would write
+                         # into workdir, not the caller's data/
+                         CACHE_PATH=os.path.join(workdir, "http_cache.sqlite"),
+                         DEAD_HOSTS_PATH=os.path.join(workdir, "dead_hosts.sqlite"),
+                         _breaker=http_client.CircuitBreaker(), _session=None):
+            tracemalloc.start()
+            start = time.perf_counter()
+            # main returns once every worker pool has drained (guess and
+            # prefetch pools included), so no request outlives the patches
+            agent.main()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            http = http_client.connection_stats()
+
+        results = read_results(results_file)
+
+    return {
+        "companies": companies,
+        "seconds": round(elapsed, 3),
+        "companies_per_second": round(companies / elapsed, 2),
+        "requests_per_company": round(http["requests"] / companies, 2),
+        "server_requests": web.requests_served,
+        "searches_per_company": round(web.searches_served / companies, 2),
+        "connections": http["connections"],
+        "peak_memory_mb": round(peak / 1024 ** 2, 1),
+        "website_rate": round(results["Inferred_Website"].notna().mean(), 3),
+        "email_rate": round(results["Inferred_Email"].notna().mean(), 3),
+        "country_rate": round(results["Inferred_Country"].notna().mean(), 3),
+    }
+
+
+def format_report(report: dict) -> str:
+    width = max(len(key) for key in report)
+    return "\n".join(f"{key:<{width}}  {value}" for key, value in report.items())
+
+
+# =========================
+# Main
+# =========================
+def main():
+    report = run_benchmark()
+    print("\nBenchmark")
+    print(format_report(report))
+    if REPORT_FILE:
+        directory = os.path.dirname(REPORT_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(REPORT_FILE, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {REPORT_FILE}")
+
+
+# =========================
+# Entry point
+# =========================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Append-only checkpoint of finished enrichment rows (JSON Lines).
+Each finished row is one small line, so saving progress never rewrites
+the workbook, and a resumed run can skip rows that are already done.
+"""
+
+import json
+import os
+import threading
+
+
+# =========================
+# Configuration
+# =========================
+CHECKPOINT_EVERY = 25   # finished rows buffered before each append + fsync
+
+
+class Checkpoint:
+    """Buffered JSONL log of {row, company, result} records."""
+
+    def __init__(self, path: str, flush_every: int = CHECKPOINT_EVERY):
+        self.path = path
+        self.flush_every = flush_every
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> dict[int, dict]:
+        """
+        Read finished rows as {row: {"company": ..., "result": {...}}}.
+        A torn last line from a crash is ignored.
+        """
+        done = {}
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                done[record["row"]] = {
+                    "company": record["company"],
+                    "result": record["result"],
+                }
+        return done
+
+    def record(self, row: int, company: str, result: dict) -> None:
+        line = json.dumps(
+            {"row": int(row), "company": company, "result": result},
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        # A torn last line from a crash must not swallow the next record
+        lead = "\n" if self._ends_torn() else ""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lead + "\n".join(self._buffer) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._buffer.clear()
+
+    def _ends_torn(self) -> bool:
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:   # missing or empty file
+            return False
+
+    def reset(self) -> None:
+        """Discard all saved progress."""
+        with self._lock:
+            self._buffer.clear()
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -4,8 +4,20 @@ No extra HTTP requests -- operates on already-fetched HTML.
 """
 
 import re
+
+import numpy as np
+import pandas as pd
 from bs4 import BeautifulSoup
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # batch suffix inference falls back to pure Python
+    pa = None
+    pc = None
+
+from page_document import PageDocument, as_document
+
 
 # ============================================================
 # Signal 1: Company name suffix -> country
@@ -37,15 +49,102 @@ COMPANY_SUFFIX_MAP = [
 ]
 
 
+COMPANY_SUFFIX_REGEXES = [
+    (re.compile(pattern, re.IGNORECASE), country)
+    for pattern, country in COMPANY_SUFFIX_MAP
+]
+
+# Only suffixes that name a country can change a result: a name matching
+# none of them resolves to None whether or not an ambiguous one matches.
+SPECIFIC_SUFFIXES = [
+    (pattern, country) for pattern, country in COMPANY_SUFFIX_MAP if country
+]
+
+# Single alternation of every country-specific suffix: one full-column
+# pass of the batch API finds the names carrying any of them.
+SPECIFIC_SUFFIX_ALTERNATION = "|".join(
+    f"(?:{pattern})" for pattern, _ in SPECIFIC_SUFFIXES
+)
+SPECIFIC_SUFFIX_REGEX = re.compile(SPECIFIC_SUFFIX_ALTERNATION, re.IGNORECASE)
+
+
 def infer_country_from_company_name(company_name: str) -> str | None:
     if not company_name:
         return None
-    for pattern, country in COMPANY_SUFFIX_MAP:
-        if re.search(pattern, company_name, re.IGNORECASE):
+    for regex, country in COMPANY_SUFFIX_REGEXES:
+        if regex.search(company_name):
             return country
     return None
 
 
+def _suffix_countries_python(names) -> list[str | None]:
+    """
+    The alternation filters the names with one Series.str.contains pass;
+    only the hits are resolved pattern by pattern, in map order.
+    """
+    text = pd.Series([str(name) for name in names], dtype=object)
+    countries = [None] * len(text)
+    hits = text.str.contains(SPECIFIC_SUFFIX_REGEX)
+    for pos in np.flatnonzero(hits.to_numpy(dtype=bool)):
+        countries[pos] = infer_country_from_company_name(text[pos])
+    return countries
+
+
+def _suffix_countries_arrow(names) -> list[str | None]:
+    """
+    Vectorized suffix lookup with pyarrow's RE2 kernels: one pass of the
+    combined alternation finds the names carrying any country suffix,
+    then only those candidates are resolved in COMPANY_SUFFIX_MAP order.
+    RE2's word boundaries and whitespace class only know ASCII, so names
+    with other characters (Ş, Ä, non-breaking spaces) go through the re
+    module instead.
+    """
+    try:
+        arr = pa.array(names, type=pa.string())
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        arr = pa.array([str(name) for name in names], type=pa.string())
+
+    countries = np.full(len(arr), None, dtype=object)
+    is_ascii = pc.string_is_ascii(arr).to_numpy(zero_copy_only=False)
+    non_ascii = np.flatnonzero(~is_ascii)
+    countries[non_ascii] = _suffix_countries_python(
+        arr.take(pa.array(non_ascii, type=pa.int64())).to_pylist())
+
+    hits = pc.match_substring_regex(arr, SPECIFIC_SUFFIX_ALTERNATION,
+                                    ignore_case=True)
+    remaining = np.flatnonzero(hits.to_numpy(zero_copy_only=False) & is_ascii)
+
+    for pattern, country in SPECIFIC_SUFFIXES:
+        if not len(remaining):
+            break
+        subset = arr.take(pa.array(remaining))
+        matched = pc.match_substring_regex(subset, pattern, ignore_case=True)
+        matched = matched.to_numpy(zero_copy_only=False)
+        countries[remaining[matched]] = country
+        remaining = remaining[~matched]
+
+    return countries.tolist()
+
+
+def infer_country_from_company_names(names: pd.Series) -> pd.Series:
+    """
+    Batch version of infer_country_from_company_name for a whole column,
+    cheap enough to run as a pre-pass before any network work.
+    Each distinct name is resolved once and mapped back; results match
+    the per-name function. Returns an object Series aligned with names
+    (None = no country).
+    """
+    codes, distinct = pd.factorize(names)
+    if pa is not None:
+        countries = _suffix_countries_arrow(distinct)
+    else:
+        countries = _suffix_countries_python(distinct)
+
+    # Missing names have code -1, which picks the trailing None
+    lookup = np.array(countries + [None], dtype=object)
+    return pd.Series(lookup[codes], index=names.index, dtype=object)
+
+
 # ============================================================
 # Signal 2: HTML lang attribute
 # ============================================================
@@ -85,11 +184,12 @@ LANG_TO_COUNTRY = {
 }
 
 
-def infer_country_from_html_lang(soups: list[BeautifulSoup]) -> str | None:
-    for soup in soups:
-        html_tag = soup.find("html")
-        if html_tag and html_tag.get("lang"):
-            lang = html_tag["lang"].strip().lower()
+def infer_country_from_html_lang(
+    pages: list[PageDocument | BeautifulSoup],
+) -> str | None:
+    for page in pages:
+        lang = as_document(page).lang
+        if lang:
             if lang.startswith("en"):
                 continue
             # Exact match first, then base language
@@ -184,12 +284,13 @@ PHONE_CODE_TO_COUNTRY = {
 }
 
 
-def infer_country_from_phone_numbers(soups: list[BeautifulSoup]) -> str | None:
+def infer_country_from_phone_numbers(
+    pages: list[PageDocument | BeautifulSoup],
+) -> str | None:
     country_votes: dict[str, int] = {}
 
-    for soup in soups:
-        text = soup.get_text(" ", strip=True)
-        matches = PHONE_REGEX.findall(text)
+    for page in pages:
+        matches = PHONE_REGEX.findall(as_document(page).text)
         for code in matches:
             country = None
             if code[:3] in PHONE_CODE_TO_COUNTRY:
@@ -264,29 +365,58 @@ ADDRESS_COUNTRY_KEYWORDS = {
 }
 
 
-def infer_country_from_address_text(soups: list[BeautifulSoup]) -> str | None:
+def build_keyword_regex(keywords) -> re.Pattern:
+    """
+    Compile keywords into one word-bounded regex for a single-pass scan.
+    The alternation is factored as a prefix trie, so each text position
+    branches on its next character instead of retrying every keyword;
+    the table can grow to hundreds of entries without slowing the scan.
+    Spaces inside a keyword match any run of whitespace.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of keyword
+
+    def _pattern(node: dict) -> str:
+        ends_here = "" in node
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + _pattern(child)
+            for ch, child in sorted(node.items())
+            if ch
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if ends_here else group
+
+    return re.compile(rf"(?<!\w){_pattern(trie)}(?!\w)")
+
+
+# Rebuild after changing ADDRESS_COUNTRY_KEYWORDS at runtime
+ADDRESS_KEYWORD_REGEX = build_keyword_regex(ADDRESS_COUNTRY_KEYWORDS)
+
+
+def infer_country_from_address_text(
+    pages: list[PageDocument | BeautifulSoup],
+) -> str | None:
     country_votes: dict[str, int] = {}
 
-    for soup in soups:
+    for page in pages:
         # Prioritize structured address-like elements
-        candidates = soup.find_all(["footer", "address"])
-        for el in soup.find_all(["div", "section", "p"], limit=200):
-            el_id = (el.get("id") or "").lower()
-            el_class = " ".join(el.get("class") or []).lower()
-            if any(kw in el_id or kw in el_class
-                   for kw in ("contact", "address", "footer", "location", "impressum")):
-                candidates.append(el)
-
-        texts = []
-        if candidates:
-            texts = [el.get_text(" ", strip=True).lower() for el in candidates]
-        else:
-            texts = [soup.get_text(" ", strip=True).lower()]
+        texts = as_document(page).address_texts
 
         for text in texts:
-            for keyword, country in ADDRESS_COUNTRY_KEYWORDS.items():
-                if keyword in text:
-                    country_votes[country] = country_votes.get(country, 0) + 1
+            # Each distinct keyword in a text is one vote
+            found = {" ".join(m.group().split())
+                     for m in ADDRESS_KEYWORD_REGEX.finditer(text)}
+            for keyword in found:
+                country = ADDRESS_COUNTRY_KEYWORDS[keyword]
+                country_votes[country] = country_votes.get(country, 0) + 1
 
     if not country_votes:
         return None
@@ -351,16 +481,22 @@ def detect_country(
     company_name: str,
     website: str,
     cctld_country: str | None,
-    soups: list[BeautifulSoup],
+    pages: list[PageDocument | BeautifulSoup],
+    suffix_country: str | None = None,
 ) -> tuple[str | None, str]:
     """
     Main entry point. Runs all signal extractors and resolves.
+    Each page is wrapped once so the extractors share its text views.
+    suffix_country may come from a batch pre-pass
+    (infer_country_from_company_names); otherwise it is computed here.
     Returns (country_name, confidence).
     """
-    suffix_country = infer_country_from_company_name(company_name)
-    lang_country = infer_country_from_html_lang(soups)
-    phone_country = infer_country_from_phone_numbers(soups)
-    address_country = infer_country_from_address_text(soups)
+    pages = [as_document(page) for page in pages]
+    if suffix_country is None:
+        suffix_country = infer_country_from_company_name(company_name)
+    lang_country = infer_country_from_html_lang(pages)
+    phone_country = infer_country_from_phone_numbers(pages)
+    address_country = infer_country_from_address_text(pages)
 
     return resolve_country(
         cctld_country=cctld_country,
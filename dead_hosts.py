@@ -0,0 +1,80 @@
+"""
+Persistent negative cache of unreachable hosts (SQLite).
+A host whose circuit breaker opened is recorded with an expiry, so the
+next run skips it instead of waiting out its timeouts again. Hosts that
+failed DNS stay dead longer than ones that timed out or refused.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+
+# =========================
+# Configuration
+# =========================
+DEAD_HOST_TTL = 24 * 3600           # seconds a timed-out / refusing host is skipped
+DNS_DEAD_HOST_TTL = 7 * 24 * 3600   # seconds a host that failed DNS is skipped
+
+
+class DeadHostCache:
+    """Thread-safe SQLite set of dead hosts, each with its own expiry."""
+
+    def __init__(self, path: str, ttl: float = DEAD_HOST_TTL,
+                 dns_ttl: float = DNS_DEAD_HOST_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.dns_ttl = dns_ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS dead_hosts ("
+            " host TEXT PRIMARY KEY,"
+            " reason TEXT,"
+            " failed_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def is_dead(self, host: str) -> bool:
+        """True while host has an unexpired entry."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires_at FROM dead_hosts WHERE host = ?", (host,)
+            ).fetchone()
+        return row is not None and row[0] > time.time()
+
+    def mark_dead(self, host: str, reason: str, dns: bool = False) -> None:
+        now = time.time()
+        ttl = self.dns_ttl if dns else self.ttl
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO dead_hosts"
+                " (host, reason, failed_at, expires_at) VALUES (?, ?, ?, ?)",
+                (host, reason, now, now + ttl),
+            )
+            self._db.commit()
+
+    def revive(self, host: str) -> None:
+        """Forget a host (e.g. after it answered again)."""
+        with self._lock:
+            self._db.execute("DELETE FROM dead_hosts WHERE host = ?", (host,))
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM dead_hosts WHERE expires_at > ?",
+                (time.time(),),
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
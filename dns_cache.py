@@ -0,0 +1,307 @@
+"""
+In-process DNS cache with concurrent pre-resolution.
+Hosts a run is about to fetch are resolved ahead of time by a small
+asyncio UDP client (A records only), and the answers are kept for their
+TTL. Once install()ed, urllib3 connects to cached addresses without a
+blocking lookup, and hosts answered NXDOMAIN are reported by
+is_nxdomain() so their fetches can be skipped outright.
+"""
+
+import asyncio
+import random
+import socket
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import urllib3.util.connection
+
+
+# =========================
+# Configuration
+# =========================
+NAMESERVER = None          # (ip, port) | None = first entry of RESOLV_CONF
+RESOLV_CONF = "/etc/resolv.conf"
+DNS_TIMEOUT = 2.0          # seconds per query attempt
+DNS_RETRIES = 1            # extra attempts after a timeout
+CONCURRENCY = 64           # queries in flight during pre-resolution
+
+MIN_TTL = 60               # clamp server TTLs into [MIN_TTL, MAX_TTL]
+MAX_TTL = 3600
+NEGATIVE_TTL = 3600        # seconds an NXDOMAIN answer is trusted
+
+TYPE_A = 1
+CLASS_IN = 1
+RCODE_NXDOMAIN = 3
+
+
+class DNSError(Exception):
+    """A query timed out, failed (SERVFAIL/REFUSED) or was malformed."""
+
+
+@dataclass
+class Answer:
+    host: str
+    addresses: list[str]
+    ttl: int
+    nxdomain: bool = False
+
+
+# =========================
+# Wire format
+# =========================
+def build_query(qid: int, host: str) -> bytes:
+    """A recursive A/IN query for host; DNSError if host is not a valid name."""
+    header = struct.pack("!HHHHHH", qid, 0x0100, 1, 0, 0, 0)
+    try:
+        labels = host.rstrip(".").encode("idna").split(b".")
+    except UnicodeError as e:   # empty or over-long label, bad IDN
+        raise DNSError(f"{host!r}: invalid host name ({e})")
+    if any(not 0 < len(label) < 64 for label in labels):
+        raise DNSError(f"{host!r}: invalid host name")
+    qname = b"".join(bytes([len(label)]) + label for label in labels) + b"\x00"
+    return header + qname + struct.pack("!HH", TYPE_A, CLASS_IN)
+
+
+def _skip_name(data: bytes, offset: int) -> int:
+    """Offset just past the (possibly compressed) name at offset."""
+    while True:
+        if offset >= len(data):
+            raise DNSError("truncated name")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:   # compression pointer ends the name
+            return offset + 2
+        offset += 1
+        if length == 0:
+            return offset
+        offset += length
+
+
+def parse_response(data: bytes, qid: int, host: str) -> Answer:
+    """Answer for host from a response to query qid."""
+    if len(data) < 12:
+        raise DNSError("short response")
+    rid, flags, qdcount, ancount, _, _ = struct.unpack("!HHHHHH", data[:12])
+    if rid != qid:
+        raise DNSError("mismatched query id")
+    rcode = flags & 0x000F
+    if rcode == RCODE_NXDOMAIN:
+        return Answer(host, [], NEGATIVE_TTL, nxdomain=True)
+    if rcode != 0:
+        raise DNSError(f"rcode {rcode}")
+
+    offset = 12
+    for _ in range(qdcount):
+        offset = _skip_name(data, offset) + 4
+
+    addresses, ttls = [], []
+    for _ in range(ancount):
+        offset = _skip_name(data, offset)
+        rtype, rclass, ttl, rdlength = struct.unpack(
+            "!HHIH", data[offset:offset + 10])
+        offset += 10
+        # CNAME chains come back with the target's A records alongside
+        if rtype == TYPE_A and rclass == CLASS_IN and rdlength == 4:
+            addresses.append(socket.inet_ntoa(data[offset:offset + 4]))
+            ttls.append(ttl)
+        offset += rdlength
+    return Answer(host, addresses, min(ttls) if ttls else MIN_TTL)
+
+
+def system_nameserver(path: str | None = None) -> tuple[str, int] | None:
+    """First IPv4 nameserver in resolv.conf, or None."""
+    try:
+        with open(path or RESOLV_CONF, encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver" \
+                        and "." in parts[1]:
+                    return (parts[1], 53)
+    except OSError:
+        pass
+    return None
+
+
+# =========================
+# Async client
+# =========================
+class _QueryProtocol(asyncio.DatagramProtocol):
+    def __init__(self, qid: int, host: str, done: asyncio.Future):
+        self.qid = qid
+        self.host = host
+        self.done = done
+
+    def datagram_received(self, data, addr):
+        if self.done.done():
+            return
+        try:
+            self.done.set_result(parse_response(data, self.qid, self.host))
+        except DNSError as e:
+            if str(e) != "mismatched query id":   # stray reply: keep waiting
+                self.done.set_exception(e)
+
+    def error_received(self, exc):
+        if not self.done.done():
+            self.done.set_exception(DNSError(str(exc)))
+
+
+async def query(host: str, nameserver: tuple[str, int],
+                timeout: float | None = None,
+                retries: int | None = None) -> Answer:
+    """Resolve host's A records; raises DNSError on failure."""
+    timeout = DNS_TIMEOUT if timeout is None else timeout
+    retries = DNS_RETRIES if retries is None else retries
+    loop = asyncio.get_running_loop()
+    for attempt in range(retries + 1):
+        qid = random.getrandbits(16)
+        done = loop.create_future()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _QueryProtocol(qid, host, done), remote_addr=nameserver)
+        try:
+            transport.sendto(build_query(qid, host))
+            return await asyncio.wait_for(done, timeout)
+        except asyncio.TimeoutError:
+            if attempt == retries:
+                raise DNSError(f"{host}: timed out")
+        finally:
+            transport.close()
+
+
+async def _resolve_many(hosts: list[str], nameserver: tuple[str, int],
+                        concurrency: int) -> list[Answer | DNSError]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(host):
+        async with semaphore:
+            try:
+                return await query(host, nameserver)
+            except (DNSError, OSError) as e:
+                return DNSError(f"{host}: {e}")
+
+    return await asyncio.gather(*(_one(host) for host in hosts))
+
+
+# =========================
+# Cache
+# =========================
+class DNSCache:
+    """Thread-safe host -> addresses table with per-entry expiry."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[float, Answer]] = {}
+
+    def put(self, answer: Answer) -> None:
+        ttl = answer.ttl if answer.nxdomain else \
+            min(MAX_TTL, max(MIN_TTL, answer.ttl))
+        with self._lock:
+            self._entries[answer.host.lower()] = (self._clock() + ttl, answer)
+
+    def get(self, host: str) -> Answer | None:
+        """The live answer for host, or None if unknown or expired."""
+        host = (host or "").lower()
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                del self._entries[host]
+                return None
+            return entry[1]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_cache = DNSCache()
+
+
+def is_nxdomain(host: str | None) -> bool:
+    """True if host was recently answered NXDOMAIN."""
+    answer = _cache.get(host) if host else None
+    return answer is not None and answer.nxdomain
+
+
+def cached_addresses(host: str | None) -> list[str]:
+    answer = _cache.get(host) if host else None
+    return answer.addresses if answer is not None else []
+
+
+def preresolve(hosts, nameserver: tuple[str, int] | None = None,
+               concurrency: int = CONCURRENCY) -> dict[str, int]:
+    """
+    Resolve hosts concurrently (those already cached are skipped) and
+    cache the answers. Failed queries are not cached, so those hosts
+    fall back to the system resolver. Returns counts of hosts resolved,
+    nxdomain and failed.
+    """
+    stats = {"resolved": 0, "nxdomain": 0, "failed": 0}
+    nameserver = nameserver or NAMESERVER or system_nameserver()
+    pending = sorted({h.lower() for h in hosts if h and _cache.get(h) is None})
+    if not pending or nameserver is None:
+        stats["failed"] = len(pending)
+        return stats
+
+    answers = asyncio.run(_resolve_many(pending, nameserver, concurrency))
+    for answer in answers:
+        if isinstance(answer, DNSError):
+            stats["failed"] += 1
+            continue
+        if answer.nxdomain:
+            stats["nxdomain"] += 1
+        elif answer.addresses:
+            stats["resolved"] += 1
+        else:
+            stats["failed"] += 1   # no A record: leave it to the system
+            continue
+        _cache.put(answer)
+    return stats
+
+
+def clear() -> None:
+    global _cache
+    _cache = DNSCache()
+
+
+# =========================
+# urllib3 hook
+# =========================
+_original_create_connection = urllib3.util.connection.create_connection
+
+
+def _create_connection(address, *args, **kwargs):
+    """create_connection that dials cached addresses directly."""
+    host, port = address
+    if is_nxdomain(host):
+        raise socket.gaierror(socket.EAI_NONAME, f"{host}: NXDOMAIN (cached)")
+    error = None
+    for ip in cached_addresses(host):
+        try:
+            return _original_create_connection((ip, port), *args, **kwargs)
+        except OSError as e:
+            error = e
+    if error is not None:
+        raise error
+    return _original_create_connection(address, *args, **kwargs)
+
+
+def install() -> None:
+    """Route urllib3 connections through the cache (idempotent)."""
+    urllib3.util.connection.create_connection = _create_connection
+
+
+def uninstall() -> None:
+    urllib3.util.connection.create_connection = _original_create_connection
+
+
+@contextmanager
+def installed():
+    install()
+    try:
+        yield
+    finally:
+        uninstall()
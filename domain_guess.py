@@ -0,0 +1,155 @@
+"""
+Website guessing from the company name, before any search.
+Most companies live at <name>.<country tld> or <name>.com, so a handful
+of candidate homepages are fetched concurrently and one is accepted only
+if its title or site name carries the company's brand. Anything less
+certain falls back to search.
+"""
+
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+import metrics
+from page_document import PageDocument, parse_document
+from utils import CC_TLD_MAP
+
+
+# =========================
+# Configuration
+# =========================
+# {domain} is replaced by the candidate domain; the result is the
+# website returned for a confirmed guess
+GUESS_URL = "https://{domain}"
+GUESS_TIMEOUT = 5      # seconds per candidate homepage
+MAX_GUESSES = 4        # candidate domains checked per company
+
+GENERIC_TLDS = ["com"]
+
+# Countries whose companies mostly register under a second-level zone
+COUNTRY_TLD_OVERRIDES = {
+    "United Kingdom": "co.uk",
+    "Turkey": "com.tr",
+    "Israel": "co.il",
+    "Australia": "com.au",
+    "Brazil": "com.br",
+    "Mexico": "com.mx",
+    "Japan": "co.jp",
+    "South Africa": "co.za",
+    "New Zealand": "co.nz",
+    "Argentina": "com.ar",
+}
+
+COUNTRY_TLDS = {
+    **{country: tld for tld, country in CC_TLD_MAP.items()},
+    **COUNTRY_TLD_OVERRIDES,
+}
+
+# Trailing name words that never appear in the domain
+LEGAL_WORDS = {
+    "gmbh", "ag", "kg", "co", "ltd", "limited", "llc", "inc", "corp",
+    "company", "corporation", "plc", "sa", "sas", "sarl", "srl", "spa", "bv", "nv",
+    "oy", "ab", "as", "fzco", "fze", "fzllc", "pte", "pty", "pvt",
+}
+STOP_WORDS = {"the", "and"}
+
+# Parking / for-sale pages often repeat the domain name in their title
+PARKED_MARKERS = ("domain is for sale", "domain may be for sale",
+                  "buy this domain", "domain parking", "parked free")
+
+
+def _fold(text: str) -> str:
+    """Lowercase ASCII with accents dropped (Müller -> muller)."""
+    text = unicodedata.normalize("NFKD", text)
+    return text.encode("ascii", "ignore").decode("ascii").lower()
+
+
+def brand_tokens(company_name: str) -> list[str]:
+    """
+    Name words that make up the brand: folded, punctuation removed,
+    trailing legal forms ("GmbH & Co. KG", "S.r.l.") and stop words dropped.
+    """
+    text = _fold(company_name).replace("&", " and ")
+    text = re.sub(r"[.'’]", "", text)
+    tokens = re.findall(r"[a-z0-9]+", text)
+    while tokens and (tokens[-1] in LEGAL_WORDS or tokens[-1] in STOP_WORDS):
+        tokens.pop()
+    return [t for t in tokens if t not in STOP_WORDS]
+
+
+def candidate_domains(company_name: str,
+                      suffix_country: str | None = None) -> list[str]:
+    """Likely domains, best first: country TLD before GENERIC_TLDS."""
+    tokens = brand_tokens(company_name)
+    labels = ["".join(tokens)]
+    if len(tokens) > 1:
+        labels.append("-".join(tokens))
+    labels = [label for label in labels if 3 <= len(label) <= 63]
+
+    tlds = []
+    if suffix_country in COUNTRY_TLDS:
+        tlds.append(COUNTRY_TLDS[suffix_country])
+    tlds.extend(tld for tld in GENERIC_TLDS if tld not in tlds)
+
+    domains = [f"{label}.{tld}" for tld in tlds for label in labels]
+    return domains[:MAX_GUESSES]
+
+
+def _compact(text: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", _fold(text))
+
+
+def brand_matches(doc: PageDocument, tokens: list[str]) -> bool:
+    """True if the page's title or site name names the brand."""
+    if not tokens:
+        return False
+    names = " ".join([doc.title, doc.site_name])
+    folded = _fold(names)
+    if any(marker in folded for marker in PARKED_MARKERS):
+        return False
+    if "".join(tokens) in _compact(names):
+        return True
+    words = set(re.findall(r"[a-z0-9]+", folded))
+    return len(tokens) > 1 and all(t in words for t in tokens)
+
+
+def _check(domain: str, tokens: list[str]) -> str | None:
+    """The site's base URL if its homepage carries the brand."""
+    url = GUESS_URL.format(domain=domain)
+    try:
+        r = http_client.get(url, timeout=GUESS_TIMEOUT)
+    except Exception:
+        return None
+    if r.status_code != 200 or not r.text:
+        return None
+    doc = parse_document(r.text)
+    return url if brand_matches(doc, tokens) else None
+
+
+def guess_website(company_name: str,
+                  suffix_country: str | None = None) -> str | None:
+    """
+    Check the candidate domains concurrently and return the first one,
+    in preference order, whose homepage names the company (else None).
+    """
+    with metrics.stage("guess") as timer:
+        domains = candidate_domains(company_name, suffix_country)
+        if not domains:
+            timer.outcome = "no_candidates"
+            return None
+
+        tokens = brand_tokens(company_name)
+        pool = ThreadPoolExecutor(max_workers=len(domains))
+        try:
+            for website in pool.map(lambda d: _check(d, tokens), domains):
+                if website:
+                    return website
+        finally:
+            # Checks still in flight finish here rather than outliving the
+            # row (and the caller's http_client settings); queued ones are
+            # dropped
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        timer.outcome = "miss"
+        return None
@@ -1,8 +1,10 @@
 import re
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
+import http_client
+from page_document import PageDocument, as_document, parse_document
+
 EMAIL_REGEX = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
 
 PAGES = [
@@ -21,7 +23,10 @@ BAD_EMAIL_KEYWORDS = [
     "no-reply"
 ]
 
-HEADERS = {"User-Agent": "Mozilla/5.0"}
+# Role addresses preferred over personal ones, best first
+PREFERRED_PREFIXES = ("info@", "contact@", "sales@", "office@", "hello@")
+
+HEADERS = http_client.HEADERS
 
 
 def extract_email_from_website(base_url: str):
@@ -30,22 +35,13 @@ def extract_email_from_website(base_url: str):
     for path in PAGES:
         try:
             page_url = urljoin(base_url, path)
-            r = requests.get(page_url, headers=HEADERS, timeout=8)
+            r = http_client.get(page_url, headers=HEADERS, timeout=8)
 
             if r.status_code != 200:
                 continue
 
-            soup = BeautifulSoup(r.text, "html.parser")
-
-            # text emails
-            text = soup.get_text(" ", strip=True)
-            emails.update(EMAIL_REGEX.findall(text))
-
-            # mailto links
-            for link in soup.select('a[href^="mailto:"]'):
-                email = link["href"].replace("mailto:", "").split("?")[0]
-                if EMAIL_REGEX.fullmatch(email):
-                    emails.add(email)
+            doc = parse_document(r.text)
+            emails.update(emails_in_page(doc))
 
         except Exception:
             continue
@@ -53,38 +49,49 @@ def extract_email_from_website(base_url: str):
     return select_best_email(emails)
 
 
-def select_best_email(emails: set[str]):
-    if not emails:
-        return None
+def emails_in_page(doc: PageDocument) -> set[str]:
+    """Addresses in the page text plus valid mailto: links."""
+    emails = set(EMAIL_REGEX.findall(doc.text))
+    for email in doc.mailto_addresses:
+        if EMAIL_REGEX.fullmatch(email):
+            emails.add(email)
+    return emails
 
-    clean = []
-    for e in emails:
-        el = e.lower()
-        if any(bad in el for bad in BAD_EMAIL_KEYWORDS):
-            continue
 
-        if el.startswith(("info@", "contact@", "sales@", "office@", "hello@")):
-            return e
+def is_preferred_email(email: str | None) -> bool:
+    return bool(email) and email.lower().startswith(PREFERRED_PREFIXES)
 
-        clean.append(e)
 
-    return sorted(clean)[0] if clean else None
+def _email_rank(email: str) -> tuple[int, str]:
+    el = email.lower()
+    for rank, prefix in enumerate(PREFERRED_PREFIXES):
+        if el.startswith(prefix):
+            return (rank, email)
+    return (len(PREFERRED_PREFIXES), email)
 
 
-def extract_email_from_soups(soups: dict[str, BeautifulSoup]) -> str | None:
+def select_best_email(emails: set[str]):
+    """
+    Best address by PREFERRED_PREFIXES order, then alphabetically.
+    Addresses containing BAD_EMAIL_KEYWORDS are never chosen.
+    """
+    clean = [
+        e for e in emails
+        if not any(bad in e.lower() for bad in BAD_EMAIL_KEYWORDS)
+    ]
+    return min(clean, key=_email_rank) if clean else None
+
+
+def extract_email_from_soups(
+    pages: dict[str, PageDocument | BeautifulSoup],
+) -> str | None:
     """
-    Extract best email from pre-fetched BeautifulSoup objects.
+    Extract best email from pre-fetched pages (PageDocuments or soups).
     Same logic as extract_email_from_website but without fetching.
     """
     emails = set()
 
-    for path, soup in soups.items():
-        text = soup.get_text(" ", strip=True)
-        emails.update(EMAIL_REGEX.findall(text))
-
-        for link in soup.select('a[href^="mailto:"]'):
-            email = link["href"].replace("mailto:", "").split("?")[0]
-            if EMAIL_REGEX.fullmatch(email):
-                emails.add(email)
+    for path, page in pages.items():
+        emails.update(emails_in_page(as_document(page)))
 
     return select_best_email(emails)
@@ -1,10 +1,18 @@
-import requests
-from bs4 import BeautifulSoup
+import threading
+
 from urllib.parse import quote_plus, urlparse, parse_qs, unquote
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-}
+import http_client
+import metrics
+from domain_guess import guess_website
+from page_document import PageDocument, parse_document
+from search_cache import SearchCache
+from search_limiter import AdaptiveRateLimiter, backoff_delay
+
+HEADERS = http_client.HEADERS
+
+# {query} is replaced by the URL-quoted search text
+SEARCH_URL = "https://duckduckgo.com/html/?q={query}"
 
 BLOCKED_DOMAINS = [
     "linkedin.com",
@@ -16,6 +24,31 @@ BLOCKED_DOMAINS = [
     "apollo.io"
 ]
 
+# Responses meaning "slow down": retried after a backoff
+THROTTLE_STATUSES = {202, 403, 429}
+SEARCH_RETRIES = 4     # retries per query after throttling
+
+DOMAIN_GUESS = True   # True = try <name>.<tld> homepages before searching
+
+SEARCH_CACHE_ENABLED = True
+SEARCH_CACHE_PATH = "data/search_cache.sqlite"
+
+_search_limiter = AdaptiveRateLimiter()
+
+_search_cache: SearchCache | None = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache | None:
+    """The shared search cache, opened on first use (None if disabled)."""
+    global _search_cache
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache(SEARCH_CACHE_PATH)
+        return _search_cache
+
 
 def is_blocked_domain(url: str) -> bool:
     return any(domain in url for domain in BLOCKED_DOMAINS)
@@ -26,41 +59,104 @@ def clean_url(url: str) -> str:
     return f"{parsed.scheme}://{parsed.netloc}"
 
 
-def find_website(company_name: str) -> str | None:
-    query = quote_plus(f"{company_name} official website")
-    search_url = f"https://duckduckgo.com/html/?q={query}"
+class SearchThrottled(Exception):
+    """The search engine kept throttling a query through every retry."""
 
-    try:
-        r = requests.get(search_url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(r.text, "html.parser")
 
-        results = soup.find_all("a", class_="result__a")
+def _is_throttle_page(doc: PageDocument) -> bool:
+    # A genuine "no results" page says so; a blank one is a soft block
+    return not doc.hrefs("a.result__a") and not doc.has(".no-results")
 
-        for result in results[:5]:  # נבדוק עד 5 תוצאות
-            href = result.get("href")
-            if not href:
-                continue
 
-            parsed = urlparse(href)
-            qs = parse_qs(parsed.query)
+def _first_result(doc: PageDocument) -> str | None:
+    for href in doc.hrefs("a.result__a")[:5]:  # נבדוק עד 5 תוצאות
+        if not href:
+            continue
 
-            if "uddg" in qs:
-                candidate = unquote(qs["uddg"][0])
-            else:
-                candidate = href
-
-            if not candidate.startswith("http"):
-                continue
+        parsed = urlparse(href)
+        qs = parse_qs(parsed.query)
 
-            if is_blocked_domain(candidate):
-                continue
+        if "uddg" in qs:
+            candidate = unquote(qs["uddg"][0])
+        else:
+            candidate = href
 
-            return clean_url(candidate)
+        if not candidate.startswith("http"):
+            continue
 
-        return None
+        if is_blocked_domain(candidate):
+            continue
 
-    except Exception:
-        return None
+        return clean_url(candidate)
+    return None
 
 
+def search_website(company_name: str) -> tuple[bool, str | None]:
+    """
+    Query DuckDuckGo for the company's website.
+    Returns (answered, website): answered is False when the search itself
+    failed, so the outcome must not be remembered. Queries go through
+    the shared adaptive limiter; throttled ones back off and retry, and
+    SearchThrottled is raised once SEARCH_RETRIES are used up.
+    """
+    query = quote_plus(f"{company_name} official website")
+    search_url = SEARCH_URL.format(query=query)
+
+    with metrics.stage("search") as timer:
+        for attempt in range(SEARCH_RETRIES + 1):
+            _search_limiter.acquire()
+            try:
+                # One slow search must not trip the breaker for every row;
+                # repeat queries are already memoized by the search cache.
+                r = http_client.get(search_url, headers=HEADERS, timeout=10,
+                                    use_cache=False, use_breaker=False)
+                doc = parse_document(r.text) if r.status_code == 200 else None
+            except Exception as e:
+                timer.outcome = metrics.classify_error(e)
+                return (False, None)
+
+            if r.status_code in THROTTLE_STATUSES or (
+                    doc is not None and _is_throttle_page(doc)):
+                metrics.count("search.throttled")
+                _search_limiter.throttled(backoff_delay(attempt))
+                continue
 
+            if doc is None:
+                timer.outcome = f"http_{r.status_code}"
+                return (False, None)
+
+            _search_limiter.success()
+            website = _first_result(doc)
+            if website is None:
+                timer.outcome = "no_result"
+            return (True, website)
+
+        timer.outcome = "throttled"
+        metrics.count("search.gave_up")
+        raise SearchThrottled(company_name)
+
+
+def find_website(company_name: str,
+                 suffix_country: str | None = None) -> str | None:
+    """
+    The company's website: from the search cache, else a confirmed
+    domain guess (suffix_country picks the country TLD), else a search.
+    """
+    cache = get_search_cache()
+    if cache is not None:
+        hit, website = cache.lookup(company_name)
+        if hit:
+            metrics.count("search_cache_hits")
+            return website
+
+    if DOMAIN_GUESS:
+        website = guess_website(company_name, suffix_country)
+        if website:
+            if cache is not None:
+                cache.store(company_name, website)
+            return website
+
+    answered, website = search_website(company_name)
+    if answered and cache is not None:
+        cache.store(company_name, website)
+    return website
@@ -0,0 +1,192 @@
+"""
+Fuzzy company-name matching for joins where exact keys miss.
+Names are first reduced to canonical tokens (accents folded, legal forms
+dropped, common variants aliased), so "Acme Holdings Ltd" and "ACME
+Holding Limited" already match exactly. The rest are matched on
+character trigrams: an inverted index over the right side's trigrams
+proposes candidates, the candidates sharing the most trigrams are scored
+exactly, and the best one is kept if it clears MATCH_THRESHOLD.
+
+Blocking uses prefix filtering: with each name's trigrams ordered
+rarest first, two names can only reach the threshold if they share a
+trigram within their first few, so only those prefixes are indexed.
+Only distinct names are matched, and cost grows with the number of
+candidates rather than with len(left) * len(right).
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+# =========================
+# Configuration
+# =========================
+MATCH_THRESHOLD = 0.7       # minimum Dice similarity of a fuzzy match
+MAX_CANDIDATES = 20         # best-blocked candidates scored per name; a
+                            # better match past the cap is not seen
+CHUNK_SIZE = 5000           # left names blocked per batch (bounds memory)
+
+# Spelling variants folded onto one token before comparing
+TOKEN_ALIASES = {
+    "holdings": "holding", "limited": "ltd", "incorporated": "inc",
+    "corporation": "corp", "company": "co", "international": "intl",
+    "technologies": "technology", "tech": "technology",
+    "systems": "system", "services": "service", "industries": "industry",
+    "solutions": "solution", "and": "&",
+}
+
+# Legal forms and filler that say nothing about which company it is
+IGNORED_TOKENS = {
+    "ltd", "inc", "corp", "co", "llc", "plc", "gmbh", "ag", "kg", "mbh",
+    "sa", "sas", "sarl", "srl", "spa", "bv", "nv", "oy", "ab", "as",
+    "pte", "pty", "pvt", "fzco", "fze", "fzllc", "the", "&",
+}
+
+
+def canonical_name(name) -> str:
+    """
+    Lowercase ASCII tokens with aliases applied and IGNORED_TOKENS
+    dropped, joined by single spaces ("" for non-strings).
+    """
+    if not isinstance(name, str):
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    text = re.sub(r"[.'’]", "", text).replace("&", " & ")
+    tokens = (TOKEN_ALIASES.get(t, t) for t in re.findall(r"[a-z0-9&]+", text))
+    return " ".join(t for t in tokens if t not in IGNORED_TOKENS)
+
+
+def trigrams(canonical: str) -> set[str]:
+    padded = f" {canonical} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def dice(a: set, b: set) -> float:
+    """Dice coefficient of two trigram sets."""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def _prefix(grams: set, rank: dict[str, int], threshold: float) -> list[int]:
+    """
+    Ranks of the rarest trigrams that any name scoring >= threshold
+    against this one must share at least one of. Dice >= t implies an
+    overlap of at least t * n / (2 - t) trigrams, so n - overlap + 1
+    rarest ones suffice. Trigrams unknown to the index rank -1.
+    """
+    n = len(grams)
+    overlap = max(1, int(np.ceil(threshold * n / (2 - threshold) - 1e-9)))
+    ordered = sorted(rank.get(g, -1) for g in grams)
+    return ordered[:n - overlap + 1]
+
+
+def _candidates(left_prefixes: list[list[int]], index_grams: np.ndarray,
+                index_names: np.ndarray, n_right: int):
+    """
+    (left, right) position arrays of the pairs sharing the most blocking
+    trigrams, at most MAX_CANDIDATES per left name. index_grams is the
+    sorted gram column of the right-side index, index_names its names.
+    """
+    rows, grams = [], []
+    for i, prefix in enumerate(left_prefixes):
+        ids = [r for r in prefix if r >= 0]
+        rows.extend([i] * len(ids))
+        grams.extend(ids)
+    grams = np.asarray(grams, dtype=np.int64)
+
+    # Every index entry under each left gram (a join on the sorted index)
+    lo = np.searchsorted(index_grams, grams, side="left")
+    hi = np.searchsorted(index_grams, grams, side="right")
+    counts = hi - lo
+    if not counts.sum():
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    left = np.repeat(np.asarray(rows, dtype=np.int64), counts)
+    offsets = np.repeat(lo - np.cumsum(counts) + counts, counts)
+    right = index_names[np.arange(counts.sum()) + offsets]
+
+    # Shared-gram count per pair, best first within each left name
+    pairs, shared = np.unique(left * n_right + right, return_counts=True)
+    left, right = np.divmod(pairs, n_right)
+    order = np.lexsort((-shared, left))
+    left, right = left[order], right[order]
+    at = np.arange(len(left))
+    first = np.r_[True, left[1:] != left[:-1]]
+    position = at - np.maximum.accumulate(np.where(first, at, 0))
+    keep = position < MAX_CANDIDATES
+    return left[keep], right[keep]
+
+
+def best_matches(left: pd.Series, right: pd.Series,
+                 threshold: float | None = None) -> pd.DataFrame:
+    """
+    For every left value, the most similar right value.
+    Returns a frame aligned with left: Match (the right value, None if
+    nothing scores at least threshold) and Match_Score (1.0 for names
+    that are equal once canonical, NaN without a match).
+
+    Blocking alone loses no pair that clears threshold, but only the
+    MAX_CANDIDATES right names sharing the most blocking trigrams with
+    a left name are scored. When more than that many share a trigram,
+    the best match can be among the unscored ones and a weaker one (or
+    none) is returned instead.
+    """
+    threshold = MATCH_THRESHOLD if threshold is None else threshold
+    left_codes, left_names = pd.factorize(left)
+    right_names = pd.unique(right.dropna())
+
+    left_canon = [canonical_name(n) for n in left_names]
+    right_canon = [canonical_name(n) for n in right_names]
+
+    # Equal canonical names need no scoring
+    exact = {}
+    for name, canon in zip(right_names, right_canon):
+        if canon:
+            exact.setdefault(canon, name)
+
+    match = np.full(len(left_names) + 1, None, dtype=object)
+    score = np.full(len(left_names) + 1, np.nan)
+    pending = []
+    for i, canon in enumerate(left_canon):
+        if canon in exact:
+            match[i], score[i] = exact[canon], 1.0
+        elif canon:
+            pending.append(i)
+
+    # Trigrams ranked rarest first across the right side; each right
+    # name is indexed under its prefix only
+    right_grams = [trigrams(c) if c else set() for c in right_canon]
+    frequency: dict[str, int] = {}
+    for grams in right_grams:
+        for gram in grams:
+            frequency[gram] = frequency.get(gram, 0) + 1
+    rank = {gram: r for r, gram in enumerate(
+        sorted(frequency, key=lambda g: (frequency[g], g)))}
+    post_gram, post_right = [], []
+    for j, grams in enumerate(right_grams):
+        prefix = _prefix(grams, rank, threshold) if grams else []
+        post_gram.extend(prefix)
+        post_right.extend([j] * len(prefix))
+    order = np.argsort(np.asarray(post_gram, dtype=np.int64), kind="stable")
+    index_grams = np.asarray(post_gram, dtype=np.int64)[order]
+    index_names = np.asarray(post_right, dtype=np.int64)[order]
+
+    for start in range(0, len(pending), CHUNK_SIZE):
+        chunk = pending[start:start + CHUNK_SIZE]
+        chunk_grams = [trigrams(left_canon[i]) for i in chunk]
+        lefts, rights = _candidates(
+            [_prefix(g, rank, threshold) for g in chunk_grams],
+            index_grams, index_names, len(right_names))
+        for k, j in zip(lefts.tolist(), rights.tolist()):
+            s = dice(chunk_grams[k], right_grams[j])
+            i = chunk[k]
+            if s >= threshold and (np.isnan(score[i]) or s > score[i]):
+                match[i], score[i] = right_names[j], s
+    return pd.DataFrame({
+        "Match": pd.Series(match[left_codes], index=left.index, dtype=object),
+        "Match_Score": pd.Series(np.round(score[left_codes], 3), index=left.index),
+    })
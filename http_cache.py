@@ -0,0 +1,149 @@
+"""
+Persistent on-disk HTTP response cache (SQLite).
+Keyed by URL, with a TTL, negative entries for non-200 responses and a
+total size cap enforced by least-recently-used eviction.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+
+
+# =========================
+# Configuration
+# =========================
+CACHE_TTL = 7 * 24 * 3600           # seconds a 200 response stays fresh
+NEGATIVE_TTL = 24 * 3600            # seconds a non-200 response stays fresh
+CACHE_MAX_BYTES = 500 * 1024 ** 2   # compressed bodies, LRU-evicted above this
+
+# Throttling and server errors are transient; caching them would only
+# replay the failure on the next run.
+UNCACHEABLE_STATUSES = {202, 408, 429}
+
+
+@dataclass
+class CachedResponse:
+    """The subset of requests.Response the fetch paths rely on."""
+    url: str
+    status_code: int
+    text: str
+    from_cache: bool = True
+    truncated: bool = False
+
+
+def is_cacheable(status_code: int) -> bool:
+    return status_code not in UNCACHEABLE_STATUSES and status_code < 500
+
+
+class ResponseCache:
+    """Thread-safe SQLite cache of response status + body by URL."""
+
+    def __init__(self, path: str, ttl: float = CACHE_TTL,
+                 negative_ttl: float = NEGATIVE_TTL,
+                 max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY,"
+            " status INTEGER NOT NULL,"
+            " body BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)"
+        )
+        self._db.commit()
+        self._total_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def _ttl_for(self, status: int) -> float:
+        return self.ttl if status == 200 else self.negative_ttl
+
+    def get(self, url: str) -> CachedResponse | None:
+        """Return a fresh cached response for url, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, body, size, fetched_at FROM responses"
+                " WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            status, body, size, fetched_at = row
+            if now - fetched_at > self._ttl_for(status):
+                self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._total_bytes -= size
+                self._db.commit()
+                return None
+
+            self._db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url)
+            )
+            self._db.commit()
+
+        text = zlib.decompress(body).decode("utf-8") if body else ""
+        return CachedResponse(url=url, status_code=status, text=text)
+
+    def put(self, url: str, status_code: int, text: str) -> None:
+        """Store a response; non-200 bodies are dropped (negative entry)."""
+        if not is_cacheable(status_code):
+            return
+        body = zlib.compress(text.encode("utf-8")) if status_code == 200 else b""
+        now = time.time()
+        with self._lock:
+            old = self._db.execute(
+                "SELECT size FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if old:
+                self._total_bytes -= old[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (url, status, body, size, fetched_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (url, status_code, body, len(body), now, now),
+            )
+            self._total_bytes += len(body)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries down to 90% of max_bytes."""
+        target = int(self.max_bytes * 0.9)
+        rows = self._db.execute(
+            "SELECT url, size FROM responses ORDER BY accessed_at"
+        )
+        victims = []
+        for url, size in rows:
+            if self._total_bytes <= target:
+                break
+            victims.append((url,))
+            self._total_bytes -= size
+        self._db.executemany("DELETE FROM responses WHERE url = ?", victims)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,459 @@
+"""
+Shared HTTP layer used by every fetch path (search, pages, emails).
+Sends every request through one pooled keep-alive session with shared
+headers, enforces a global cap on in-flight requests and per-host
+politeness limits, and serves repeat requests from the on-disk
+response cache. Bodies are streamed under a byte cap, and non-HTML
+responses are dropped before their body is read. Hosts that fail at
+the connection level trip a per-host circuit breaker and are remembered
+as dead across runs; hosts the DNS cache knows to be NXDOMAIN are
+skipped without a request.
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NameResolutionError, NewConnectionError
+
+import dns_cache
+from dead_hosts import DeadHostCache
+from http_cache import CachedResponse, ResponseCache, is_cacheable
+
+
+# =========================
+# Configuration
+# =========================
+MAX_CONNECTIONS = 32   # in-flight requests across all hosts
+MAX_PER_HOST = 2       # in-flight requests to a single host
+HOST_DELAY = 0.25      # minimum seconds between request starts on one host
+
+CACHE_ENABLED = True
+CACHE_PATH = "data/http_cache.sqlite"
+
+# Consecutive connection-level failures (refused, connect timeout) that
+# open a host's breaker; a DNS failure opens it at once. Read timeouts
+# and dropped responses do not count. An open breaker fails requests at
+# once and allows a single trial request after BREAKER_COOLDOWN seconds;
+# hosts read from the dead-host table start the run with it open, and a
+# successful trial drops them from the table.
+BREAKER_THRESHOLD = 2
+BREAKER_COOLDOWN = 600
+
+DEAD_HOSTS_ENABLED = True
+DEAD_HOSTS_PATH = "data/dead_hosts.sqlite"
+
+POOL_HOSTS = 256       # per-host connection pools kept alive at once
+POOL_PER_HOST = 4      # idle keep-alive connections kept per host
+
+# Bodies above MAX_BODY_BYTES keep their first bytes plus the last
+# TAIL_BYTES (where footers and imprint addresses live); reading stops
+# for good at MAX_DOWNLOAD_BYTES.
+MAX_BODY_BYTES = 1024 ** 2
+TAIL_BYTES = 64 * 1024
+MAX_DOWNLOAD_BYTES = 8 * 1024 ** 2
+CHUNK_BYTES = 64 * 1024
+
+# Content types whose body is read; others come back with an empty body.
+# A missing Content-Type header is treated as HTML.
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en;q=0.9,*;q=0.5",
+}
+
+
+# =========================
+# Limiter
+# =========================
+class RequestLimiter:
+    """Global + per-host concurrency limits with a per-host start delay."""
+
+    def __init__(self, max_connections: int, max_per_host: int,
+                 host_delay: float):
+        self.max_per_host = max_per_host
+        self.host_delay = host_delay
+        self._global = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    def _slots_for(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = slots
+            return slots
+
+    def _wait_for_turn(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.host_delay
+        if start > now:
+            time.sleep(start - now)
+
+    def acquire(self, host: str) -> None:
+        self._slots_for(host).acquire()
+        self._wait_for_turn(host)
+        self._global.acquire()
+
+    def release(self, host: str) -> None:
+        self._global.release()
+        self._slots_for(host).release()
+
+
+_limiter = RequestLimiter(MAX_CONNECTIONS, MAX_PER_HOST, HOST_DELAY)
+
+
+def configure_limits(max_connections: int = MAX_CONNECTIONS,
+                     max_per_host: int = MAX_PER_HOST,
+                     host_delay: float = HOST_DELAY) -> None:
+    """Replace the process-wide limiter (call before starting workers)."""
+    global _limiter
+    _limiter = RequestLimiter(max_connections, max_per_host, host_delay)
+
+
+# =========================
+# Circuit breaker
+# =========================
+class HostUnavailable(requests.ConnectionError):
+    """Raised without touching the network for a host known to be down."""
+
+
+class CircuitBreaker:
+    """Per-host breaker over consecutive connection-level failures."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD,
+                 cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+
+    def allow(self, host: str) -> bool:
+        """
+        False while host's breaker is open. Once the cooldown has passed,
+        one caller gets through as a trial and the breaker re-arms.
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - opened_at < self.cooldown:
+                return False
+            self._opened_at[host] = now
+            return True
+
+    def seen(self, host: str) -> bool:
+        """True if host has failed or been tripped in this process."""
+        with self._lock:
+            return host in self._failures or host in self._opened_at
+
+    def trip(self, host: str) -> None:
+        """Open host's breaker now (e.g. for a host recorded as dead)."""
+        with self._lock:
+            self._failures.setdefault(host, self.threshold)
+            self._opened_at[host] = time.monotonic()
+
+    def record_success(self, host: str) -> bool:
+        """Close host's breaker; True if it had been open."""
+        with self._lock:
+            self._failures.pop(host, None)
+            return self._opened_at.pop(host, None) is not None
+
+    def record_failure(self, host: str, force: bool = False) -> bool:
+        """Count a failure; True if it (re)opened the breaker."""
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if force or failures >= self.threshold:
+                self._opened_at[host] = time.monotonic()
+                return True
+            return False
+
+
+_breaker = CircuitBreaker()
+
+
+def _failure_reason(exc: Exception):
+    return getattr(exc.args[0], "reason", None) if exc.args else None
+
+
+def _is_dns_failure(exc: Exception) -> bool:
+    return isinstance(_failure_reason(exc), NameResolutionError)
+
+
+def _is_connection_failure(exc: Exception) -> bool:
+    """
+    True for failures to reach the host at all: DNS errors, refused
+    connections and connect timeouts. A read timeout or a connection
+    dropped mid-response says nothing about the host being down.
+    """
+    if isinstance(exc, HostUnavailable):
+        return False
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    return (isinstance(exc, requests.ConnectionError)
+            and isinstance(_failure_reason(exc), NewConnectionError))
+
+
+# =========================
+# Connection reuse statistics
+# =========================
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "connections": 0, "cache_hits": 0,
+          "bytes_read": 0, "truncated": 0, "rejected": 0,
+          "host_failures": 0, "breaker_skips": 0, "dns_skips": 0}
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += n
+
+
+def connection_stats() -> dict[str, int]:
+    """
+    Network requests sent, new TCP/TLS connections opened, requests that
+    reused a kept-alive connection, responses served from cache, body
+    bytes downloaded, bodies truncated or rejected by content type,
+    connection-level host failures, requests skipped because their
+    host's breaker was open or the host is recorded as dead, and
+    requests skipped because the host does not resolve.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["reused"] = max(stats["requests"] - stats["connections"], 0)
+    return stats
+
+
+def reset_connection_stats() -> None:
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+# =========================
+# Pooled session
+# =========================
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _count("connections")
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _count("connections")
+        return super()._new_conn()
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools count every new connection they open."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """The process-wide keep-alive session, created on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = PooledAdapter(pool_connections=POOL_HOSTS,
+                                    pool_maxsize=POOL_PER_HOST)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _send(url: str, headers: dict | None, timeout: float | None) -> CachedResponse:
+    r = get_session().get(url, headers=headers, timeout=timeout, stream=True)
+    try:
+        if not is_text_content_type(r.headers.get("Content-Type")):
+            _count("rejected")
+            return CachedResponse(url, r.status_code, "", from_cache=False)
+        body, truncated = _read_capped(r.iter_content(CHUNK_BYTES))
+    finally:
+        r.close()
+
+    if truncated:
+        _count("truncated")
+    text = body.decode(r.encoding or "utf-8", errors="replace")
+    return CachedResponse(url, r.status_code, text, from_cache=False,
+                          truncated=truncated)
+
+
+# =========================
+# Bounded downloads
+# =========================
+def is_text_content_type(content_type: str | None) -> bool:
+    if not content_type:
+        return True
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type in TEXT_CONTENT_TYPES
+
+
+def _read_capped(chunks, max_bytes: int | None = None,
+                 tail_bytes: int | None = None,
+                 max_download: int | None = None) -> tuple[bytes, bool]:
+    """
+    Read a body under a byte cap. Past max_bytes, the first
+    max_bytes - tail_bytes bytes are kept along with a rolling window
+    of the last tail_bytes read, until max_download bytes have been
+    read in total. Returns (body, truncated).
+    """
+    max_bytes = MAX_BODY_BYTES if max_bytes is None else max_bytes
+    tail_bytes = TAIL_BYTES if tail_bytes is None else tail_bytes
+    max_download = MAX_DOWNLOAD_BYTES if max_download is None else max_download
+    tail_bytes = min(tail_bytes, max_bytes)
+    head_limit = max_bytes - tail_bytes
+
+    head = bytearray()
+    tail = bytearray()
+    read = 0
+    for chunk in chunks:
+        read += len(chunk)
+        if len(head) < head_limit:
+            room = head_limit - len(head)
+            head += chunk[:room]
+            chunk = chunk[room:]
+        if chunk:
+            tail += chunk
+            if len(tail) > tail_bytes:
+                del tail[:len(tail) - tail_bytes]
+        if read >= max_download:
+            break
+
+    _count("bytes_read", read)
+    truncated = read > max_bytes
+    return bytes(head + tail), truncated
+
+
+# =========================
+# Cache
+# =========================
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResponseCache | None:
+    """The shared response cache, opened on first use (None if disabled)."""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(CACHE_PATH)
+        return _cache
+
+
+_dead_hosts: DeadHostCache | None = None
+_dead_hosts_lock = threading.Lock()
+
+
+def get_dead_hosts() -> DeadHostCache | None:
+    """The shared dead-host table, opened on first use (None if disabled)."""
+    global _dead_hosts
+    if not DEAD_HOSTS_ENABLED:
+        return None
+    with _dead_hosts_lock:
+        if _dead_hosts is None:
+            _dead_hosts = DeadHostCache(DEAD_HOSTS_PATH)
+        return _dead_hosts
+
+
+def _host_available(host: str) -> bool:
+    # The dead-host table only seeds the breaker for hosts this run has
+    # not seen yet; from then on the breaker decides, so its half-open
+    # trial after BREAKER_COOLDOWN still goes out
+    if not _breaker.seen(host):
+        dead_hosts = get_dead_hosts()
+        if dead_hosts is not None and dead_hosts.is_dead(host):
+            _breaker.trip(host)
+    return _breaker.allow(host)
+
+
+def _host_recovered(host: str) -> None:
+    if _breaker.record_success(host):
+        dead_hosts = get_dead_hosts()
+        if dead_hosts is not None:
+            dead_hosts.revive(host)
+
+
+def _host_failed(host: str, exc: Exception) -> None:
+    _count("host_failures")
+    dns = _is_dns_failure(exc)
+    if _breaker.record_failure(host, force=dns):
+        dead_hosts = get_dead_hosts()
+        if dead_hosts is not None:
+            dead_hosts.mark_dead(host, type(exc).__name__, dns=dns)
+
+
+# =========================
+# Requests
+# =========================
+def get(url: str, headers: dict | None = None, timeout: float | None = None,
+        use_cache: bool = True, use_breaker: bool = True) -> CachedResponse:
+    """
+    GET through the pooled session under the global and per-host limits;
+    headers are merged over HEADERS. Fresh cached responses (including
+    non-200 ones) skip the network. Bodies are capped at MAX_BODY_BYTES,
+    and non-HTML bodies come back empty. With use_breaker, requests to
+    a dead or NXDOMAIN host raise HostUnavailable without being sent.
+    """
+    cache = get_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get(url)
+        if cached is not None:
+            _count("cache_hits")
+            return cached
+
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if use_breaker and dns_cache.is_nxdomain(parsed.hostname):
+        _count("dns_skips")
+        raise HostUnavailable(f"{host} does not resolve; skipped")
+
+    limiter = _limiter
+    limiter.acquire(host)
+    try:
+        # Checked after queueing, so requests waiting on the same host
+        # see a failure that happened while they waited
+        if use_breaker and not _host_available(host):
+            _count("breaker_skips")
+            raise HostUnavailable(f"{host} is unreachable; skipped")
+        _count("requests")
+        r = _send(url, headers, timeout)
+    except (requests.ConnectionError, requests.Timeout) as e:
+        if use_breaker and _is_connection_failure(e):
+            _host_failed(host, e)
+        raise
+    finally:
+        limiter.release(host)
+
+    if use_breaker:
+        _host_recovered(host)
+
+    if cache is not None and is_cacheable(r.status_code):
+        cache.put(url, r.status_code, r.text)
+    return r
@@ -0,0 +1,170 @@
+"""
+Input loading for the agent and the merge tool.
+Excel workbooks are slow to parse, so the first read of a sheet is
+saved as a Parquet sidecar keyed by the workbook's path, mtime and
+size; later runs read the sidecar instead (only the needed columns) and
+rebuild it whenever the workbook changes. CSV, Parquet and JSONL inputs
+are read directly. Sidecars need pyarrow (pinned in requirements.txt);
+without it every run parses the workbook again. The faster calamine
+Excel engine is used when python-calamine is installed.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # sidecar cache is optional
+    pa = None
+    pq = None
+
+
+# =========================
+# Configuration
+# =========================
+EXCEL_ENGINE = "auto"        # "auto" = calamine if installed, else openpyxl
+SIDECAR_CACHE = True         # False = always parse the workbook
+SIDECAR_DIR = "data/.input_cache"
+
+EXCEL_SUFFIXES = (".xlsx", ".xlsm", ".xls")
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+# Parquet schema metadata key holding the source identity
+SIDECAR_KEY = b"icu_loader_source"
+
+
+def excel_engine() -> str:
+    if EXCEL_ENGINE != "auto":
+        return EXCEL_ENGINE
+    if importlib.util.find_spec("python_calamine") is not None:
+        return "calamine"
+    return "openpyxl"
+
+
+def _usecols(columns: list | None):
+    """usecols callable for the pandas readers (None = every column)."""
+    if columns is None:
+        return None
+    wanted = set(columns)
+    return lambda col: col in wanted
+
+
+def _select(df: pd.DataFrame, columns: list | None) -> pd.DataFrame:
+    """Keep the requested columns that exist, in the requested order."""
+    if columns is None:
+        return df
+    return df[[col for col in columns if col in df.columns]]
+
+
+# =========================
+# Sidecar cache
+# =========================
+def _source_identity(path: str, sheet, header: bool) -> dict:
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size, "sheet": sheet, "header": header}
+
+
+def sidecar_path(path: str, sheet=0, header: bool = True) -> str:
+    """Where the sidecar of this workbook sheet lives."""
+    key = json.dumps([os.path.abspath(path), sheet, header])
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(SIDECAR_DIR, f"{name}-{digest}.parquet")
+
+
+def _read_sidecar(sidecar: str, identity: dict,
+                  columns: list | None) -> pd.DataFrame | None:
+    """The cached frame, or None if missing or built from another version."""
+    try:
+        schema = pq.read_schema(sidecar)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    stored = (schema.metadata or {}).get(SIDECAR_KEY)
+    if stored is None or json.loads(stored) != identity:
+        return None
+
+    wanted = None
+    if columns is not None:
+        wanted = [str(col) for col in columns if str(col) in schema.names]
+    df = pd.read_parquet(sidecar, columns=wanted)
+    if not identity["header"]:
+        # Headerless sheets have positional column labels
+        df.columns = [int(col) for col in df.columns]
+    return df
+
+
+def _write_sidecar(sidecar: str, identity: dict, df: pd.DataFrame) -> bool:
+    """Save df as the sidecar (atomically); False if it cannot be stored."""
+    frame = df.rename(columns=str) if not identity["header"] else df
+    try:
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError):
+        return False   # e.g. a column mixing numbers and text
+    metadata = {**(table.schema.metadata or {}),
+                SIDECAR_KEY: json.dumps(identity).encode("utf-8")}
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(sidecar) or ".", exist_ok=True)
+    tmp = f"{sidecar}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, sidecar)
+    return True
+
+
+# =========================
+# Loading
+# =========================
+def read_excel(path: str, columns: list | None = None, sheet=0,
+               header: bool = True) -> pd.DataFrame:
+    """
+    A workbook sheet, from its sidecar when it is current. A new sidecar
+    holds the whole sheet, so any later column subset can be served.
+    """
+    header_row = 0 if header else None
+    cache = SIDECAR_CACHE and pq is not None
+    if not cache:
+        return pd.read_excel(path, sheet_name=sheet, header=header_row,
+                             usecols=_usecols(columns), engine=excel_engine())
+
+    identity = _source_identity(path, sheet, header)
+    sidecar = sidecar_path(path, sheet, header)
+    df = _read_sidecar(sidecar, identity, columns)
+    if df is not None:
+        return df
+
+    df = pd.read_excel(path, sheet_name=sheet, header=header_row,
+                       engine=excel_engine())
+    _write_sidecar(sidecar, identity, df)
+    return _select(df, columns)
+
+
+def load_table(path: str, columns: list | None = None, sheet=0,
+               header: bool = True) -> pd.DataFrame:
+    """
+    Load an input table by file type (.xlsx/.xlsm/.xls, .csv, .parquet,
+    .jsonl/.ndjson). columns limits the columns read (names, or
+    positions when header is False); ones missing from the file are
+    skipped. CSV values are read as text.
+    """
+    lower = path.lower()
+    if lower.endswith(EXCEL_SUFFIXES):
+        return read_excel(path, columns, sheet=sheet, header=header)
+
+    header_row = 0 if header else None
+    if lower.endswith(".csv"):
+        return pd.read_csv(path, header=header_row, usecols=_usecols(columns),
+                           dtype=str)
+    if lower.endswith(".parquet"):
+        if columns is not None and pq is not None:
+            names = pq.read_schema(path).names
+            columns = [col for col in columns if col in names]
+        return pd.read_parquet(path, columns=columns)
+    if lower.endswith(JSONL_SUFFIXES):
+        return _select(pd.read_json(path, lines=True, dtype=False), columns)
+    raise ValueError(f"Unsupported input file type: {path}")
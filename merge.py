@@ -0,0 +1,350 @@
+"""
+Merge a contacts / mailing list onto the enriched companies file.
+One engine for what merge_by_domain, merge_by_website,
+merge_domains_and_emails and merge_emails used to do separately:
+both sides get a join key (canonical domain or normalized company name),
+the contacts' emails are reduced to one value per key, attached with a
+hash join, coalesced into a final email column, and contacts whose key
+matches no company can be appended as new rows. Company names can also
+be matched fuzzily (see fuzzy_join), with the score kept per row.
+
+All steps are column-wise; string normalization runs once per distinct
+value, so million-row lists merge in seconds.
+
+    python merge.py --preset by-website --contacts list.xlsx
+    python merge.py --config merge.json --append-missing
+    python merge.py --preset by-company --fuzzy --threshold 0.8
+"""
+
+import argparse
+import json
+import os
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+import pandas as pd
+
+from fuzzy_join import best_matches
+from loader import load_table
+from result_writer import write_xlsx
+
+
+# =========================
+# Configuration
+# =========================
+KEY_DOMAIN = "domain"
+KEY_COMPANY = "company"
+
+EMAIL_SEPARATOR = ", "
+
+# Host part of a URL, bare domain or email address:
+# [scheme://][user@][www.]host[:port][/path]
+DOMAIN_PATTERN = r"^(?:[a-z][a-z0-9+.\-]*://)?(?:[^@/?#]*@)?(?:www\d*\.)?([^/?#:]*)"
+
+
+@dataclass
+class MergeConfig:
+    """One merge run; every field can come from a preset, JSON or the CLI."""
+    companies_file: str = "data/companies_enriched_FINAL_CLEAN.xlsx"
+    contacts_file: str = "data/Pitagone mailinglist.xlsx"
+    output_file: str = "data/companies_merged_FINAL.xlsx"
+
+    key: str = KEY_DOMAIN               # "domain" | "company"
+    companies_key_column: str = "Website"
+    # Contacts columns by name, or by position when contacts_header is False
+    contacts_key_column: str | int = "Website"
+    contacts_email_column: str | int = "Email"
+    contacts_header: bool = True
+
+    email_column: str = "Email"         # contacts' emails land here
+    aggregate: bool = True              # True = all unique emails per key
+                                        # joined; False = first email only
+    final_column: str | None = None     # coalesced email column | None = off
+    final_sources: list[str] = field(default_factory=list)  # most trusted first
+    keep_email_column: bool = True
+    append_missing: bool = False        # add rows for unmatched contacts
+
+    # Company key only: match names by similarity instead of equality
+    fuzzy: bool = False
+    match_threshold: float | None = None   # None = fuzzy_join.MATCH_THRESHOLD
+    score_column: str = "Match_Score"
+
+
+# The four historical scripts, as configurations of this one
+PRESETS = {
+    "by-domain": {                      # merge_by_domain.py
+        "output_file": "data/companies_enriched_WITH_PITAGONE.xlsx",
+        "contacts_key_column": 0, "contacts_email_column": 1,
+        "aggregate": False, "final_column": "Final_Email",
+        "final_sources": ["Final_Email", "Email"], "keep_email_column": False,
+    },
+    "by-website": {                     # merge_by_website.py
+        "append_missing": True,
+    },
+    "domains-and-emails": {             # merge_domains_and_emails.py
+        "contacts_key_column": 0, "contacts_email_column": 1,
+        "contacts_header": False, "append_missing": True,
+    },
+    "by-company": {                     # merge_emails.py
+        "companies_file": "data/companies_enriched.xlsx",
+        "contacts_file": "data/exhibition_emails.xlsx",
+        "output_file": "data/companies_enriched_final.xlsx",
+        "key": KEY_COMPANY, "companies_key_column": "Company Name",
+        "contacts_key_column": "Company Name", "email_column": "External_Email",
+        "aggregate": False, "final_column": "Final_Email",
+        "final_sources": ["Inferred_Email", "External_Email"],
+    },
+}
+
+
+# =========================
+# Normalization
+# =========================
+def _per_distinct(values: pd.Series, transform) -> pd.Series:
+    """
+    Apply a Series -> Series transform once per distinct value. Values
+    that are not strings reach transform as None, so numeric or all-NaN
+    columns work with the .str accessor too.
+    """
+    codes, uniques = pd.factorize(values)
+    text = [u if isinstance(u, str) else None for u in uniques]
+    out = transform(pd.Series(text, dtype=object))
+    out = pd.array(list(out) + [None], dtype=object)
+    return pd.Series(out[codes], index=values.index, dtype=object)
+
+
+def _blank_to_none(s: pd.Series) -> pd.Series:
+    return s.where(s.notna() & (s != ""), None)
+
+
+def _canonical_domains(s: pd.Series) -> pd.Series:
+    host = s.str.strip().str.lower().str.extract(DOMAIN_PATTERN, expand=False)
+    return _blank_to_none(host.str.rstrip("."))
+
+
+def canonicalize_domains(values: pd.Series) -> pd.Series:
+    """
+    Canonical domain per value: URLs, bare domains and email addresses
+    all reduce to the lowercased host without www. ("https://WWW.Acme.de/x",
+    "acme.de" and "info@acme.de" -> "acme.de"). Non-strings and blanks
+    map to None.
+    """
+    return _per_distinct(values, _canonical_domains)
+
+
+def canonical_domain(url) -> str | None:
+    """Scalar canonicalize_domains."""
+    if not isinstance(url, str):
+        return None
+    return canonicalize_domains(pd.Series([url], dtype=object)).iloc[0]
+
+
+def _company_keys(s: pd.Series) -> pd.Series:
+    s = s.str.lower().str.replace("&", "and", regex=False)
+    return s.str.replace(r"[.,]", "", regex=True).str.strip()
+
+
+def normalize_companies(values: pd.Series) -> pd.Series:
+    """Lowercased names with & -> and and dots/commas removed."""
+    return _per_distinct(values, _company_keys).fillna("")
+
+
+def normalize_company(name) -> str:
+    if not isinstance(name, str):
+        return ""
+    return normalize_companies(pd.Series([name], dtype=object)).iloc[0]
+
+
+def normalize_emails(values: pd.Series) -> pd.Series:
+    """Stripped, lowercased emails; non-strings and blanks -> None."""
+    return _per_distinct(values, lambda s: _blank_to_none(s.str.strip().str.lower()))
+
+
+def normalize_email(email) -> str | None:
+    if not isinstance(email, str):
+        return None
+    return normalize_emails(pd.Series([email], dtype=object)).iloc[0]
+
+
+def join_keys(values: pd.Series, key: str) -> pd.Series:
+    if key == KEY_DOMAIN:
+        return canonicalize_domains(values)
+    if key == KEY_COMPANY:
+        normalized = normalize_companies(values)
+        return normalized.where(normalized != "", None)
+    raise ValueError(f"Unknown merge key: {key!r}")
+
+
+# =========================
+# Merge
+# =========================
+def emails_by_key(keys: pd.Series, emails: pd.Series,
+                  aggregate: bool = True) -> pd.Series:
+    """
+    One email value per key: all distinct emails sorted and joined with
+    EMAIL_SEPARATOR, or the first one seen when aggregate is False.
+    """
+    emails = normalize_emails(emails)
+    known = (keys.notna() & emails.notna()).to_numpy()
+    key_codes, key_values = pd.factorize(keys[known])
+    # Emails are coded in sorted order, so sorting codes sorts emails
+    email_codes, email_values = pd.factorize(emails[known], sort=True)
+    email_values = np.asarray(email_values, dtype=object)
+    if not len(key_codes):
+        return pd.Series(dtype=object)
+
+    if not aggregate:
+        first = ~pd.Series(key_codes).duplicated().to_numpy()
+        return pd.Series(email_values[email_codes[first]],
+                         index=key_values[key_codes[first]], dtype=object)
+
+    # One sort over (key, email) pair codes groups and orders everything
+    pairs = np.unique(key_codes.astype(np.int64) * len(email_values) + email_codes)
+    key_idx, email_idx = np.divmod(pairs, len(email_values))
+    starts = np.flatnonzero(np.r_[True, key_idx[1:] != key_idx[:-1]])
+    ends = np.r_[starts[1:], len(pairs)]
+    ordered = email_values[email_idx]
+    joined = [EMAIL_SEPARATOR.join(ordered[a:b]) for a, b in zip(starts, ends)]
+    return pd.Series(joined, index=key_values[key_idx[starts]], dtype=object)
+
+
+def coalesce(df: pd.DataFrame, columns: list[str]) -> pd.Series:
+    """Row-wise first non-blank value across columns (None if none)."""
+    result = pd.Series(None, index=df.index, dtype=object)
+    for col in reversed([c for c in columns if c in df.columns]):
+        values = df[col].astype(object)
+        known = values.notna() & (values.astype(str).str.strip() != "")
+        result = values.where(known, result)
+    return result.where(result.notna(), None)
+
+
+def merge_contacts(companies: pd.DataFrame, contacts: pd.DataFrame,
+                   config: MergeConfig) -> pd.DataFrame:
+    """Attach contacts' emails to companies as described by config."""
+    contact_names = _column(contacts, config.contacts_key_column)
+    contact_keys = join_keys(contact_names, config.key)
+    company_names = companies[config.companies_key_column]
+    scores = None
+    if config.fuzzy:
+        if config.key != KEY_COMPANY:
+            raise ValueError("Fuzzy matching needs the company key")
+        # Each company joins on the key of its closest contact name
+        matches = best_matches(company_names, contact_names,
+                               config.match_threshold)
+        company_keys = join_keys(matches["Match"], config.key)
+        scores = matches["Match_Score"]
+    else:
+        company_keys = join_keys(company_names, config.key)
+    emails = emails_by_key(contact_keys,
+                           _column(contacts, config.contacts_email_column),
+                           config.aggregate)
+
+    merged = companies.copy()
+    attached = company_keys.map(emails).astype(object)
+    merged[config.email_column] = attached.where(attached.notna(), None)
+    if scores is not None:
+        merged[config.score_column] = scores
+
+    if config.append_missing:
+        missing = emails[~emails.index.isin(company_keys.dropna())]
+        if len(missing):
+            names = missing.index
+            if config.key == KEY_COMPANY:
+                # Appended companies keep the contacts' own spelling
+                first = contact_names.groupby(contact_keys.to_numpy()).first()
+                names = first.reindex(missing.index).to_numpy()
+            extra = pd.DataFrame({
+                "Company Name": names,
+                config.companies_key_column: names,
+                config.email_column: missing.to_numpy(),
+            })
+            merged = pd.concat([merged, extra], ignore_index=True)
+
+    if config.final_column:
+        merged[config.final_column] = coalesce(merged, config.final_sources)
+    if not config.keep_email_column and config.email_column != config.final_column:
+        merged = merged.drop(columns=[config.email_column])
+    return merged
+
+
+def _column(df: pd.DataFrame, column: str | int) -> pd.Series:
+    return df.iloc[:, column] if isinstance(column, int) else df[column]
+
+
+# =========================
+# I/O
+# =========================
+def write_table(df: pd.DataFrame, path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if path.lower().endswith(".csv"):
+        df.to_csv(path, index=False)
+    else:
+        write_xlsx(df, path)
+
+
+def load_config(preset: str | None = None, config_file: str | None = None,
+                **overrides) -> MergeConfig:
+    """Defaults, then the preset, then the JSON file, then overrides."""
+    values = {}
+    if preset:
+        if preset not in PRESETS:
+            raise ValueError(f"Unknown preset: {preset!r} "
+                             f"(choose from {', '.join(PRESETS)})")
+        values.update(PRESETS[preset])
+    if config_file:
+        with open(config_file, encoding="utf-8") as f:
+            values.update(json.load(f))
+    values.update({k: v for k, v in overrides.items() if v is not None})
+
+    known = {f.name for f in fields(MergeConfig)}
+    unknown = sorted(set(values) - known)
+    if unknown:
+        raise ValueError(f"Unknown merge settings: {', '.join(unknown)}")
+    return MergeConfig(**values)
+
+
+def run(config: MergeConfig) -> pd.DataFrame:
+    companies = load_table(config.companies_file)
+    columns = [config.contacts_key_column, config.contacts_email_column]
+    if not all(isinstance(col, str) for col in columns):
+        columns = None   # positional columns are picked after loading
+    contacts = load_table(config.contacts_file, columns=columns,
+                          header=config.contacts_header)
+    merged = merge_contacts(companies, contacts, config)
+    write_table(merged, config.output_file)
+    return merged
+
+
+# =========================
+# Main
+# =========================
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Merge a contacts list onto the enriched companies file.")
+    parser.add_argument("--preset", choices=sorted(PRESETS))
+    parser.add_argument("--config", help="JSON file of MergeConfig fields")
+    parser.add_argument("--companies", dest="companies_file")
+    parser.add_argument("--contacts", dest="contacts_file")
+    parser.add_argument("--output", dest="output_file")
+    parser.add_argument("--key", choices=[KEY_DOMAIN, KEY_COMPANY])
+    parser.add_argument("--append-missing", dest="append_missing",
+                        action="store_true", default=None)
+    parser.add_argument("--no-aggregate", dest="aggregate",
+                        action="store_false", default=None)
+    parser.add_argument("--fuzzy", action="store_true", default=None,
+                        help="match company names by similarity")
+    parser.add_argument("--threshold", dest="match_threshold", type=float)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = vars(parse_args(argv))
+    config = load_config(args.pop("preset"), args.pop("config"), **args)
+    merged = run(config)
+    print(f"✔ Merged {len(merged)} rows. File saved to: {config.output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Per-stage run metrics.
+Every stage (search, page fetches per path, parse, email, country)
+records its latency into a fixed-bucket histogram together with an
+outcome (ok, timeout, error, or a stage-specific one like "miss").
+Plain counters hold run totals. The end of a run prints a summary table
+and can export everything as JSON for comparing runs.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+import requests
+
+
+# =========================
+# Configuration
+# =========================
+# Histogram bucket upper bounds in milliseconds (last bucket = overflow)
+BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+OUTCOME_OK = "ok"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_ERROR = "error"
+
+
+class Histogram:
+    """Latency histogram over BUCKETS_MS plus count / sum / max."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float) -> None:
+        self.buckets[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (ms)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max, 3),
+            "buckets_ms": BUCKETS_MS,
+            "buckets": list(self.buckets),
+        }
+
+
+class Metrics:
+    """Thread-safe registry of stage histograms, outcomes and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency: dict[str, Histogram] = {}
+        self._outcomes: dict[str, dict[str, int]] = {}
+        self._counters: dict[str, int] = {}
+        self._started = time.time()
+
+    def record(self, stage: str, seconds: float,
+               outcome: str = OUTCOME_OK) -> None:
+        with self._lock:
+            hist = self._latency.get(stage)
+            if hist is None:
+                hist = self._latency[stage] = Histogram()
+            hist.add(seconds * 1000)
+            outcomes = self._outcomes.setdefault(stage, {})
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self._started,
+                "elapsed_s": round(time.time() - self._started, 3),
+                "stages": {
+                    stage: {**hist.to_dict(),
+                            "outcomes": dict(self._outcomes[stage])}
+                    for stage, hist in sorted(self._latency.items())
+                },
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+
+class _StageTimer:
+    """Handle yielded by stage(); set .outcome to override "ok"."""
+
+    def __init__(self):
+        self.outcome = OUTCOME_OK
+
+
+def classify_error(exc: BaseException) -> str:
+    if isinstance(exc, (requests.Timeout, TimeoutError)):
+        return OUTCOME_TIMEOUT
+    return OUTCOME_ERROR
+
+
+_metrics = Metrics()
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Time a block as one run of stage `name`. Exceptions are recorded as
+    timeout / error (unless the block set its own outcome first) and
+    re-raised; otherwise the handle's outcome is used.
+    """
+    timer = _StageTimer()
+    start = time.perf_counter()
+    try:
+        yield timer
+    except BaseException as e:
+        if timer.outcome == OUTCOME_OK:
+            timer.outcome = classify_error(e)
+        raise
+    finally:
+        _metrics.record(name, time.perf_counter() - start, timer.outcome)
+
+
+def record(stage_name: str, seconds: float, outcome: str = OUTCOME_OK) -> None:
+    _metrics.record(stage_name, seconds, outcome)
+
+
+def count(name: str, n: int = 1) -> None:
+    _metrics.count(name, n)
+
+
+def snapshot() -> dict:
+    return _metrics.snapshot()
+
+
+def reset() -> None:
+    global _metrics
+    _metrics = Metrics()
+
+
+# =========================
+# Reporting
+# =========================
+def summary_table(snap: dict | None = None) -> str:
+    """Fixed-width table: one line per stage, then the counters."""
+    snap = snap or snapshot()
+    lines = [
+        f"{'stage':<24} {'count':>7} {'mean ms':>9} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'max ms':>9}  outcomes",
+    ]
+    for name, s in snap["stages"].items():
+        outcomes = ", ".join(f"{k}={v}" for k, v in sorted(s["outcomes"].items()))
+        lines.append(
+            f"{name:<24} {s['count']:>7} {s['mean_ms']:>9.1f} "
+            f"{s['p50_ms']:>8.0f} {s['p95_ms']:>8.0f} {s['max_ms']:>9.1f}  "
+            f"{outcomes}"
+        )
+    if snap["counters"]:
+        lines.append("")
+        width = max(len(name) for name in snap["counters"])
+        lines.extend(f"{name:<{width}}  {value}"
+                     for name, value in snap["counters"].items())
+    return "\n".join(lines)
+
+
+def write_json(path: str, snap: dict | None = None) -> None:
+    """Write a snapshot as JSON (atomically, via a temp file)."""
+    snap = snap or snapshot()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snap, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
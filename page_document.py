@@ -0,0 +1,226 @@
+"""
+Parse-once page wrapper shared by all extractors.
+Each view (plain text, lowercased text, <html lang>, title and site
+name, mailto addresses, links, address-like text blocks) is computed
+on first use and then reused, so a page's tree is walked once per view
+instead of once per extractor.
+
+Pages are parsed by a selectable backend (see PARSER_BACKEND); every
+backend exposes the same views, so extractors do not care which one
+built the document.
+"""
+
+from functools import cached_property
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional fast backend
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401  (only needed as a BeautifulSoup tree builder)
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+# =========================
+# Configuration
+# =========================
+# "auto" = fastest installed of selectolax > lxml > html.parser
+PARSER_BACKEND = "auto"
+BACKENDS = ["html.parser", "lxml", "selectolax"]
+
+# Element ids/classes that usually wrap a postal address
+ADDRESS_HINTS = ("contact", "address", "footer", "location", "impressum")
+
+# Meta tags naming the site / brand
+SITE_NAME_SELECTOR = 'meta[property="og:site_name"], meta[name="application-name"]'
+
+# Tags whose strings BeautifulSoup.get_text leaves out
+NON_TEXT_TAGS = ["script", "style", "template", "rt", "rp"]
+
+
+class PageDocument:
+    """A fetched page with lazily cached text views."""
+
+    def __init__(self, soup: BeautifulSoup):
+        self.soup = soup
+
+    @cached_property
+    def text(self) -> str:
+        return self.soup.get_text(" ", strip=True)
+
+    @cached_property
+    def text_lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def lang(self) -> str | None:
+        """Lowercased <html lang> value, or None if missing/empty."""
+        html_tag = self.soup.find("html")
+        if html_tag and html_tag.get("lang"):
+            return html_tag["lang"].strip().lower()
+        return None
+
+    @cached_property
+    def title(self) -> str:
+        """Text of <title>, or "" if missing."""
+        el = self.soup.find("title")
+        return el.get_text(" ", strip=True) if el else ""
+
+    @cached_property
+    def site_name(self) -> str:
+        """og:site_name / application-name meta content, or ""."""
+        el = self.soup.select_one(SITE_NAME_SELECTOR)
+        return (el.get("content") or "").strip() if el else ""
+
+    def hrefs(self, selector: str) -> list[str]:
+        """href values of the elements matching a CSS selector."""
+        return [el.get("href") or "" for el in self.soup.select(selector)]
+
+    def has(self, selector: str) -> bool:
+        """True if any element matches a CSS selector."""
+        return self.soup.select_one(selector) is not None
+
+    @cached_property
+    def mailto_addresses(self) -> list[str]:
+        """Addresses from mailto: links, without the scheme or ?query."""
+        return [
+            href.replace("mailto:", "").split("?")[0]
+            for href in self.hrefs('a[href^="mailto:"]')
+        ]
+
+    @cached_property
+    def anchors(self) -> list[tuple[str, str]]:
+        """(href, link text) for every <a href>, in document order."""
+        return [
+            (el.get("href").strip(), el.get_text(" ", strip=True))
+            for el in self.soup.select("a[href]")
+        ]
+
+    @cached_property
+    def address_texts(self) -> list[str]:
+        """
+        Lowercased text of address-like elements (<footer>, <address>,
+        and blocks whose id/class hints at contact details). Falls back
+        to the whole page when there are none.
+        """
+        candidates = self.soup.find_all(["footer", "address"])
+        for el in self.soup.find_all(["div", "section", "p"], limit=200):
+            el_id = (el.get("id") or "").lower()
+            el_class = " ".join(el.get("class") or []).lower()
+            if any(kw in el_id or kw in el_class for kw in ADDRESS_HINTS):
+                candidates.append(el)
+
+        if not candidates:
+            return [self.text_lower]
+        return [el.get_text(" ", strip=True).lower() for el in candidates]
+
+
+class SelectolaxDocument(PageDocument):
+    """
+    PageDocument backed by selectolax's lexbor engine. Views match the
+    BeautifulSoup ones; .soup is only built if a caller asks for it.
+    """
+
+    def __init__(self, html: str):
+        self.html = html
+        self.tree = LexborHTMLParser(html)
+        self.tree.strip_tags(NON_TEXT_TAGS)
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, "html.parser")
+
+    @cached_property
+    def text(self) -> str:
+        root = self.tree.root
+        return root.text(separator=" ", strip=True) if root else ""
+
+    @cached_property
+    def lang(self) -> str | None:
+        html_tag = self.tree.css_first("html")
+        lang = html_tag.attributes.get("lang") if html_tag else None
+        if lang and lang.strip():
+            return lang.strip().lower()
+        return None
+
+    @cached_property
+    def title(self) -> str:
+        el = self.tree.css_first("title")
+        return el.text(separator=" ", strip=True) if el else ""
+
+    @cached_property
+    def site_name(self) -> str:
+        el = self.tree.css_first(SITE_NAME_SELECTOR)
+        return (el.attributes.get("content") or "").strip() if el else ""
+
+    def hrefs(self, selector: str) -> list[str]:
+        return [el.attributes.get("href") or ""
+                for el in self.tree.css(selector)]
+
+    def has(self, selector: str) -> bool:
+        return self.tree.css_first(selector) is not None
+
+    @cached_property
+    def anchors(self) -> list[tuple[str, str]]:
+        return [
+            ((el.attributes.get("href") or "").strip(),
+             el.text(separator=" ", strip=True))
+            for el in self.tree.css("a[href]")
+        ]
+
+    @cached_property
+    def address_texts(self) -> list[str]:
+        candidates = self.tree.css("footer, address")
+        for el in self.tree.css("div, section, p")[:200]:
+            el_id = (el.attributes.get("id") or "").lower()
+            el_class = (el.attributes.get("class") or "").lower()
+            if any(kw in el_id or kw in el_class for kw in ADDRESS_HINTS):
+                candidates.append(el)
+
+        if not candidates:
+            return [self.text_lower]
+        return [el.text(separator=" ", strip=True).lower() for el in candidates]
+
+
+# =========================
+# Backends
+# =========================
+def available_backends() -> list[str]:
+    """Installed backends, slowest first."""
+    backends = ["html.parser"]
+    if HAS_LXML:
+        backends.append("lxml")
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    return backends
+
+
+def resolve_backend(backend: str | None = None) -> str:
+    backend = backend or PARSER_BACKEND
+    if backend == "auto":
+        return available_backends()[-1]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend!r}")
+    if backend not in available_backends():
+        raise ImportError(f"Parser backend {backend!r} is not installed")
+    return backend
+
+
+def parse_document(html: str, backend: str | None = None) -> PageDocument:
+    """Parse HTML with the configured (or given) backend."""
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        return SelectolaxDocument(html)
+    return PageDocument(BeautifulSoup(html, backend))
+
+
+def as_document(page: "PageDocument | BeautifulSoup") -> PageDocument:
+    """Wrap a raw soup; pass PageDocuments through unchanged."""
+    if isinstance(page, PageDocument):
+        return page
+    return PageDocument(page)
@@ -1,7 +1,15 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+import asyncio
+import threading
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
 
+import http_client
+import metrics
+from page_document import PageDocument, parse_document
+
+# Standard pages, in the priority order lazy fetching requests them
 PAGES = [
     "",
     "/contact",
@@ -11,22 +19,258 @@ PAGES = [
     "/impressum",
 ]
 
-HEADERS = {"User-Agent": "Mozilla/5.0"}
+HEADERS = http_client.HEADERS
 TIMEOUT = 8
 
+# True = request all PAGES of a site concurrently (about one round trip)
+# False = request them one after another
+CONCURRENT_FETCH = True
+
+# True = fetch the homepage first and follow its contact / imprint /
+# about links; the static PAGES list is only probed when none are found
+DISCOVERY = True
+MAX_DISCOVERED = 3
+
+# Link kinds in rank order, each matched against the lowercased link
+# path (with query) and link text. Imprints outrank about pages: they carry the
+# postal address and email the extractors look for.
+LINK_KEYWORDS = [
+    ("contact", "kontakt", "contatt", "contato", "iletisim"),
+    ("impressum", "imprint", "legal-notice", "mentions-legales",
+     "aviso-legal", "note-legali"),
+    ("about", "ueber-uns", "uber-uns", "über uns", "chi-siamo",
+     "quienes-somos", "qui-sommes", "hakkimizda", "unternehmen"),
+]
+
+# Linked files never worth parsing as pages
+SKIP_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg",
+                   ".zip", ".doc", ".docx", ".xls", ".xlsx")
+
+# Pages iter_pages keeps in flight ahead of the consumer (1 = strictly
+# one at a time, fewest wasted requests on an early stop)
+LAZY_PREFETCH = 2
+
+
+# =========================
+# Stats
+# =========================
+_stats_lock = threading.Lock()
+_stats = {"pages_requested": 0, "pages_skipped": 0, "sites_discovered": 0}
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += n
+
+
+def fetch_stats() -> dict[str, int]:
+    """
+    Pages requested, pages skipped by an early stop in iter_pages, and
+    sites whose follow-up pages came from homepage links.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_fetch_stats() -> None:
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def _page_label(path: str) -> str:
+    """Metrics stage for a path; discovered links share one stage."""
+    if path in PAGES:
+        return f"fetch {path or '/'}"
+    return "fetch (discovered)"
+
+
+def _fetch_page(base_url: str, path: str) -> PageDocument | None:
+    """
+    Fetch a single page; return parsed HTML only for HTTP 200 with a
+    body (non-HTML responses come back empty from http_client).
+    """
+    _count("pages_requested")
+    try:
+        with metrics.stage(_page_label(path)) as timer:
+            try:
+                r = http_client.get(urljoin(base_url, path), headers=HEADERS,
+                                    timeout=TIMEOUT)
+            except http_client.HostUnavailable:
+                timer.outcome = "dead_host"
+                return None
+            if r.status_code != 200:
+                timer.outcome = f"http_{r.status_code}"
+                return None
+            if not r.text:
+                timer.outcome = "not_html"
+                return None
+        with metrics.stage("parse"):
+            return parse_document(r.text)
+    except Exception:
+        return None
+
+
+# =========================
+# Link discovery
+# =========================
+def _same_site(host: str, base_host: str) -> bool:
+    return host.removeprefix("www.") == base_host.removeprefix("www.")
+
+
+def discover_links(home: PageDocument, base_url: str) -> list[str]:
+    """
+    Contact / imprint / about paths linked from a homepage, at most one
+    per LINK_KEYWORDS kind and MAX_DISCOVERED in total, best kind first
+    and in link order within a kind. Off-site links and files are ignored.
+    """
+    base_host = urlparse(base_url).netloc.lower()
+    best: dict[int, tuple[int, str]] = {}
+
+    for position, (href, text) in enumerate(home.anchors):
+        url = urlparse(urljoin(base_url, href))
+        if url.scheme not in ("http", "https"):
+            continue
+        if not _same_site(url.netloc.lower(), base_host):
+            continue
+        path = url.path or "/"
+        if path == "/" or path.lower().endswith(SKIP_EXTENSIONS):
+            continue
+        if url.query:
+            path = f"{path}?{url.query}"
+
+        haystack = f"{path.lower()} {text.lower()}"
+        for rank, keywords in enumerate(LINK_KEYWORDS):
+            if any(kw in haystack for kw in keywords):
+                if rank not in best:
+                    best[rank] = (position, path)
+                break
+
+    links = []
+    for rank in sorted(best):
+        path = best[rank][1]
+        if path not in links:
+            links.append(path)
+    return links[:MAX_DISCOVERED]
+
+
+def _followup_paths(home: PageDocument | None, base_url: str,
+                    paths: list[str]) -> list[str]:
+    """Discovered links from the homepage, else the static paths."""
+    static = [path for path in paths if path]
+    if home is None:
+        return static
+    links = discover_links(home, base_url)
+    if not links:
+        return static
+    _count("sites_discovered")
+    return links
+
+
+def _discovers(paths: list[str]) -> bool:
+    # Discovery needs the homepage; explicit subsets without it probe as-is
+    return DISCOVERY and "" in paths
+
+
+async def fetch_pages_async(base_url: str,
+                            paths: list[str] | None = None) -> dict[str, PageDocument]:
+    """
+    Fetch all standard company pages concurrently.
+    Same contract as fetch_pages: only pages that returned HTTP 200,
+    keyed by path in request order.
+    """
+    paths = PAGES if paths is None else paths
+    results = {}
+    if _discovers(paths):
+        home = await asyncio.to_thread(_fetch_page, base_url, "")
+        if home is not None:
+            results[""] = home
+        paths = _followup_paths(home, base_url, paths)
+
+    tasks = [
+        asyncio.to_thread(_fetch_page, base_url, path)
+        for path in paths
+    ]
+    docs = await asyncio.gather(*tasks)
+    results.update(
+        (path, doc)
+        for path, doc in zip(paths, docs)
+        if doc is not None
+    )
+    return results
+
 
-def fetch_pages(base_url: str) -> dict[str, BeautifulSoup]:
+def fetch_pages(base_url: str,
+                paths: list[str] | None = None) -> dict[str, PageDocument]:
     """
-    Fetch standard company pages and return parsed HTML.
+    Fetch standard company pages and return them parsed, as
+    PageDocuments (the soup is available as .soup).
     Only includes pages that returned HTTP 200.
+    paths limits the fetch to a subset (default: all PAGES). With
+    DISCOVERY, the homepage's own links replace the static paths.
     """
+    paths = PAGES if paths is None else paths
+    if not paths:
+        return {}
+    if CONCURRENT_FETCH:
+        return asyncio.run(fetch_pages_async(base_url, paths))
+
     results = {}
-    for path in PAGES:
-        try:
-            page_url = urljoin(base_url, path)
-            r = requests.get(page_url, headers=HEADERS, timeout=TIMEOUT)
-            if r.status_code == 200:
-                results[path] = BeautifulSoup(r.text, "html.parser")
-        except Exception:
-            continue
+    if _discovers(paths):
+        home = _fetch_page(base_url, "")
+        if home is not None:
+            results[""] = home
+        paths = _followup_paths(home, base_url, paths)
+
+    for path in paths:
+        doc = _fetch_page(base_url, path)
+        if doc is not None:
+            results[path] = doc
     return results
+
+
+def iter_pages(base_url: str,
+               paths: list[str] | None = None) -> Iterator[tuple[str, PageDocument]]:
+    """
+    Lazily yield (path, PageDocument) for pages that returned HTTP 200,
+    in paths order, keeping LAZY_PREFETCH requests in flight. With
+    DISCOVERY the homepage is fetched and yielded first, then its
+    discovered links. Closing the generator early (e.g. breaking out of
+    a loop over it) leaves the remaining paths unrequested; they are
+    counted as skipped.
+    """
+    paths = PAGES if paths is None else paths
+    home = None
+    if _discovers(paths):
+        home = _fetch_page(base_url, "")
+        paths = _followup_paths(home, base_url, paths)
+
+    pending = iter(paths)
+    in_flight = deque()
+    submitted = 0
+    pool = ThreadPoolExecutor(max_workers=max(1, LAZY_PREFETCH))
+
+    def _submit_next() -> None:
+        nonlocal submitted
+        path = next(pending, None)
+        if path is not None:
+            submitted += 1
+            in_flight.append(
+                (path, pool.submit(_fetch_page, base_url, path)))
+
+    try:
+        if home is not None:
+            yield "", home
+        for _ in range(max(1, LAZY_PREFETCH)):
+            _submit_next()
+        while in_flight:
+            path, future = in_flight.popleft()
+            doc = future.result()
+            _submit_next()
+            if doc is not None:
+                yield path, doc
+    finally:
+        _count("pages_skipped", len(paths) - submitted)
+        # Prefetches still in flight finish here rather than outliving the
+        # row (and the caller's http_client settings)
+        pool.shutdown(wait=True, cancel_futures=True)
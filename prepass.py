@@ -0,0 +1,165 @@
+"""
+Offline pre-pass: run every free signal over the whole frame before any
+network work, and decide per row which network stages are still needed.
+
+Free signals are values already in the input (a known website or email)
+plus the vectorized company-suffix and website-ccTLD countries. A row
+whose country is already settled and whose email is known needs no
+requests at all; a row missing only its email needs only EMAIL_PAGES.
+"""
+
+import re
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from country_enrich import (
+    CONFIDENCE_HIGH,
+    CONFIDENCE_LOW,
+    CONFIDENCE_MEDIUM,
+    infer_country_from_company_names,
+)
+from page_fetcher import PAGES
+from utils import infer_country_from_domains
+
+
+# =========================
+# Configuration
+# =========================
+# Input columns that may already hold an answer, most trusted first
+WEBSITE_COLUMNS = ["Inferred_Website", "Website"]
+EMAIL_COLUMNS = ["Inferred_Email", "Final_Email", "Email"]
+
+# Pre-pass confidence that counts as "country settled"
+SETTLED_CONFIDENCE = {CONFIDENCE_HIGH}
+
+# Pages worth fetching when only the email is missing
+EMAIL_PAGES = ["", "/contact", "/contact-us", "/impressum"]
+
+
+def _first_known(df: pd.DataFrame, columns: list[str]) -> pd.Series:
+    """Row-wise first non-blank value across columns (None if none)."""
+    known = pd.Series(None, index=df.index, dtype=object)
+    for col in reversed(columns):
+        if col not in df.columns:
+            continue
+        values = df[col].astype(object)
+        text = values.where(values.notna(), "").astype(str).str.strip()
+        known = values.where(text != "", known)
+    return known.where(known.notna(), None)
+
+
+# Host names a known website may carry: dotted word labels
+_HOST_RE = re.compile(r"[\w-]+(\.[\w-]+)+")
+
+
+def normalize_website(value) -> str | None:
+    """
+    A known website as scheme://host, the form fetches are joined onto.
+    Bare domains ("acme.de", "www.acme.de/kontakt") get https://; values
+    that do not hold a usable host come back None.
+    """
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if "://" not in value:
+        value = "https://" + value.lstrip("/")
+    try:
+        parsed = urlparse(value)
+        parsed.port   # raises on a malformed port
+    except ValueError:
+        return None
+    host = parsed.hostname
+    if parsed.scheme.lower() not in ("http", "https") or not host \
+            or "@" in parsed.netloc or not _HOST_RE.fullmatch(host):
+        return None
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+
+def _normalize_websites(websites: pd.Series) -> pd.Series:
+    codes, distinct = pd.factorize(websites)
+    normalized = [normalize_website(site) for site in distinct]
+    return pd.Series(
+        pd.array(normalized + [None], dtype=object)[codes],
+        index=websites.index, dtype=object,
+    )
+
+
+def plan_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Decide the network work each row still needs.
+
+    Returns a frame aligned with df:
+      Known_Website, Known_Email   answers already in the input; the
+                                   website as scheme://host, None when
+                                   it holds no usable host
+      Suffix_Country               company-name suffix country
+      Prepass_Country, Prepass_Confidence
+                                   resolve_country over the free signals
+      Needs_Search                 website must still be found
+      Pages                        page paths to fetch ([] = none)
+    """
+    names = df["Company Name"] if "Company Name" in df.columns \
+        else pd.Series(None, index=df.index, dtype=object)
+
+    website_columns = [col for col in WEBSITE_COLUMNS if col in df.columns]
+    website = _first_known(df[website_columns].apply(_normalize_websites),
+                           website_columns)
+    email = _first_known(df, EMAIL_COLUMNS)
+    suffix_country = infer_country_from_company_names(names)
+    cctld_country = infer_country_from_domains(website)
+
+    # resolve_country over two signals: ccTLD wins outright (high),
+    # a suffix alone is medium, nothing is low.
+    country = cctld_country.where(cctld_country.notna(), suffix_country)
+    confidence = pd.Series(
+        np.select(
+            [cctld_country.notna(), suffix_country.notna()],
+            [CONFIDENCE_HIGH, CONFIDENCE_MEDIUM],
+            default=CONFIDENCE_LOW,
+        ),
+        index=df.index,
+        dtype=object,
+    )
+
+    needs_country = ~confidence.isin(SETTLED_CONFIDENCE)
+    needs_email = email.isna()
+    needs_pages = needs_country | needs_email
+
+    pages = pd.Series(
+        [list(PAGES) if country_missing else
+         list(EMAIL_PAGES) if email_missing else []
+         for country_missing, email_missing in zip(needs_country, needs_email)],
+        index=df.index, dtype=object,
+    )
+
+    return pd.DataFrame({
+        "Known_Website": website,
+        "Known_Email": email,
+        "Suffix_Country": suffix_country,
+        "Prepass_Country": country.where(country.notna(), None),
+        "Prepass_Confidence": confidence,
+        "Needs_Search": website.isna() & needs_pages,
+        "Pages": pages,
+    }, index=df.index)
+
+
+def summarize_plan(plan: pd.DataFrame) -> dict[str, int]:
+    """
+    Requests the plan avoids, against the full pipeline's one search
+    plus len(PAGES) page fetches per row.
+    """
+    rows = len(plan)
+    searches = int(plan["Needs_Search"].sum())
+    page_fetches = int(plan["Pages"].map(len).sum())
+    baseline = rows * (1 + len(PAGES))
+    return {
+        "rows": rows,
+        "offline_rows": int((~plan["Needs_Search"]
+                             & (plan["Pages"].map(len) == 0)).sum()),
+        "searches_avoided": rows - searches,
+        "page_fetches_avoided": rows * len(PAGES) - page_fetches,
+        "requests_planned": searches + page_fetches,
+        "requests_avoided": baseline - searches - page_fetches,
+    }
@@ -0,0 +1,187 @@
+"""
+Streaming result writers.
+Rows are appended to a CSV or Parquet stream as they finish, then
+optionally converted to xlsx with openpyxl's constant-memory
+(write-only) mode. Parquet needs the optional pyarrow package.
+"""
+
+import csv
+import os
+
+import pandas as pd
+from openpyxl import Workbook
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet streams are optional
+    pa = None
+    pq = None
+
+
+# =========================
+# Configuration
+# =========================
+ROW_COLUMN = "Row"      # original input position, used to restore order
+FLUSH_EVERY = 100       # rows buffered before each append / row group
+
+# Low-cardinality result columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = ["Inferred_Country", "Country_Confidence"]
+
+
+def _to_cell(value):
+    """Normalize a value for a text stream (NaN/None -> None)."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    return str(value)
+
+
+# =========================
+# Writers
+# =========================
+class CsvResultWriter:
+    """Append-only CSV stream; the header is written once per file."""
+
+    def __init__(self, path: str, columns: list[str], append: bool = False,
+                 flush_every: int = FLUSH_EVERY):
+        self.path = path
+        self.columns = columns
+        self.flush_every = flush_every
+        self._buffer: list[list] = []
+
+        if not append and os.path.exists(path):
+            os.remove(path)
+        self._write_header = not os.path.exists(path)
+
+    def append(self, row: dict) -> None:
+        self._buffer.append([_to_cell(row.get(col)) for col in self.columns])
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer and not self._write_header:
+            return
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            if self._write_header:
+                writer.writerow(self.columns)
+                self._write_header = False
+            writer.writerows(self._buffer)
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+
+class ParquetResultWriter:
+    """
+    Parquet stream written one row group per flush. Values are stored as
+    text; read_results restores compact dtypes. Appending to an existing
+    file rewrites its row groups into the new writer once, at open. A
+    file left without a footer by a hard crash cannot be read back; it
+    is moved aside to <path>.corrupt and the stream starts over (a
+    resumed run re-streams its checkpointed rows); so is one whose
+    columns no longer match, moved to <path>.stale.
+    """
+
+    def __init__(self, path: str, columns: list[str], append: bool = False,
+                 flush_every: int = FLUSH_EVERY):
+        if pa is None:
+            raise ImportError("Parquet result streams require pyarrow")
+        self.path = path
+        self.columns = columns
+        self.flush_every = flush_every
+        self._buffer: list[dict] = []
+        self._schema = pa.schema([(col, pa.string()) for col in columns])
+
+        previous = None
+        if append and os.path.exists(path):
+            try:
+                previous = pq.read_table(path)
+            except (pa.ArrowInvalid, OSError) as e:
+                os.replace(path, path + ".corrupt")
+                print(f"Unreadable result stream moved to {path}.corrupt ({e})")
+        if previous is not None:
+            try:
+                previous = previous.cast(self._schema)
+            except ValueError:   # input columns changed since the last run
+                previous = None
+                os.replace(path, path + ".stale")
+                print(f"Result stream columns changed; old stream moved "
+                      f"to {path}.stale")
+        self._writer = pq.ParquetWriter(path, self._schema)
+        if previous is not None:
+            self._writer.write_table(previous)
+
+    def append(self, row: dict) -> None:
+        self._buffer.append({col: _to_cell(row.get(col)) for col in self.columns})
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        table = pa.Table.from_pylist(self._buffer, schema=self._schema)
+        self._writer.write_table(table)
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+
+
+def open_result_writer(path: str, columns: list[str], append: bool = False):
+    """Pick the stream format from the file extension (.csv / .parquet)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if path.lower().endswith(".parquet"):
+        return ParquetResultWriter(path, columns, append=append)
+    return CsvResultWriter(path, columns, append=append)
+
+
+# =========================
+# Reading / conversion
+# =========================
+def read_results(path: str, numeric_columns=()) -> pd.DataFrame:
+    """
+    Load a result stream in input order with compact dtypes.
+    Streams hold text: numeric_columns (those that were numeric in the
+    input) get their numbers back, every other column stays text so
+    values like zip "01234" survive. If a row was streamed more than
+    once (e.g. across a resume), the last copy wins.
+    """
+    if path.lower().endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False,
+                         na_values=[""])
+
+    for col in [ROW_COLUMN, *numeric_columns]:
+        if col not in df.columns or col in CATEGORICAL_COLUMNS:
+            continue
+        try:
+            df[col] = pd.to_numeric(df[col])
+        except (ValueError, TypeError):
+            pass
+
+    if ROW_COLUMN in df.columns:
+        df = (df.drop_duplicates(ROW_COLUMN, keep="last")
+                .sort_values(ROW_COLUMN)
+                .drop(columns=[ROW_COLUMN])
+                .reset_index(drop=True))
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def write_xlsx(df: pd.DataFrame, path: str) -> None:
+    """Write df to xlsx row by row with openpyxl's write-only workbook."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append([str(col) for col in df.columns])
+    for values in df.itertuples(index=False, name=None):
+        ws.append([None if pd.isna(v) else v for v in values])
+    wb.save(path)
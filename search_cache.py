@@ -0,0 +1,91 @@
+"""
+Persistent cache of resolved company websites (SQLite).
+Maps a normalized company name to the website find_website returned,
+including "no result" answers, which expire sooner.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+
+# =========================
+# Configuration
+# =========================
+RESULT_TTL = 90 * 24 * 3600     # seconds a resolved website is trusted
+NO_RESULT_TTL = 7 * 24 * 3600   # seconds a "no website found" is trusted
+
+
+def normalize_company_name(name: str) -> str:
+    """Case-, width- and punctuation-insensitive cache key."""
+    if not isinstance(name, str):
+        return ""
+    name = unicodedata.normalize("NFKC", name).lower().replace("&", " and ")
+    name = re.sub(r"[^\w\s]", " ", name)
+    return " ".join(name.split())
+
+
+class SearchCache:
+    """Thread-safe SQLite map of normalized company name -> website."""
+
+    def __init__(self, path: str, ttl: float = RESULT_TTL,
+                 no_result_ttl: float = NO_RESULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.no_result_ttl = no_result_ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS websites ("
+            " name TEXT PRIMARY KEY,"
+            " website TEXT,"
+            " resolved_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def lookup(self, company_name: str) -> tuple[bool, str | None]:
+        """
+        Return (hit, website). website is None on a cached "no result";
+        hit is False when the name is unknown or its entry has expired.
+        """
+        key = normalize_company_name(company_name)
+        if not key:
+            return (False, None)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT website, resolved_at FROM websites WHERE name = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return (False, None)
+
+        website, resolved_at = row
+        ttl = self.ttl if website else self.no_result_ttl
+        if time.time() - resolved_at > ttl:
+            return (False, None)
+        return (True, website)
+
+    def store(self, company_name: str, website: str | None) -> None:
+        key = normalize_company_name(company_name)
+        if not key:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO websites (name, website, resolved_at)"
+                " VALUES (?, ?, ?)",
+                (key, website, time.time()),
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
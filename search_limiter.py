@@ -0,0 +1,88 @@
+"""
+Adaptive rate limiting for search queries.
+A token bucket whose rate follows AIMD: every answered query nudges the
+rate up by a fixed step, every throttled one cuts it by a factor and
+pauses all callers for a jittered exponential backoff.
+"""
+
+import random
+import threading
+import time
+
+
+# =========================
+# Configuration
+# =========================
+SEARCH_RATE = 1.0            # starting queries per second
+SEARCH_MIN_RATE = 0.1        # floor after repeated throttling
+SEARCH_MAX_RATE = 4.0        # ceiling reached by additive increase
+SEARCH_RATE_STEP = 0.05      # queries/s added per answered query
+SEARCH_BACKOFF_FACTOR = 0.5  # rate multiplier per throttled query
+SEARCH_BURST = 2             # queries allowed back to back
+
+BACKOFF_BASE = 2.0           # seconds; doubles per consecutive retry
+BACKOFF_MAX = 60.0           # cap on a single backoff pause
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE,
+                  cap: float = BACKOFF_MAX) -> float:
+    """Full-jitter exponential backoff for the given retry (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe AIMD token bucket shared by all search callers."""
+
+    def __init__(self, rate: float = SEARCH_RATE,
+                 min_rate: float = SEARCH_MIN_RATE,
+                 max_rate: float = SEARCH_MAX_RATE,
+                 step: float = SEARCH_RATE_STEP,
+                 backoff_factor: float = SEARCH_BACKOFF_FACTOR,
+                 burst: int = SEARCH_BURST,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self.backoff_factor = backoff_factor
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until a query may be sent."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def success(self) -> None:
+        """Additive increase after an answered query."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.step)
+
+    def throttled(self, pause: float) -> None:
+        """Multiplicative decrease, and hold every caller for `pause` s."""
+        with self._lock:
+            now = self._clock()
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            self._paused_until = max(self._paused_until, now + pause)
+            self._tokens = 0.0
+            self._updated = now
@@ -0,0 +1,229 @@
+"""
+Local stand-in for the web, for offline benchmarks and tests.
+One ThreadingHTTPServer answers for every host: synthetic company sites
+picked by the Host header, and a fake DuckDuckGo /html/ results page on
+SEARCH_HOST. route_all_hosts() points every hostname at the server, so
+sites keep realistic names (company12.de) and per-host limits apply.
+"""
+
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+import urllib3.util.connection
+
+
+# =========================
+# Configuration
+# =========================
+SEARCH_HOST = "search.test"
+
+# (tld, company suffix, html lang, phone prefix, address line)
+COUNTRIES = [
+    ("de", "GmbH", "de", "+49 30", "Hauptstraße 5, 10115 Berlin, Deutschland"),
+    ("fr", "SARL", "fr", "+33 1", "12 rue de la Paix, 75002 Paris, France"),
+    ("it", "S.r.l.", "it", "+39 02", "Via Roma 3, 20121 Milano, Italia"),
+    ("nl", "B.V.", "nl", "+31 20", "Keizersgracht 1, Amsterdam, Nederland"),
+    ("com.tr", "A.Ş.", "tr", "+90 212", "Levent Mah., Istanbul, Türkiye"),
+    ("com", "Inc", "en", "+1 212", "5th Avenue, New York, USA"),
+]
+
+
+@dataclass
+class SiteProfile:
+    """How synthetic sites behave; rates are per response."""
+    latency_ms: float = 20       # base server latency per response
+    jitter_ms: float = 10        # extra uniform random latency
+    error_rate: float = 0.02     # HTTP 500 on any page
+    redirect_rate: float = 0.1   # homepage 301 -> /index.html
+    no_site_rate: float = 0.05   # companies the search cannot find
+    page_kb: int = 30            # homepage padding text size
+    seed: int = 0
+
+
+def company_name(n: int) -> str:
+    return f"Company{n} {COUNTRIES[n % len(COUNTRIES)][1]}"
+
+
+def company_host(n: int) -> str:
+    return f"company{n}.{COUNTRIES[n % len(COUNTRIES)][0]}"
+
+
+def _company_number(text: str) -> int | None:
+    match = re.search(r"company(\d+)", text, re.IGNORECASE)
+    return int(match.group(1)) if match else None
+
+
+# =========================
+# Pages
+# =========================
+def search_page(n: int | None, port: int, found: bool) -> str:
+    results = ['<a class="result__a" href="https://www.linkedin.com/company/x">x</a>']
+    if n is not None and found:
+        target = quote(f"http://{company_host(n)}:{port}/", safe="")
+        results.append(
+            f'<a class="result__a" href="//duckduckgo.com/l/?uddg={target}">'
+            f"{company_name(n)}</a>"
+        )
+    return f"<html><body><div class='results'>{''.join(results)}</div></body></html>"
+
+
+def home_page(n: int, page_kb: int) -> str:
+    _, _, lang, phone, _ = COUNTRIES[n % len(COUNTRIES)]
+    contact = "kontakt" if lang == "de" else "contact"
+    filler = ("Quality products and services since 1990. " * 40)
+    padding = filler * max(1, page_kb * 1024 // len(filler))
+    return (
+        f'<html lang="{lang}"><head><title>{company_name(n)}</title></head><body>'
+        f'<nav><a href="/">Home</a><a href="/products">Products</a>'
+        f'<a href="/{contact}">{contact.title()}</a>'
+        f'<a href="/impressum">Impressum</a></nav>'
+        f"<main><h1>{company_name(n)}</h1><p>{padding}</p>"
+        f"<p>Sales: j.doe@{company_host(n)}</p></main>"
+        f"<footer>Tel {phone} {n:06d}</footer></body></html>"
+    )
+
+
+def contact_page(n: int) -> str:
+    return (f"<html><body><h1>Contact</h1>"
+            f'<a href="mailto:info@{company_host(n)}">Write to us</a></body></html>')
+
+
+def imprint_page(n: int) -> str:
+    address = COUNTRIES[n % len(COUNTRIES)][4]
+    return (f"<html><body><h1>Impressum</h1>"
+            f"<address>{company_name(n)}, {address}</address></body></html>")
+
+
+# =========================
+# Server
+# =========================
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def do_GET(self):
+        web = self.server.web
+        host = (self.headers.get("Host") or "").split(":")[0].lower()
+        web._count(search=host == SEARCH_HOST)
+        url = urlparse(self.path)
+        rng = random.Random(f"{web.profile.seed}:{host}:{url.path}")
+
+        delay = web.profile.latency_ms + rng.uniform(0, web.profile.jitter_ms)
+        time.sleep(delay / 1000)
+
+        if host == SEARCH_HOST:
+            query = parse_qs(url.query).get("q", [""])[0]
+            n = _company_number(query)
+            found = n is not None and web.has_site(n)
+            return self._send(200, search_page(n, web.port, found))
+
+        n = _company_number(host)
+        if n is None or not web.has_site(n):
+            return self._send(404, "<html>not found</html>")
+        if rng.random() < web.profile.error_rate:
+            return self._send(500, "<html>server error</html>")
+
+        path = url.path.rstrip("/") or "/"
+        if path == "/" and rng.random() < web.profile.redirect_rate:
+            return self._send(301, "", location="/index.html")
+        if path in ("/", "/index.html"):
+            return self._send(200, home_page(n, web.profile.page_kb))
+        if path in ("/kontakt", "/contact"):
+            return self._send(200, contact_page(n))
+        if path == "/impressum":
+            return self._send(200, imprint_page(n))
+        return self._send(404, "<html>not found</html>")
+
+    def _send(self, status: int, html: str, location: str | None = None):
+        body = html.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if location:
+            self.send_header("Location", location)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    web: "SyntheticWeb"
+
+
+class SyntheticWeb:
+    """Synthetic company sites + fake search engine on one local port."""
+
+    def __init__(self, profile: SiteProfile | None = None):
+        self.profile = profile or SiteProfile()
+        self.requests_served = 0
+        self.searches_served = 0
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.web = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+
+    def _count(self, search: bool = False) -> None:
+        with self._lock:
+            self.requests_served += 1
+            self.searches_served += search
+
+    def has_site(self, n: int) -> bool:
+        rng = random.Random(f"{self.profile.seed}:site:{n}")
+        return rng.random() >= self.profile.no_site_rate
+
+    @property
+    def search_url(self) -> str:
+        """Template for enrich.SEARCH_URL."""
+        return f"http://{SEARCH_HOST}:{self.port}/html/?q={{query}}"
+
+    @property
+    def guess_url(self) -> str:
+        """Template for domain_guess.GUESS_URL."""
+        return f"http://{{domain}}:{self.port}"
+
+    def site_url(self, n: int) -> str:
+        return f"http://{company_host(n)}:{self.port}"
+
+    def start(self) -> "SyntheticWeb":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "SyntheticWeb":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+@contextmanager
+def route_all_hosts(address: str = "127.0.0.1"):
+    """
+    Resolve every hostname urllib3 connects to as `address` (the port
+    in the URL is kept), so synthetic hosts never reach real DNS.
+    """
+    original = urllib3.util.connection.create_connection
+
+    def _create_connection(host_port, *args, **kwargs):
+        return original((address, host_port[1]), *args, **kwargs)
+
+    urllib3.util.connection.create_connection = _create_connection
+    try:
+        yield
+    finally:
+        urllib3.util.connection.create_connection = original
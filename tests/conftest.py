@@ -1,11 +1,41 @@
 """Shared fixtures for ICU enrichment agent tests."""
-import sys, os
+import sys, os, time
 import pytest
 from bs4 import BeautifulSoup
 
 # Allow imports from the parent enrichment_agent directory
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+import agent
+import dns_cache
+import enrich
+import http_client
+import loader
+from search_limiter import AdaptiveRateLimiter
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    """
+    Keep tests off the on-disk HTTP, dead-host, search and input sidecar
+    caches, DNS pre-resolution and domain guessing unless they opt in,
+    and give each test a fresh circuit breaker, DNS cache and unpaced
+    search limiter.
+    """
+    monkeypatch.setattr(http_client, "CACHE_ENABLED", False)
+    monkeypatch.setattr(http_client, "_cache", None)
+    monkeypatch.setattr(http_client, "DEAD_HOSTS_ENABLED", False)
+    monkeypatch.setattr(http_client, "_dead_hosts", None)
+    monkeypatch.setattr(http_client, "_breaker", http_client.CircuitBreaker())
+    monkeypatch.setattr(loader, "SIDECAR_CACHE", False)
+    monkeypatch.setattr(dns_cache, "_cache", dns_cache.DNSCache())
+    monkeypatch.setattr(agent, "PRERESOLVE", False)
+    monkeypatch.setattr(enrich, "DOMAIN_GUESS", False)
+    monkeypatch.setattr(enrich, "SEARCH_CACHE_ENABLED", False)
+    monkeypatch.setattr(enrich, "_search_cache", None)
+    monkeypatch.setattr(enrich, "_search_limiter",
+                        AdaptiveRateLimiter(rate=1000, max_rate=1000, burst=1000))
+
 
 @pytest.fixture
 def make_soup():
@@ -13,3 +43,45 @@ def make_soup():
     def _make(html: str) -> BeautifulSoup:
         return BeautifulSoup(html, "html.parser")
     return _make
+
+
+class FakeResponse:
+    """Stand-in for the CachedResponse http_client._send returns."""
+
+    def __init__(self, status_code: int = 200, text: str = "", url: str = ""):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+
+
+@pytest.fixture
+def fake_send(monkeypatch):
+    """
+    Factory fixture: route http_client._send to a {url: response} table
+    (or a callable taking the url) with the request limits lifted.
+    Responses are FakeResponses, HTML strings (served as 200) or
+    exceptions to raise; URLs not in the table get `missing`, a 404 by
+    default. Returns the list of URLs sent.
+    """
+    def _install(pages, missing=None, delay: float = 0.0):
+        calls = []
+        missing = FakeResponse(404) if missing is None else missing
+        lookup = pages if callable(pages) else \
+            (lambda url: pages.get(url, missing))
+
+        def _send(url, headers=None, timeout=None):
+            calls.append(url)
+            if delay:
+                time.sleep(delay)
+            result = lookup(url)
+            if isinstance(result, BaseException):
+                raise result
+            if isinstance(result, str):
+                return FakeResponse(200, result, url)
+            return result
+
+        monkeypatch.setattr(http_client, "_send", _send)
+        monkeypatch.setattr(http_client, "_limiter",
+                            http_client.RequestLimiter(32, 32, 0))
+        return calls
+    return _install
@@ -0,0 +1,323 @@
+"""Tests for agent.py — worker-pool orchestration."""
+import random
+import time
+import pandas as pd
+import pytest
+import agent
+import dns_cache
+import enrich
+import page_fetcher
+from checkpoint import Checkpoint
+from enrich import SearchThrottled
+
+
+@pytest.fixture
+def run_agent(monkeypatch, tmp_path):
+    """Run agent.main on a small frame with enrich_company stubbed."""
+    def _run(companies, enrich, workers=4, resume=True,
+             input_name="in.xlsx", **columns):
+        input_file = tmp_path / input_name
+        output_file = tmp_path / "out.xlsx"
+        frame = pd.DataFrame({"Company Name": companies, **columns})
+        if input_name.endswith(".csv"):
+            frame.to_csv(input_file, index=False)
+        elif input_name.endswith(".jsonl"):
+            frame.to_json(input_file, orient="records", lines=True)
+        elif input_name.endswith(".parquet"):
+            frame.to_parquet(input_file)
+        else:
+            frame.to_excel(input_file, index=False)
+        monkeypatch.setattr(agent, "INPUT_FILE", str(input_file))
+        monkeypatch.setattr(agent, "OUTPUT_FILE", str(output_file))
+        monkeypatch.setattr(agent, "RESULTS_FILE", str(tmp_path / "out.csv"))
+        monkeypatch.setattr(agent, "CHECKPOINT_FILE", str(tmp_path / "ckpt.jsonl"))
+        monkeypatch.setattr(agent, "METRICS_FILE", str(tmp_path / "metrics.json"))
+        monkeypatch.setattr(agent, "CHECKPOINT_EVERY", 1)
+        monkeypatch.setattr(agent, "RESUME", resume)
+        monkeypatch.setattr(agent, "MAX_WORKERS", workers)
+        monkeypatch.setattr(agent, "THROTTLE_COOLDOWN", 0)
+        monkeypatch.setattr(agent, "PRINT_PROGRESS", False)
+        monkeypatch.setattr(agent, "enrich_company", enrich)
+        agent.main()
+        return pd.read_excel(output_file)
+    return _run
+
+
+# ── main ───────────────────────────────────────────────────────
+class TestMain:
+    def test_results_land_on_their_own_row(self, run_agent):
+        def enrich(company, suffix_country=None, **plan):
+            time.sleep(random.uniform(0, 0.02))
+            return {"Inferred_Website": f"https://{company.lower()}.com"}
+
+        companies = [f"Co{n}" for n in range(30)]
+        out = run_agent(companies, enrich, workers=8)
+        assert list(out["Inferred_Website"]) == [
+            f"https://co{n}.com" for n in range(30)
+        ]
+
+    def test_no_website_leaves_row_empty(self, run_agent):
+        def enrich(company, suffix_country=None, **plan):
+            return {"Inferred_Website": "https://k.com"} if company == "Known" else {}
+
+        out = run_agent(["Known", "Unknown"], enrich)
+        assert out.loc[0, "Inferred_Website"] == "https://k.com"
+        assert pd.isna(out.loc[1, "Inferred_Website"])
+
+    def test_worker_error_does_not_abort_run(self, run_agent):
+        def enrich(company, suffix_country=None, **plan):
+            if company == "Bad":
+                raise RuntimeError("boom")
+            return {"Inferred_Email": "info@ok.com"}
+
+        out = run_agent(["Bad", "Good"], enrich)
+        assert pd.isna(out.loc[0, "Inferred_Email"])
+        assert out.loc[1, "Inferred_Email"] == "info@ok.com"
+
+    def test_text_and_numeric_input_columns_survive(self, run_agent, tmp_path):
+        pytest.importorskip("pyarrow")
+        from openpyxl import load_workbook
+        run_agent(["Acme"], lambda c, suffix_country=None, **plan: {},
+                  input_name="in.parquet", Zip=["01234"], Employees=[250])
+        rows = load_workbook(tmp_path / "out.xlsx").active.values
+        cells = dict(zip(next(rows), next(rows)))
+        assert cells["Zip"] == "01234"
+        assert cells["Employees"] == 250
+
+    def test_metrics_exported(self, run_agent, tmp_path):
+        import json
+        run_agent(["Acme", "Ghost"],
+                  lambda c, suffix_country=None, **plan:
+                      {"Inferred_Website": "https://acme.com"} if c == "Acme" else {})
+        snap = json.loads((tmp_path / "metrics.json").read_text())
+        assert snap["stages"]["row"]["count"] == 2
+        assert snap["stages"]["row"]["outcomes"] == {"ok": 1, "no_website": 1}
+        assert snap["counters"]["prepass.rows"] == 2
+        assert "http.requests" in snap["counters"]
+
+
+    @pytest.mark.parametrize("input_name", ["in.csv", "in.jsonl", "in.parquet"])
+    def test_non_excel_inputs(self, run_agent, input_name):
+        pytest.importorskip("pyarrow")
+
+        def enrich(company, suffix_country=None, **plan):
+            return {"Inferred_Website": f"https://{company.lower()}.com"}
+
+        out = run_agent(["Acme", "Beta"], enrich, input_name=input_name)
+        assert out["Inferred_Website"].tolist() == ["https://acme.com",
+                                                    "https://beta.com"]
+
+
+# ── checkpoint / resume ────────────────────────────────────────
+class TestResume:
+    def test_crash_then_resume_skips_finished_rows(self, run_agent, tmp_path):
+        def crashing(company, suffix_country=None, **plan):
+            if company == "C":
+                raise KeyboardInterrupt
+            return {"Inferred_Email": f"info@{company.lower()}.com"}
+
+        with pytest.raises(KeyboardInterrupt):
+            run_agent(["A", "B", "C"], crashing, workers=1)
+        assert (tmp_path / "ckpt.jsonl").exists()
+
+        seen = []
+
+        def enrich(company, suffix_country=None, **plan):
+            seen.append(company)
+            return {"Inferred_Email": f"info@{company.lower()}.com"}
+
+        out = run_agent(["A", "B", "C"], enrich, workers=1)
+        assert seen == ["C"]
+        assert list(out["Inferred_Email"]) == [
+            "info@a.com", "info@b.com", "info@c.com"
+        ]
+        assert not (tmp_path / "ckpt.jsonl").exists()
+
+    def test_changed_company_at_row_is_reenriched(self, run_agent, tmp_path):
+        Checkpoint(str(tmp_path / "ckpt.jsonl"), 1).record(
+            0, "Old Name", {"Inferred_Email": "stale@old.com"})
+        out = run_agent(["New Name"],
+                        lambda c, suffix_country=None, **plan: {"Inferred_Email": "info@new.com"})
+        assert out.loc[0, "Inferred_Email"] == "info@new.com"
+
+    def test_resume_disabled_starts_fresh(self, run_agent, tmp_path):
+        Checkpoint(str(tmp_path / "ckpt.jsonl"), 1).record(
+            0, "A", {"Inferred_Email": "stale@a.com"})
+        out = run_agent(["A"],
+                        lambda c, suffix_country=None, **plan: {"Inferred_Email": "info@a.com"},
+                        resume=False)
+        assert out.loc[0, "Inferred_Email"] == "info@a.com"
+
+    def test_throttled_rows_requeued_after_pool_drains(self, run_agent, tmp_path):
+        attempts = []
+
+        def enrich(company, suffix_country=None, **plan):
+            attempts.append(company)
+            if company == "Busy" and attempts.count("Busy") < 2:
+                raise SearchThrottled(company)
+            return {"Inferred_Email": f"info@{company.lower()}.com"}
+
+        out = run_agent(["Busy", "Calm"], enrich, workers=1)
+        assert attempts == ["Busy", "Calm", "Busy"]
+        assert list(out["Inferred_Email"]) == ["info@busy.com", "info@calm.com"]
+        assert not (tmp_path / "ckpt.jsonl").exists()
+
+    def test_rows_still_throttled_kept_for_next_run(self, run_agent, tmp_path):
+        def throttled(company, suffix_country=None, **plan):
+            if company == "Busy":
+                raise SearchThrottled(company)
+            return {"Inferred_Email": f"info@{company.lower()}.com"}
+
+        out = run_agent(["Busy", "Calm"], throttled)
+        assert pd.isna(out.loc[0, "Inferred_Email"])
+        assert (tmp_path / "ckpt.jsonl").exists()
+
+        seen = []
+
+        def enrich(company, suffix_country=None, **plan):
+            seen.append(company)
+            return {"Inferred_Email": f"info@{company.lower()}.com"}
+
+        out = run_agent(["Busy", "Calm"], enrich)
+        assert seen == ["Busy"]
+        assert list(out["Inferred_Email"]) == ["info@busy.com", "info@calm.com"]
+        assert not (tmp_path / "ckpt.jsonl").exists()
+
+    def test_suffix_country_prepass_reaches_workers(self, run_agent):
+        seen = {}
+
+        def enrich(company, suffix_country=None, **plan):
+            seen[company] = suffix_country
+            return {}
+
+        run_agent(["Bosch GmbH", "Acme Inc"], enrich)
+        assert seen == {"Bosch GmbH": "Germany", "Acme Inc": None}
+
+
+# ── offline pre-pass ───────────────────────────────────────────
+class TestPrepass:
+    def test_settled_rows_skip_the_network(self, run_agent):
+        seen = []
+
+        def enrich(company, suffix_country=None, **plan):
+            seen.append(company)
+            return {}
+
+        out = run_agent(["Bosch GmbH"], enrich,
+                        Website=["https://bosch.de"], Email=["info@bosch.de"])
+        assert seen == []
+        assert out.loc[0, "Inferred_Website"] == "https://bosch.de"
+        assert out.loc[0, "Inferred_Country"] == "Germany"
+        assert out.loc[0, "Country_Confidence"] == "high"
+        assert out.loc[0, "Inferred_Email"] == "info@bosch.de"
+
+    def test_missing_email_fetches_only_email_pages(self, run_agent):
+        from prepass import EMAIL_PAGES
+        seen = {}
+
+        def enrich(company, suffix_country=None, **plan):
+            seen[company] = plan
+            return {"Inferred_Email": "info@bosch.de"}
+
+        out = run_agent(["Bosch GmbH"], enrich, Website=["https://bosch.de"])
+        assert seen["Bosch GmbH"] == {"website": "https://bosch.de",
+                                      "paths": EMAIL_PAGES}
+        assert out.loc[0, "Inferred_Email"] == "info@bosch.de"
+        assert out.loc[0, "Inferred_Country"] == "Germany"
+
+    def test_known_answers_survive_worker_result(self, run_agent):
+        def enrich(company, suffix_country=None, **plan):
+            return {"Inferred_Website": "https://other.com",
+                    "Inferred_Email": None, "Inferred_Country": "France",
+                    "Country_Confidence": "medium"}
+
+        out = run_agent(["Acme"], enrich,
+                        Website=["https://acme.com"], Email=["sales@acme.com"])
+        assert out.loc[0, "Inferred_Website"] == "https://acme.com"
+        assert out.loc[0, "Inferred_Email"] == "sales@acme.com"
+        assert out.loc[0, "Inferred_Country"] == "France"
+
+    def test_prepass_disabled_runs_full_pipeline(self, run_agent, monkeypatch):
+        monkeypatch.setattr(agent, "PREPASS", False)
+        seen = {}
+
+        def enrich(company, suffix_country=None, **plan):
+            seen[company] = plan
+            return {}
+
+        run_agent(["Bosch GmbH"], enrich,
+                  Website=["https://bosch.de"], Email=["info@bosch.de"])
+        assert seen == {"Bosch GmbH": {}}
+
+
+# ── DNS pre-resolution ─────────────────────────────────────────
+class TestPreresolve:
+    def test_hosts_from_known_sites_and_guesses(self, monkeypatch):
+        monkeypatch.setattr(enrich, "DOMAIN_GUESS", True)
+        jobs = [
+            (0, "Bosch GmbH", {"suffix_country": "Germany",
+                               "website": "https://www.bosch.de"}),
+            (1, "Acme Inc", {"suffix_country": None, "website": None}),
+        ]
+        assert agent.hosts_to_resolve(jobs) == ["acme.com", "www.bosch.de"]
+
+    def test_no_guesses_when_guessing_is_off(self):
+        jobs = [(0, "Acme Inc", {"suffix_country": None})]
+        assert agent.hosts_to_resolve(jobs) == []
+
+    def test_main_preresolves_queued_hosts(self, run_agent, monkeypatch):
+        resolved = []
+
+        def preresolve(hosts):
+            resolved.extend(hosts)
+            return {"resolved": len(hosts), "nxdomain": 0, "failed": 0}
+
+        monkeypatch.setattr(agent, "PRERESOLVE", True)
+        monkeypatch.setattr(dns_cache, "preresolve", preresolve)
+        monkeypatch.setattr(dns_cache, "install", lambda: None)
+        run_agent(["Bosch GmbH"], lambda company, **plan: {},
+                  Website=["https://bosch.de"])
+        assert resolved == ["bosch.de"]
+
+
+# ── enrich_company ─────────────────────────────────────────────
+@pytest.fixture
+def fake_site(fake_send, monkeypatch):
+    """Serve a {url: html} table; everything else is a 404."""
+    monkeypatch.setattr(page_fetcher, "LAZY_PREFETCH", 1)
+    return fake_send
+
+
+class TestEnrichCompany:
+    def test_lazy_fetch_stops_when_good_enough(self, fake_site):
+        calls = fake_site({
+            "https://acme.de": "<html>Write to info@acme.de</html>",
+            "https://acme.de/contact": "<html>john@acme.de</html>",
+        })
+        result = agent.enrich_company("Acme GmbH", "Germany",
+                                      website="https://acme.de")
+        assert result["Inferred_Email"] == "info@acme.de"
+        assert result["Country_Confidence"] == "high"
+        assert len(calls) < len(page_fetcher.PAGES)
+
+    def test_lazy_fetch_continues_until_preferred_email(self, fake_site):
+        calls = fake_site({
+            "https://beta.de": "<html>john@beta.de</html>",
+            "https://beta.de/impressum": "<html>office@beta.de</html>",
+        })
+        result = agent.enrich_company("Beta GmbH", website="https://beta.de")
+        assert result["Inferred_Email"] == "office@beta.de"
+        assert len([url for url in calls if "beta.de" in url]) == len(page_fetcher.PAGES)
+
+    def test_eager_fetch_matches_lazy_result(self, fake_site, monkeypatch):
+        site = {
+            "https://acme.de": "<html>Write to info@acme.de</html>",
+            "https://acme.de/contact": "<html>contact@acme.de</html>",
+        }
+        fake_site(site)
+        lazy = agent.enrich_company("Acme GmbH", website="https://acme.de")
+        monkeypatch.setattr(agent, "LAZY_FETCH", False)
+        calls = fake_site(site)
+        eager = agent.enrich_company("Acme GmbH", website="https://acme.de")
+        assert lazy == eager
+        assert {f"https://acme.de{p}" for p in page_fetcher.PAGES} <= set(calls)
@@ -0,0 +1,94 @@
+"""Tests for synthetic_web.py and benchmark.py — offline throughput runs."""
+import time
+import pytest
+import benchmark
+import domain_guess
+import enrich
+import http_client
+from page_fetcher import fetch_pages
+from synthetic_web import SiteProfile, SyntheticWeb, company_name, route_all_hosts
+
+FAST = SiteProfile(latency_ms=0, jitter_ms=0, error_rate=0, redirect_rate=0,
+                   no_site_rate=0, page_kb=1)
+
+
+@pytest.fixture
+def web(monkeypatch):
+    with SyntheticWeb(FAST) as w, route_all_hosts():
+        monkeypatch.setattr(http_client, "_session", None)
+        monkeypatch.setattr(http_client, "_limiter",
+                            http_client.RequestLimiter(32, 32, 0))
+        monkeypatch.setattr(enrich, "SEARCH_URL", w.search_url)
+        yield w
+
+
+# ── SyntheticWeb ───────────────────────────────────────────────
+class TestSyntheticWeb:
+    def test_search_finds_company_site(self, web):
+        assert enrich.find_website(company_name(7)) == web.site_url(7)
+
+    def test_domain_guess_confirms_site(self, web, monkeypatch):
+        monkeypatch.setattr(domain_guess, "GUESS_URL", web.guess_url)
+        assert domain_guess.guess_website(company_name(7), "France") == web.site_url(7)
+        assert web.searches_served == 0
+
+    def test_site_pages_via_discovery(self, web):
+        pages = fetch_pages(web.site_url(0) + "/")
+        assert sorted(pages) == ["", "/impressum", "/kontakt"]
+        assert "info@company0.de" in pages["/kontakt"].mailto_addresses
+
+    def test_redirects_followed(self, monkeypatch):
+        profile = SiteProfile(latency_ms=0, jitter_ms=0, error_rate=0,
+                              redirect_rate=1.0, no_site_rate=0, page_kb=1)
+        with SyntheticWeb(profile) as w, route_all_hosts():
+            monkeypatch.setattr(http_client, "_session", None)
+            r = http_client.get(w.site_url(1) + "/")
+        assert r.status_code == 200
+        assert "Company1" in r.text
+
+    def test_errors_and_missing_sites(self, monkeypatch):
+        profile = SiteProfile(latency_ms=0, jitter_ms=0, error_rate=1.0,
+                              no_site_rate=0)
+        with SyntheticWeb(profile) as w, route_all_hosts():
+            monkeypatch.setattr(http_client, "_session", None)
+            assert http_client.get(w.site_url(1) + "/").status_code == 500
+            assert http_client.get(
+                f"http://unknown.test:{w.port}/").status_code == 404
+
+
+# ── run_benchmark ──────────────────────────────────────────────
+def test_benchmark_reports_throughput(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    # The production defaults a leaked request would fall back to
+    monkeypatch.setattr(http_client, "CACHE_ENABLED", True)
+    monkeypatch.setattr(http_client, "DEAD_HOSTS_ENABLED", True)
+    monkeypatch.setattr(benchmark, "HOST_DELAY", 0)
+    monkeypatch.setattr(benchmark, "SEARCH_RATE", 1000)
+    # Some latency, so prefetches are still in flight when rows finish
+    profile = SiteProfile(latency_ms=30, jitter_ms=0, error_rate=0,
+                          redirect_rate=0, no_site_rate=0, page_kb=1)
+    report = benchmark.run_benchmark(12, profile)
+    assert report["companies"] == 12
+    assert report["companies_per_second"] > 0
+    assert 1 <= report["requests_per_company"] <= 7
+    assert report["server_requests"] >= report["requests_per_company"] * 12
+    assert report["website_rate"] == 1.0
+    assert report["email_rate"] == 1.0
+    # Every synthetic site is at <name>.<suffix country tld>
+    assert report["searches_per_company"] == 0
+    assert report["peak_memory_mb"] > 0
+    # Nothing leaks into the next run
+    assert enrich.SEARCH_URL.startswith("https://duckduckgo.com")
+    assert domain_guess.GUESS_URL == "https://{domain}"
+    # ... and nothing lands on disk, even from late fetches
+    time.sleep(0.2)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_benchmark_without_guessing_searches_every_company(monkeypatch):
+    monkeypatch.setattr(benchmark, "HOST_DELAY", 0)
+    monkeypatch.setattr(benchmark, "SEARCH_RATE", 1000)
+    monkeypatch.setattr(benchmark, "DOMAIN_GUESS", False)
+    report = benchmark.run_benchmark(6, FAST)
+    assert report["searches_per_company"] == 1.0
+    assert report["website_rate"] == 1.0
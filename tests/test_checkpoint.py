@@ -0,0 +1,59 @@
+"""Tests for checkpoint.py — append-only progress log."""
+import pytest
+from checkpoint import Checkpoint
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "ckpt.jsonl")
+
+
+# ── Checkpoint ─────────────────────────────────────────────────
+class TestCheckpoint:
+    def test_missing_file_loads_empty(self, path):
+        assert Checkpoint(path).load() == {}
+
+    def test_record_and_load(self, path):
+        c = Checkpoint(path, flush_every=1)
+        c.record(3, "Acme", {"Inferred_Email": "info@acme.de"})
+        assert Checkpoint(path).load() == {
+            3: {"company": "Acme", "result": {"Inferred_Email": "info@acme.de"}}
+        }
+
+    def test_buffered_until_flush(self, path):
+        c = Checkpoint(path, flush_every=10)
+        c.record(0, "A", {})
+        assert Checkpoint(path).load() == {}
+        c.flush()
+        assert list(Checkpoint(path).load()) == [0]
+
+    def test_appends_not_rewrites(self, path):
+        c = Checkpoint(path, flush_every=1)
+        c.record(0, "A", {})
+        size = len(open(path, encoding="utf-8").read())
+        c.record(1, "B", {})
+        assert open(path, encoding="utf-8").read()[:size].count("\n") == 1
+
+    def test_torn_last_line_ignored(self, path):
+        c = Checkpoint(path, flush_every=1)
+        c.record(0, "A", {})
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"row": 1, "comp')
+        assert list(Checkpoint(path).load()) == [0]
+
+    def test_record_after_torn_line_survives(self, path):
+        Checkpoint(path, flush_every=1).record(0, "A", {})
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"row": 1, "comp')
+        c = Checkpoint(path, flush_every=1)
+        assert list(c.load()) == [0]
+        c.record(2, "C", {"x": 1})
+        done = Checkpoint(path).load()
+        assert sorted(done) == [0, 2]
+        assert done[2]["result"] == {"x": 1}
+
+    def test_reset_discards_progress(self, path):
+        c = Checkpoint(path, flush_every=1)
+        c.record(0, "A", {})
+        c.reset()
+        assert c.load() == {}
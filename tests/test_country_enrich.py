@@ -1,11 +1,15 @@
 """Tests for country_enrich.py — multi-signal country detection."""
 import pytest
 from bs4 import BeautifulSoup
+import pandas as pd
+import country_enrich
 from country_enrich import (
     infer_country_from_company_name,
+    infer_country_from_company_names,
     infer_country_from_html_lang,
     infer_country_from_phone_numbers,
     infer_country_from_address_text,
+    build_keyword_regex,
     resolve_country,
     detect_country,
     CONFIDENCE_HIGH,
@@ -58,6 +62,63 @@ class TestCompanyNameSuffix:
         assert infer_country_from_company_name("siemens gmbh") == "Germany"
 
 
+# ── Signal 1 (batch): company name column ──────────────────────
+BATCH_NAMES = [
+    "Tata Pvt. Ltd.", "Bosch GmbH", "Istanbul A.Ş.", "kayseri a.ş",
+    "Airbus S.A.S.", "Dubai FZ-LLC", "Philips B.V.", "Nokia Oy",
+    "Acme Ltd", "Big Corp Inc", "MegaCorp", "", None, float("nan"),
+    "Bosch GmbH", 12345, "siemens gmbh", "Ferrari S.p.A.",
+    # Non-ASCII word characters next to a suffix, and a non-breaking space
+    "ÄAB", "ßAG", "Müller GmbH", "Tata Pvt.\u00a0Ltd", "Çelik A.Ş.",
+]
+
+
+@pytest.fixture(params=["arrow", "python"])
+def batch_backend(request, monkeypatch):
+    if request.param == "arrow":
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(country_enrich, "pa", None)
+    return request.param
+
+
+class TestCompanyNameSuffixBatch:
+    def test_matches_per_name_function(self, batch_backend):
+        names = pd.Series(BATCH_NAMES, index=range(100, 100 + len(BATCH_NAMES)))
+        result = infer_country_from_company_names(names)
+        expected = [
+            infer_country_from_company_name(n if isinstance(n, str) else
+                                            (None if pd.isna(n) else str(n)))
+            for n in BATCH_NAMES
+        ]
+        assert list(result) == expected
+        assert list(result.index) == list(names.index)
+
+    def test_keeps_most_specific_first_order(self, batch_backend):
+        names = pd.Series(["Airbus S.A.S.", "Tata Pvt Ltd", "Gulf FZ-LLC"])
+        assert list(infer_country_from_company_names(names)) == [
+            "Turkey", "India", "United Arab Emirates"
+        ]
+
+    def test_alternation_filters_python_path(self, monkeypatch):
+        monkeypatch.setattr(country_enrich, "pa", None)
+        resolved = []
+        original = country_enrich.infer_country_from_company_name
+        monkeypatch.setattr(country_enrich, "infer_country_from_company_name",
+                            lambda name: resolved.append(name) or original(name))
+        names = pd.Series(["Bosch GmbH", "MegaCorp", "Acme Ltd", "Nokia Oy"])
+        assert list(infer_country_from_company_names(names)) == [
+            "Germany", None, None, "Finland"]
+        assert resolved == ["Bosch GmbH", "Nokia Oy"]
+
+    def test_missing_names_are_none(self, batch_backend):
+        result = infer_country_from_company_names(pd.Series([None, float("nan")]))
+        assert list(result) == [None, None]
+
+    def test_empty_series(self, batch_backend):
+        assert infer_country_from_company_names(pd.Series([], dtype=object)).empty
+
+
 # ── Signal 2: HTML lang attribute ──────────────────────────────
 class TestHtmlLang:
     def test_german_lang(self, make_soup):
@@ -158,6 +219,52 @@ class TestAddressText:
     def test_empty_soups(self):
         assert infer_country_from_address_text([]) is None
 
+    def test_keyword_inside_word_ignored(self, make_soup):
+        soup = make_soup(
+            '<html><body><footer>Indianapolis, Indiana</footer></body></html>'
+        )
+        assert infer_country_from_address_text([soup]) is None
+
+    def test_multiword_keyword_across_whitespace(self, make_soup):
+        soup = make_soup(
+            '<html><body><footer>Seoul, South\n  Korea</footer></body></html>'
+        )
+        assert infer_country_from_address_text([soup]) == "South Korea"
+
+    def test_distinct_keywords_each_vote(self, make_soup):
+        soup = make_soup(
+            '<html><body>'
+            '<footer>Dubai, Abu Dhabi, France</footer>'
+            '</body></html>'
+        )
+        assert infer_country_from_address_text([soup]) == "United Arab Emirates"
+
+    def test_repeated_keyword_votes_once_per_text(self, make_soup):
+        soup = make_soup(
+            '<html><body>'
+            '<footer>Spain Spain Spain</footer>'
+            '<address>Italy</address><div class="contact">Italy</div>'
+            '</body></html>'
+        )
+        assert infer_country_from_address_text([soup]) == "Italy"
+
+
+# ── Keyword matcher ────────────────────────────────────────────
+class TestKeywordRegex:
+    def test_prefers_longest_keyword(self):
+        regex = build_keyword_regex(["ital", "italia"])
+        assert [m.group() for m in regex.finditer("italia ital italian")] == [
+            "italia", "ital"
+        ]
+
+    def test_large_table(self):
+        keywords = [f"city{n:04d}" for n in range(2000)] + ["germany"]
+        regex = build_keyword_regex(keywords)
+        text = "offices in city0042, city1999 and germany; city20000 is not"
+        assert [m.group() for m in regex.finditer(text)] == [
+            "city0042", "city1999", "germany"
+        ]
+
 
 # ── Resolver ───────────────────────────────────────────────────
 class TestResolveCountry:
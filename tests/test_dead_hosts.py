@@ -0,0 +1,51 @@
+"""Tests for dead_hosts.py — persisted unreachable hosts."""
+import pytest
+import dead_hosts
+from dead_hosts import DeadHostCache
+
+
+@pytest.fixture
+def table(tmp_path):
+    t = DeadHostCache(str(tmp_path / "dead.sqlite"))
+    yield t
+    t.close()
+
+
+# ── DeadHostCache ──────────────────────────────────────────────
+class TestDeadHostCache:
+    def test_unknown_host_is_alive(self, table):
+        assert not table.is_dead("acme.de")
+
+    def test_marked_host_is_dead(self, table):
+        table.mark_dead("acme.de", "ConnectTimeout")
+        assert table.is_dead("acme.de")
+        assert len(table) == 1
+
+    def test_entry_expires(self, table, monkeypatch):
+        table.mark_dead("acme.de", "ConnectTimeout")
+        now = dead_hosts.time.time()
+        monkeypatch.setattr(dead_hosts.time, "time",
+                            lambda: now + dead_hosts.DEAD_HOST_TTL + 1)
+        assert not table.is_dead("acme.de")
+        assert len(table) == 0
+
+    def test_dns_failures_stay_dead_longer(self, table, monkeypatch):
+        table.mark_dead("gone.de", "ConnectionError", dns=True)
+        now = dead_hosts.time.time()
+        monkeypatch.setattr(dead_hosts.time, "time",
+                            lambda: now + dead_hosts.DEAD_HOST_TTL + 1)
+        assert table.is_dead("gone.de")
+
+    def test_revive(self, table):
+        table.mark_dead("acme.de", "ConnectTimeout")
+        table.revive("acme.de")
+        assert not table.is_dead("acme.de")
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "p.sqlite")
+        t1 = DeadHostCache(path)
+        t1.mark_dead("acme.de", "ConnectTimeout")
+        t1.close()
+        t2 = DeadHostCache(path)
+        assert t2.is_dead("acme.de")
+        t2.close()
@@ -0,0 +1,189 @@
+"""Tests for dns_cache.py — pre-resolution against a local stub resolver."""
+import socket
+import socketserver
+import struct
+import threading
+import pytest
+import urllib3.util.connection
+import dns_cache
+import http_client
+from dns_cache import Answer, DNSCache, DNSError, build_query, parse_response
+
+
+class StubResolver(socketserver.ThreadingUDPServer):
+    """
+    Answers A queries from a {host: [ips]} zone (TTL `ttl`), NXDOMAIN
+    for anything else, and ignores hosts listed in `silent`.
+    """
+    daemon_threads = True
+
+    def __init__(self, zone: dict, ttl: int = 300, silent=()):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.zone = zone
+        self.ttl = ttl
+        self.silent = set(silent)
+        self.queries = []
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.server_address
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class _StubHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        data, sock = self.request
+        qid = struct.unpack("!H", data[:2])[0]
+        end = data.index(b"\x00", 12) + 5
+        question = data[12:end]
+        labels, i = [], 0
+        while question[i]:
+            labels.append(question[i + 1:i + 1 + question[i]].decode())
+            i += 1 + question[i]
+        host = ".".join(labels)
+        self.server.queries.append(host)
+        if host in self.server.silent:
+            return
+
+        ips = self.server.zone.get(host)
+        rcode = 0 if ips is not None else 3
+        answers = b"".join(
+            struct.pack("!HHHIH", 0xC00C, 1, 1, self.server.ttl, 4)
+            + socket.inet_aton(ip)
+            for ip in ips or []
+        )
+        header = struct.pack("!HHHHHH", qid, 0x8180 | rcode, 1,
+                             len(ips or []), 0, 0)
+        sock.sendto(header + question + answers, self.client_address)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# ── wire format ────────────────────────────────────────────────
+class TestWireFormat:
+    def test_query_layout(self):
+        q = build_query(0x1234, "acme.de")
+        assert q[:2] == b"\x12\x34"
+        assert q[12:] == b"\x04acme\x02de\x00\x00\x01\x00\x01"
+
+    def test_mismatched_id(self):
+        with pytest.raises(DNSError):
+            parse_response(build_query(1, "acme.de"), 2, "acme.de")
+
+    def test_short_response(self):
+        with pytest.raises(DNSError):
+            parse_response(b"\x00\x01", 1, "acme.de")
+
+    @pytest.mark.parametrize("host", ["example..com", "a" * 64 + ".de", "."])
+    def test_invalid_host_name(self, host):
+        with pytest.raises(DNSError):
+            build_query(1, host)
+
+
+# ── resolution against the stub ────────────────────────────────
+class TestPreresolve:
+    def test_resolves_and_marks_nxdomain(self):
+        zone = {"acme.de": ["192.0.2.1", "192.0.2.2"]}
+        with StubResolver(zone) as stub:
+            stats = dns_cache.preresolve(["acme.de", "ghost.de"], stub.address)
+        assert stats == {"resolved": 1, "nxdomain": 1, "failed": 0}
+        assert dns_cache.cached_addresses("acme.de") == ["192.0.2.1", "192.0.2.2"]
+        assert dns_cache.is_nxdomain("ghost.de")
+        assert not dns_cache.is_nxdomain("acme.de")
+
+    def test_timeouts_are_not_cached(self, monkeypatch):
+        monkeypatch.setattr(dns_cache, "DNS_TIMEOUT", 0.05)
+        with StubResolver({}, silent={"slow.de"}) as stub:
+            stats = dns_cache.preresolve(["slow.de"], stub.address)
+            assert stub.queries == ["slow.de"] * (dns_cache.DNS_RETRIES + 1)
+        assert stats["failed"] == 1
+        assert dns_cache._cache.get("slow.de") is None
+
+    def test_cached_hosts_not_queried_again(self):
+        with StubResolver({"acme.de": ["192.0.2.1"]}) as stub:
+            dns_cache.preresolve(["acme.de"], stub.address)
+            dns_cache.preresolve(["ACME.de", "acme.de"], stub.address)
+            assert stub.queries == ["acme.de"]
+
+    def test_many_hosts_concurrently(self):
+        zone = {f"h{n}.de": [f"192.0.2.{n}"] for n in range(1, 101)}
+        with StubResolver(zone) as stub:
+            stats = dns_cache.preresolve(list(zone), stub.address, concurrency=16)
+        assert stats["resolved"] == 100
+
+    def test_invalid_hosts_counted_as_failed(self):
+        with StubResolver({"acme.de": ["192.0.2.1"]}) as stub:
+            stats = dns_cache.preresolve(
+                ["acme.de", "example..com", "x" * 70 + ".com"], stub.address)
+            assert stub.queries == ["acme.de"]
+        assert stats == {"resolved": 1, "nxdomain": 0, "failed": 2}
+
+    def test_no_nameserver(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(dns_cache, "RESOLV_CONF", str(tmp_path / "missing"))
+        assert dns_cache.preresolve(["acme.de"])["failed"] == 1
+
+
+# ── cache expiry ───────────────────────────────────────────────
+class TestDNSCache:
+    def test_ttl_clamped_and_expires(self):
+        clock = FakeClock()
+        cache = DNSCache(clock)
+        cache.put(Answer("acme.de", ["192.0.2.1"], ttl=1))
+        clock.now = dns_cache.MIN_TTL - 1
+        assert cache.get("acme.de") is not None
+        clock.now = dns_cache.MIN_TTL + 1
+        assert cache.get("acme.de") is None
+
+    def test_nxdomain_expires(self):
+        clock = FakeClock()
+        cache = DNSCache(clock)
+        cache.put(Answer("ghost.de", [], ttl=dns_cache.NEGATIVE_TTL, nxdomain=True))
+        clock.now = dns_cache.NEGATIVE_TTL + 1
+        assert cache.get("ghost.de") is None
+
+
+# ── fetch integration ──────────────────────────────────────────
+class TestFetchIntegration:
+    def test_nxdomain_host_skipped_without_request(self, monkeypatch):
+        sent = []
+        monkeypatch.setattr(http_client, "_send",
+                            lambda url, headers=None, timeout=None: sent.append(url))
+        with StubResolver({}) as stub:
+            dns_cache.preresolve(["ghost.de"], stub.address)
+        http_client.reset_connection_stats()
+        with pytest.raises(http_client.HostUnavailable):
+            http_client.get("https://ghost.de/contact")
+        assert sent == []
+        assert http_client.connection_stats()["dns_skips"] == 1
+
+    def test_hook_dials_cached_address(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        port = server.getsockname()[1]
+        with StubResolver({"local.test": ["127.0.0.1"]}) as stub:
+            dns_cache.preresolve(["local.test"], stub.address)
+        with dns_cache.installed():
+            conn = urllib3.util.connection.create_connection(("local.test", port))
+        assert conn.getpeername() == ("127.0.0.1", port)
+        conn.close()
+        server.close()
+
+    def test_hook_refuses_nxdomain(self):
+        with StubResolver({}) as stub:
+            dns_cache.preresolve(["ghost.test"], stub.address)
+        with dns_cache.installed(), pytest.raises(socket.gaierror):
+            urllib3.util.connection.create_connection(("ghost.test", 80))
@@ -0,0 +1,146 @@
+"""Tests for domain_guess.py — website guessing before search."""
+import time
+import pytest
+import domain_guess
+import enrich
+import http_client
+import metrics
+from domain_guess import brand_matches, brand_tokens, candidate_domains, guess_website
+from page_document import parse_document
+
+
+def home(title: str, site_name: str = "") -> str:
+    meta = f'<meta property="og:site_name" content="{site_name}">' if site_name else ""
+    return f"<html><head><title>{title}</title>{meta}</head><body>Hi</body></html>"
+
+
+@pytest.fixture
+def sites(fake_send):
+    """Serve a {url: html} table; other hosts fail to connect."""
+    def _install(pages: dict, delay: float = 0.0):
+        metrics.reset()
+        return fake_send(pages, delay=delay,
+                         missing=http_client.requests.ConnectionError("down"))
+    return _install
+
+
+# ── name normalisation ─────────────────────────────────────────
+class TestCandidates:
+    @pytest.mark.parametrize("name, tokens", [
+        ("Acme GmbH", ["acme"]),
+        ("Müller Kabel GmbH & Co. KG", ["muller", "kabel"]),
+        ("Anadolu Elektrik A.Ş.", ["anadolu", "elektrik"]),
+        ("Rossi S.r.l.", ["rossi"]),
+        ("The Widget Company Ltd", ["widget"]),
+        ("Smith & Sons", ["smith", "sons"]),
+    ])
+    def test_brand_tokens(self, name, tokens):
+        assert brand_tokens(name) == tokens
+
+    def test_country_tld_first(self):
+        assert candidate_domains("Müller Kabel GmbH", "Germany") == [
+            "mullerkabel.de", "muller-kabel.de",
+            "mullerkabel.com", "muller-kabel.com",
+        ]
+
+    def test_second_level_zone(self):
+        assert candidate_domains("Anadolu A.Ş.", "Turkey") == [
+            "anadolu.com.tr", "anadolu.com"]
+
+    def test_no_country(self):
+        assert candidate_domains("Acme Inc") == ["acme.com"]
+
+    def test_too_short(self):
+        assert candidate_domains("AB Ltd") == []
+
+    def test_capped(self, monkeypatch):
+        monkeypatch.setattr(domain_guess, "MAX_GUESSES", 1)
+        assert candidate_domains("Big Corp Name", "Germany") == ["bigcorpname.de"]
+
+
+# ── brand match ────────────────────────────────────────────────
+class TestBrandMatch:
+    @pytest.mark.parametrize("html", [
+        home("Acme Tools | Home"),
+        home("Willkommen bei ACMETOOLS"),
+        home("Startseite", site_name="Acme Tools"),
+        home("Tools by Acme"),
+    ])
+    def test_matches(self, html):
+        assert brand_matches(parse_document(html), ["acme", "tools"])
+
+    @pytest.mark.parametrize("html", [
+        home("Welcome"),
+        home("Acme Corp"),
+        home("acmetools.de - This domain is for sale"),
+    ])
+    def test_rejects(self, html):
+        assert not brand_matches(parse_document(html), ["acme", "tools"])
+
+
+# ── guess_website ──────────────────────────────────────────────
+class TestGuessWebsite:
+    def test_prefers_country_tld(self, sites):
+        sites({
+            "https://acme.de": home("Acme GmbH"),
+            "https://acme.com": home("Acme Inc"),
+        })
+        assert guess_website("Acme GmbH", "Germany") == "https://acme.de"
+
+    def test_falls_back_to_generic_tld(self, sites):
+        sites({"https://acme.com": home("ACME - Home")})
+        assert guess_website("Acme GmbH", "Germany") == "https://acme.com"
+
+    def test_unrelated_site_rejected(self, sites):
+        sites({"https://acme.de": home("Something else entirely")})
+        assert guess_website("Acme GmbH", "Germany") is None
+        assert metrics.snapshot()["stages"]["guess"]["outcomes"] == {"miss": 1}
+
+    def test_every_candidate_checked_on_miss(self, sites):
+        calls = sites({})
+        guess_website("Müller Kabel GmbH", "Germany")
+        assert len(calls) == 4
+
+    def test_no_check_outlives_the_call(self, fake_send, monkeypatch):
+        monkeypatch.setattr(domain_guess, "MAX_GUESSES", 2)
+        finished = []
+
+        def _slow(url):
+            time.sleep(0.1 if url.endswith(".com") else 0)
+            finished.append(url)
+            return home("Acme GmbH") if url.endswith(".de") else ""
+
+        fake_send(_slow)
+        assert guess_website("Acme GmbH", "Germany") == "https://acme.de"
+        assert sorted(finished) == ["https://acme.com", "https://acme.de"]
+
+
+# ── find_website integration ───────────────────────────────────
+class TestFindWebsite:
+    @pytest.fixture
+    def searches(self, monkeypatch):
+        calls = []
+
+        def _search(name):
+            calls.append(name)
+            return (True, "https://found.example")
+
+        monkeypatch.setattr(enrich, "DOMAIN_GUESS", True)
+        monkeypatch.setattr(enrich, "search_website", _search)
+        return calls
+
+    def test_confirmed_guess_skips_search(self, sites, searches):
+        sites({"https://acme.de": home("Acme GmbH")})
+        assert enrich.find_website("Acme GmbH", "Germany") == "https://acme.de"
+        assert searches == []
+
+    def test_miss_falls_back_to_search(self, sites, searches):
+        sites({})
+        assert enrich.find_website("Zeta GmbH", "Germany") == "https://found.example"
+        assert searches == ["Zeta GmbH"]
+
+    def test_disabled(self, sites, searches, monkeypatch):
+        calls = sites({"https://acme.de": home("Acme GmbH")})
+        monkeypatch.setattr(enrich, "DOMAIN_GUESS", False)
+        assert enrich.find_website("Acme GmbH", "Germany") == "https://found.example"
+        assert calls == []
@@ -1,7 +1,11 @@
 """Tests for email_enrich.py — email extraction and selection."""
 import pytest
 from bs4 import BeautifulSoup
-from email_enrich import select_best_email, extract_email_from_soups
+from email_enrich import (
+    extract_email_from_soups,
+    is_preferred_email,
+    select_best_email,
+)
 
 
 # ── select_best_email ──────────────────────────────────────────
@@ -49,11 +53,32 @@ class TestSelectBestEmail:
         emails = {"noreply@co.com", "test@co.com", "example@co.com"}
         assert select_best_email(emails) is None
 
+    def test_prefix_priority_is_deterministic(self):
+        emails = {"hello@co.com", "office@co.com", "sales@co.com",
+                  "contact@co.com", "info@co.com"}
+        for _ in range(20):
+            assert select_best_email(set(emails)) == "info@co.com"
+        assert select_best_email({"sales@co.com", "contact@co.com"}) == "contact@co.com"
+
+    def test_prefix_match_is_case_insensitive(self):
+        assert select_best_email({"adam@co.com", "INFO@co.com"}) == "INFO@co.com"
+
     def test_no_preferred_returns_alphabetical_first(self):
         emails = {"zara@co.com", "adam@co.com"}
         assert select_best_email(emails) == "adam@co.com"
 
 
+class TestIsPreferredEmail:
+    def test_role_address(self):
+        assert is_preferred_email("Info@co.com")
+
+    def test_personal_address(self):
+        assert not is_preferred_email("john@co.com")
+
+    def test_none(self):
+        assert not is_preferred_email(None)
+
+
 # ── extract_email_from_soups ───────────────────────────────────
 class TestExtractEmailFromSoups:
     def test_extracts_from_text(self, make_soup):
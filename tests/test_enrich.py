@@ -1,6 +1,11 @@
 """Tests for enrich.py — website discovery helpers."""
 import pytest
-from enrich import is_blocked_domain, clean_url
+import enrich
+import metrics
+from enrich import SearchThrottled, is_blocked_domain, clean_url, find_website
+from search_cache import SearchCache
+from search_limiter import AdaptiveRateLimiter
+from tests.conftest import FakeResponse
 
 
 # ── is_blocked_domain ──────────────────────────────────────────
@@ -42,3 +47,105 @@ class TestCleanUrl:
 
     def test_preserves_subdomain(self):
         assert clean_url("https://shop.example.com/products") == "https://shop.example.com"
+
+
+# ── find_website (search cache) ────────────────────────────────
+class TestFindWebsiteCache:
+    @pytest.fixture
+    def search(self, monkeypatch, tmp_path):
+        """Stub search_website and enable an isolated search cache."""
+        monkeypatch.setattr(enrich, "SEARCH_CACHE_ENABLED", True)
+        monkeypatch.setattr(enrich, "_search_cache",
+                            SearchCache(str(tmp_path / "search.sqlite")))
+        calls = []
+
+        def _install(answer):
+            def _search(name):
+                calls.append(name)
+                return answer
+            monkeypatch.setattr(enrich, "search_website", _search)
+            return calls
+        return _install
+
+    def test_repeat_lookup_skips_search(self, search):
+        calls = search((True, "https://acme.de"))
+        assert find_website("Acme GmbH") == "https://acme.de"
+        assert find_website("ACME GmbH") == "https://acme.de"
+        assert calls == ["Acme GmbH"]
+
+    def test_no_result_is_cached(self, search):
+        calls = search((True, None))
+        assert find_website("Ghost") is None
+        assert find_website("Ghost") is None
+        assert len(calls) == 1
+
+    def test_failed_search_is_not_cached(self, search):
+        calls = search((False, None))
+        assert find_website("Flaky") is None
+        assert find_website("Flaky") is None
+        assert len(calls) == 2
+
+
+# ── search_website (throttling) ────────────────────────────────
+RESULTS = ('<div class="results"><a class="result__a" '
+           'href="//duckduckgo.com/l/?uddg=https%3A%2F%2Facme.de%2F">Acme</a></div>')
+NO_RESULTS = '<div class="no-results">No results.</div>'
+BLANK = "<html><body></body></html>"
+
+
+@pytest.fixture
+def ddg(fake_send, monkeypatch):
+    """Serve a scripted sequence of search responses."""
+    def _install(*responses):
+        queue = list(responses)
+        monkeypatch.setattr(enrich, "backoff_delay", lambda attempt: 0)
+        metrics.reset()
+        return fake_send(lambda url: queue.pop(0) if len(queue) > 1 else queue[0])
+    return _install
+
+
+class TestSearchThrottling:
+    def test_answered(self, ddg):
+        ddg(FakeResponse(200, RESULTS))
+        assert enrich.search_website("Acme") == (True, "https://acme.de")
+
+    def test_genuine_no_results(self, ddg):
+        calls = ddg(FakeResponse(200, NO_RESULTS))
+        assert enrich.search_website("Ghost") == (True, None)
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize("throttled", [
+        FakeResponse(202, ""), FakeResponse(429, ""), FakeResponse(200, BLANK),
+    ])
+    def test_throttle_retried_until_answered(self, ddg, throttled):
+        calls = ddg(throttled, throttled, FakeResponse(200, RESULTS))
+        assert enrich.search_website("Acme") == (True, "https://acme.de")
+        assert len(calls) == 3
+        assert metrics.snapshot()["counters"]["search.throttled"] == 2
+
+    def test_gives_up_with_exception(self, ddg):
+        calls = ddg(FakeResponse(429, ""))
+        with pytest.raises(SearchThrottled):
+            enrich.search_website("Acme")
+        assert len(calls) == enrich.SEARCH_RETRIES + 1
+        assert metrics.snapshot()["stages"]["search"]["outcomes"] == {"throttled": 1}
+
+    def test_throttling_slows_the_limiter(self, ddg, monkeypatch):
+        limiter = AdaptiveRateLimiter(rate=2.0, max_rate=4.0, burst=100)
+        monkeypatch.setattr(enrich, "_search_limiter", limiter)
+        ddg(FakeResponse(429, ""), FakeResponse(200, RESULTS))
+        enrich.search_website("Acme")
+        assert limiter.rate == pytest.approx(1.0 + limiter.step)
+
+    def test_throttled_row_not_cached(self, ddg, monkeypatch, tmp_path):
+        monkeypatch.setattr(enrich, "SEARCH_CACHE_ENABLED", True)
+        monkeypatch.setattr(enrich, "_search_cache",
+                            SearchCache(str(tmp_path / "s.sqlite")))
+        ddg(FakeResponse(429, ""))
+        with pytest.raises(SearchThrottled):
+            find_website("Acme")
+        assert enrich._search_cache.lookup("Acme") == (False, None)
+
+    def test_other_errors_unanswered(self, ddg):
+        ddg(FakeResponse(500, ""))
+        assert enrich.search_website("Acme") == (False, None)
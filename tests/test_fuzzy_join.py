@@ -0,0 +1,89 @@
+"""Tests for fuzzy_join.py — blocked fuzzy company-name matching."""
+import random
+import string
+import pandas as pd
+import pytest
+import fuzzy_join
+from fuzzy_join import best_matches, canonical_name, dice, trigrams
+
+
+# ── canonical names ────────────────────────────────────────────
+class TestCanonicalName:
+    @pytest.mark.parametrize("a, b", [
+        ("Acme Holdings Ltd", "ACME Holding Limited"),
+        ("Müller & Söhne GmbH", "Muller and Sohne"),
+        ("A.C.M.E. Technologies Inc.", "acme tech"),
+        ("The Widget Company", "Widget Co."),
+    ])
+    def test_variants_agree(self, a, b):
+        assert canonical_name(a) == canonical_name(b)
+
+    def test_non_string(self):
+        assert canonical_name(None) == ""
+        assert canonical_name(float("nan")) == ""
+
+
+class TestDice:
+    def test_identical(self):
+        assert dice(trigrams("acme"), trigrams("acme")) == 1.0
+
+    def test_disjoint(self):
+        assert dice(trigrams("acme"), trigrams("zyx")) == 0.0
+
+    def test_empty(self):
+        assert dice(set(), trigrams("acme")) == 0.0
+
+
+# ── best_matches ───────────────────────────────────────────────
+class TestBestMatches:
+    def test_exact_after_canonicalization(self):
+        out = best_matches(pd.Series(["Acme Holdings Ltd"]),
+                           pd.Series(["Beta GmbH", "ACME Holding Limited"]))
+        assert out.loc[0, "Match"] == "ACME Holding Limited"
+        assert out.loc[0, "Match_Score"] == 1.0
+
+    def test_typo_matches_with_score(self):
+        out = best_matches(pd.Series(["Anadolu Elektrik"]),
+                           pd.Series(["Anadolu Elektrik Sanayi", "Anatolia Foods"]))
+        assert out.loc[0, "Match"] == "Anadolu Elektrik Sanayi"
+        assert 0.7 <= out.loc[0, "Match_Score"] < 1.0
+
+    def test_below_threshold_unmatched(self):
+        out = best_matches(pd.Series(["Acme Tools"]), pd.Series(["Acme Foods"]))
+        assert out.loc[0, "Match"] is None
+        assert pd.isna(out.loc[0, "Match_Score"])
+
+    def test_threshold_is_configurable(self):
+        out = best_matches(pd.Series(["Acme Tools"]), pd.Series(["Acme Foods"]),
+                           threshold=0.3)
+        assert out.loc[0, "Match"] == "Acme Foods"
+
+    def test_aligned_with_left_including_missing(self):
+        left = pd.Series(["Beta", None, "Beta"], index=[5, 6, 7])
+        out = best_matches(left, pd.Series(["Beta B.V."]))
+        assert out.index.tolist() == [5, 6, 7]
+        assert out["Match"].tolist() == ["Beta B.V.", None, "Beta B.V."]
+
+    def test_empty_right(self):
+        out = best_matches(pd.Series(["Acme"]), pd.Series([], dtype=object))
+        assert out.loc[0, "Match"] is None
+
+    def test_blocking_agrees_with_brute_force(self, monkeypatch):
+        """Prefix blocking must not lose any pair that clears the threshold."""
+        monkeypatch.setattr(fuzzy_join, "MAX_CANDIDATES", 10_000)
+        rng = random.Random(1)
+        words = ["".join(rng.choice("abcdefgh") for _ in range(rng.randint(3, 7)))
+                 for _ in range(40)]
+        right = [" ".join(rng.sample(words, rng.randint(1, 2))) for _ in range(150)]
+        left = [name[:-1] + rng.choice(string.ascii_lowercase)
+                for name in rng.sample(right, 60)]
+        out = best_matches(pd.Series(left), pd.Series(right), threshold=0.6)
+
+        for name, score in zip(left, out["Match_Score"]):
+            grams = trigrams(canonical_name(name))
+            best = max(dice(grams, trigrams(canonical_name(r))) for r in right)
+            expected = round(best, 3) if best >= 0.6 else None
+            if expected is None:
+                assert pd.isna(score)
+            else:
+                assert score == pytest.approx(expected)
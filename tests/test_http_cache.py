@@ -0,0 +1,97 @@
+"""Tests for http_cache.py — persistent response cache."""
+import os
+import pytest
+import http_cache
+import http_client
+from http_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ResponseCache(str(tmp_path / "cache.sqlite"))
+    yield c
+    c.close()
+
+
+# ── ResponseCache ──────────────────────────────────────────────
+class TestResponseCache:
+    def test_round_trip(self, cache):
+        cache.put("https://a.com", 200, "<html>hi</html>")
+        hit = cache.get("https://a.com")
+        assert hit.status_code == 200
+        assert hit.text == "<html>hi</html>"
+        assert hit.from_cache is True
+
+    def test_miss_returns_none(self, cache):
+        assert cache.get("https://nope.com") is None
+
+    def test_negative_entry(self, cache):
+        cache.put("https://a.com/contact", 404, "Not found page")
+        hit = cache.get("https://a.com/contact")
+        assert hit.status_code == 404
+        assert hit.text == ""
+
+    @pytest.mark.parametrize("status", [202, 429, 500, 503])
+    def test_transient_statuses_not_cached(self, cache, status):
+        cache.put("https://a.com", status, "")
+        assert cache.get("https://a.com") is None
+
+    def test_expired_entry_dropped(self, cache, monkeypatch):
+        cache.put("https://a.com", 200, "x")
+        now = http_cache.time.time()
+        monkeypatch.setattr(http_cache.time, "time", lambda: now + cache.ttl + 1)
+        assert cache.get("https://a.com") is None
+        assert len(cache) == 0
+
+    def test_negative_entries_expire_sooner(self, cache, monkeypatch):
+        cache.put("https://a.com", 200, "x")
+        cache.put("https://a.com/about", 404, "")
+        now = http_cache.time.time()
+        monkeypatch.setattr(http_cache.time, "time",
+                            lambda: now + cache.negative_ttl + 1)
+        assert cache.get("https://a.com") is not None
+        assert cache.get("https://a.com/about") is None
+
+    def test_lru_eviction_over_size_cap(self, tmp_path, monkeypatch):
+        clock = iter(range(1000))
+        monkeypatch.setattr(http_cache.time, "time", lambda: next(clock))
+        c = ResponseCache(str(tmp_path / "lru.sqlite"), max_bytes=2400)
+        body = os.urandom(800).hex()   # ~900 bytes after compression
+        c.put("https://a.com", 200, body)
+        c.put("https://b.com", 200, body)
+        c.get("https://a.com")          # a is now more recent than b
+        c.put("https://c.com", 200, body)
+        assert c.get("https://b.com") is None
+        assert c.get("https://a.com") is not None
+        assert c.get("https://c.com") is not None
+        c.close()
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "p.sqlite")
+        c1 = ResponseCache(path)
+        c1.put("https://a.com", 200, "kept")
+        c1.close()
+        c2 = ResponseCache(path)
+        assert c2.get("https://a.com").text == "kept"
+        c2.close()
+
+
+# ── http_client integration ────────────────────────────────────
+class TestHttpClientCache:
+    def test_second_get_served_from_cache(self, monkeypatch, tmp_path,
+                                          fake_send):
+        calls = fake_send({"https://a.com": "page"})
+        monkeypatch.setattr(http_client, "CACHE_ENABLED", True)
+        monkeypatch.setattr(http_client, "CACHE_PATH", str(tmp_path / "c.sqlite"))
+        http_client.get("https://a.com")
+        r = http_client.get("https://a.com")
+        assert calls == ["https://a.com"]
+        assert r.text == "page"
+
+    def test_use_cache_false_bypasses(self, monkeypatch, tmp_path, fake_send):
+        calls = fake_send({"https://a.com": "p"})
+        monkeypatch.setattr(http_client, "CACHE_ENABLED", True)
+        monkeypatch.setattr(http_client, "CACHE_PATH", str(tmp_path / "c.sqlite"))
+        http_client.get("https://a.com", use_cache=False)
+        http_client.get("https://a.com", use_cache=False)
+        assert len(calls) == 2
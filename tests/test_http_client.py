@@ -0,0 +1,390 @@
+"""Tests for http_client.py — pooled session and shared request limits."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from urllib3.exceptions import (MaxRetryError, NameResolutionError,
+                               NewConnectionError, ReadTimeoutError)
+import http_client
+from dead_hosts import DNS_DEAD_HOST_TTL
+from http_client import CircuitBreaker, HostUnavailable, RequestLimiter
+from tests.conftest import FakeResponse
+
+
+@pytest.fixture
+def slow_get(monkeypatch):
+    """Fake requests.get that records peak concurrency per host."""
+    state = {"active": {}, "peak": {}, "total": 0, "peak_total": 0}
+    lock = threading.Lock()
+
+    def _get(url, headers=None, timeout=None):
+        host = url.split("/")[2]
+        with lock:
+            state["active"][host] = state["active"].get(host, 0) + 1
+            state["total"] += 1
+            state["peak"][host] = max(state["peak"].get(host, 0),
+                                      state["active"][host])
+            state["peak_total"] = max(state["peak_total"], state["total"])
+        time.sleep(0.05)
+        with lock:
+            state["active"][host] -= 1
+            state["total"] -= 1
+        return FakeResponse()
+
+    monkeypatch.setattr(http_client, "_send", _get)
+    return state
+
+
+def _run_parallel(urls):
+    threads = [threading.Thread(target=http_client.get, args=(u,)) for u in urls]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+# ── RequestLimiter ─────────────────────────────────────────────
+class TestRequestLimiter:
+    def test_per_host_cap(self, monkeypatch, slow_get):
+        monkeypatch.setattr(http_client, "_limiter", RequestLimiter(10, 2, 0))
+        _run_parallel([f"https://a.com/{n}" for n in range(6)])
+        assert slow_get["peak"]["a.com"] == 2
+
+    def test_global_cap(self, monkeypatch, slow_get):
+        monkeypatch.setattr(http_client, "_limiter", RequestLimiter(3, 5, 0))
+        _run_parallel([f"https://h{n}.com/" for n in range(9)])
+        assert slow_get["peak_total"] == 3
+
+    def test_host_delay_spaces_request_starts(self, monkeypatch):
+        starts = []
+        monkeypatch.setattr(
+            http_client, "_send",
+            lambda url, headers=None, timeout=None: starts.append(time.monotonic()),
+        )
+        monkeypatch.setattr(http_client, "_limiter", RequestLimiter(10, 10, 0.05))
+        for _ in range(3):
+            http_client.get("https://a.com/")
+        assert starts[2] - starts[0] >= 0.09
+
+    def test_slots_released_after_exception(self, monkeypatch):
+        def _boom(url, headers=None, timeout=None):
+            raise ConnectionError("down")
+        monkeypatch.setattr(http_client, "_send", _boom)
+        monkeypatch.setattr(http_client, "_limiter", RequestLimiter(1, 1, 0))
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                http_client.get("https://a.com/")
+
+    def test_configure_limits_replaces_limiter(self, monkeypatch):
+        monkeypatch.setattr(http_client, "_limiter", http_client._limiter)
+        http_client.configure_limits(4, 1, 0.5)
+        assert http_client._limiter.max_per_host == 1
+        assert http_client._limiter.host_delay == 0.5
+
+
+# ── pooled session ─────────────────────────────────────────────
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    seen_headers = []
+
+    # path -> (content type, body); anything else is a small HTML page
+    ROUTES = {
+        "/big": ("text/html; charset=utf-8",
+                 b"<html><body>" + b"x" * 300_000
+                 + b"<footer>Hauptstr. 1, Berlin</footer></body></html>"),
+        "/brochure.pdf": ("application/pdf", b"%PDF-1.4" + b"\0" * 50_000),
+        "/umlaut": ("text/html; charset=utf-8",
+                    "<html>Straße</html>".encode("utf-8")),
+    }
+
+    def do_GET(self):
+        _KeepAliveHandler.seen_headers.append(dict(self.headers))
+        content_type, body = self.ROUTES.get(
+            self.path, ("text/html", b"<html>ok</html>"))
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(http_client, "_session", None)
+    monkeypatch.setattr(http_client, "_limiter", RequestLimiter(10, 10, 0))
+    http_client.reset_connection_stats()
+    _KeepAliveHandler.seen_headers = []
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestPooledSession:
+    def test_connections_are_reused(self, local_server):
+        for path in ["", "/contact", "/about", "/impressum"]:
+            assert http_client.get(local_server + path).status_code == 200
+        stats = http_client.connection_stats()
+        assert stats["requests"] == 4
+        assert stats["connections"] == 1
+        assert stats["reused"] == 3
+
+    def test_shared_headers_sent(self, local_server):
+        http_client.get(local_server)
+        sent = _KeepAliveHandler.seen_headers[0]
+        assert sent["User-Agent"] == http_client.HEADERS["User-Agent"]
+        assert sent["Accept-Language"] == http_client.HEADERS["Accept-Language"]
+
+    def test_cache_hits_counted(self, local_server, monkeypatch, tmp_path):
+        monkeypatch.setattr(http_client, "CACHE_ENABLED", True)
+        monkeypatch.setattr(http_client, "CACHE_PATH", str(tmp_path / "c.sqlite"))
+        http_client.get(local_server)
+        http_client.get(local_server)
+        stats = http_client.connection_stats()
+        assert stats["requests"] == 1
+        assert stats["cache_hits"] == 1
+
+    def test_modules_share_headers(self):
+        import email_enrich, enrich, page_fetcher
+        assert enrich.HEADERS is page_fetcher.HEADERS is email_enrich.HEADERS
+
+
+# ── bounded downloads ──────────────────────────────────────────
+class TestReadCapped:
+    def test_small_body_untouched(self):
+        body, truncated = http_client._read_capped([b"abc", b"def"], max_bytes=10)
+        assert body == b"abcdef"
+        assert not truncated
+
+    def test_keeps_head_and_tail(self):
+        chunks = [bytes([65 + n]) * 10 for n in range(10)]   # AAAA.. JJJJ..
+        body, truncated = http_client._read_capped(chunks, max_bytes=30,
+                                                   tail_bytes=10)
+        assert truncated
+        assert body == b"A" * 10 + b"B" * 10 + b"J" * 10
+
+    def test_stops_at_download_limit(self):
+        chunks = (b"x" * 10 for _ in range(1000))
+        body, truncated = http_client._read_capped(
+            chunks, max_bytes=20, tail_bytes=5, max_download=50)
+        assert truncated
+        assert len(body) == 20
+        assert next(chunks) == b"x" * 10   # the rest was never pulled
+
+    def test_content_types(self):
+        assert http_client.is_text_content_type("text/html; charset=utf-8")
+        assert http_client.is_text_content_type("Application/XHTML+XML")
+        assert http_client.is_text_content_type(None)
+        assert not http_client.is_text_content_type("application/pdf")
+        assert not http_client.is_text_content_type("image/png")
+
+
+class TestBoundedFetch:
+    def test_large_page_capped_with_footer(self, local_server, monkeypatch):
+        monkeypatch.setattr(http_client, "MAX_BODY_BYTES", 100_000)
+        monkeypatch.setattr(http_client, "TAIL_BYTES", 1_000)
+        r = http_client.get(local_server + "/big")
+        assert r.truncated
+        assert len(r.text) == 100_000
+        assert r.text.startswith("<html><body>")
+        assert "Hauptstr. 1, Berlin" in r.text
+        assert http_client.connection_stats()["truncated"] == 1
+
+    def test_non_html_rejected(self, local_server):
+        r = http_client.get(local_server + "/brochure.pdf")
+        assert r.status_code == 200
+        assert r.text == ""
+        assert http_client.connection_stats()["rejected"] == 1
+
+    def test_charset_respected(self, local_server):
+        assert http_client.get(local_server + "/umlaut").text == "<html>Straße</html>"
+
+
+# ── circuit breaker / dead hosts ───────────────────────────────
+def _dns_error(url):
+    reason = NameResolutionError("gone.de", None, "Name or service not known")
+    return requests.ConnectionError(MaxRetryError(None, url, reason))
+
+
+def _refused_error(url):
+    reason = NewConnectionError(None, "Connection refused")
+    return requests.ConnectionError(MaxRetryError(None, url, reason))
+
+
+@pytest.fixture
+def failing_send(fake_send):
+    """Fake _send: hosts in `down` raise their exception, others answer."""
+    state = {"down": {}}
+    state["calls"] = fake_send(
+        lambda url: state["down"].get(url.split("/")[2], "<html>ok</html>"))
+    http_client.reset_connection_stats()
+    return state
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(threshold=2, cooldown=60)
+        assert not breaker.record_failure("a.com")
+        assert breaker.allow("a.com")
+        assert breaker.record_failure("a.com")
+        assert not breaker.allow("a.com")
+
+    def test_success_resets(self):
+        breaker = CircuitBreaker(threshold=2, cooldown=60)
+        breaker.record_failure("a.com")
+        breaker.record_success("a.com")
+        assert not breaker.record_failure("a.com")
+
+    def test_single_trial_after_cooldown(self):
+        breaker = CircuitBreaker(threshold=1, cooldown=0.05)
+        breaker.record_failure("a.com")
+        time.sleep(0.06)
+        assert breaker.allow("a.com")
+        assert not breaker.allow("a.com")
+
+    def test_timeout_skips_rest_of_host(self, failing_send):
+        failing_send["down"]["dead.com"] = requests.ConnectTimeout("slow")
+        for path in ["/", "/impressum"]:
+            with pytest.raises(requests.ConnectTimeout):
+                http_client.get(f"https://dead.com{path}")
+        for path in ["/contact", "/about"]:
+            with pytest.raises(HostUnavailable):
+                http_client.get(f"https://dead.com{path}")
+        assert failing_send["calls"] == ["https://dead.com/",
+                                         "https://dead.com/impressum"]
+        stats = http_client.connection_stats()
+        assert stats["host_failures"] == 2
+        assert stats["breaker_skips"] == 2
+
+    def test_refused_counts_toward_breaker(self, failing_send):
+        failing_send["down"]["dead.com"] = _refused_error("https://dead.com/")
+        for _ in range(2):
+            with pytest.raises(requests.ConnectionError):
+                http_client.get("https://dead.com/")
+        with pytest.raises(HostUnavailable):
+            http_client.get("https://dead.com/contact")
+
+    @pytest.mark.parametrize("error", [
+        requests.ReadTimeout("slow page"),
+        # iter_content wraps a read timeout mid-body as a ConnectionError
+        requests.ConnectionError(ReadTimeoutError(None, "/slow", "timed out")),
+        requests.ConnectionError("Connection aborted"),
+    ])
+    def test_read_failures_do_not_open_breaker(self, failing_send, error):
+        failing_send["down"]["slow.com"] = error
+        for _ in range(3):
+            with pytest.raises(type(error)):
+                http_client.get("https://slow.com/about")
+        del failing_send["down"]["slow.com"]
+        assert http_client.get("https://slow.com/").status_code == 200
+        assert http_client.connection_stats()["host_failures"] == 0
+
+    def test_other_hosts_unaffected(self, failing_send):
+        failing_send["down"]["dead.com"] = _refused_error("https://dead.com/")
+        with pytest.raises(requests.ConnectionError):
+            http_client.get("https://dead.com/")
+        assert http_client.get("https://alive.com/").status_code == 200
+
+    def test_search_requests_bypass_breaker(self, failing_send):
+        failing_send["down"]["dead.com"] = requests.ConnectTimeout("slow")
+        for _ in range(2):
+            with pytest.raises(requests.ConnectTimeout):
+                http_client.get("https://dead.com/", use_breaker=False)
+        assert len(failing_send["calls"]) == 2
+
+    def test_non_connection_errors_ignored(self, failing_send):
+        failing_send["down"]["odd.com"] = ValueError("bad")
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                http_client.get("https://odd.com/")
+        assert len(failing_send["calls"]) == 2
+
+
+class TestDeadHostPersistence:
+    @pytest.fixture
+    def dead_table(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(http_client, "DEAD_HOSTS_ENABLED", True)
+        monkeypatch.setattr(http_client, "DEAD_HOSTS_PATH",
+                            str(tmp_path / "dead.sqlite"))
+        yield http_client.get_dead_hosts
+        http_client.get_dead_hosts().close()
+
+    def test_dead_host_skipped_in_next_run(self, failing_send, dead_table,
+                                           monkeypatch):
+        failing_send["down"]["dead.com"] = requests.ConnectTimeout("slow")
+        for _ in range(2):
+            with pytest.raises(requests.ConnectTimeout):
+                http_client.get("https://dead.com/")
+        assert dead_table().is_dead("dead.com")
+
+        # A new run starts with a fresh in-memory breaker
+        monkeypatch.setattr(http_client, "_breaker", CircuitBreaker())
+        failing_send["calls"].clear()
+        with pytest.raises(HostUnavailable):
+            http_client.get("https://dead.com/")
+        assert failing_send["calls"] == []
+
+    def test_trial_after_cooldown_revives_dead_host(self, failing_send,
+                                                    dead_table, monkeypatch):
+        monkeypatch.setattr(http_client, "_breaker",
+                            CircuitBreaker(threshold=2, cooldown=0.05))
+        failing_send["down"]["flaky.com"] = requests.ConnectTimeout("slow")
+        for _ in range(2):
+            with pytest.raises(requests.ConnectTimeout):
+                http_client.get("https://flaky.com/")
+        assert dead_table().is_dead("flaky.com")
+        with pytest.raises(HostUnavailable):
+            http_client.get("https://flaky.com/contact")
+
+        del failing_send["down"]["flaky.com"]
+        failing_send["calls"].clear()
+        time.sleep(0.06)
+        assert http_client.get("https://flaky.com/about").status_code == 200
+        assert failing_send["calls"] == ["https://flaky.com/about"]
+        assert not dead_table().is_dead("flaky.com")
+
+    def test_next_run_trials_dead_host_after_cooldown(self, failing_send,
+                                                      dead_table, monkeypatch):
+        dead_table().mark_dead("dead.com", "ConnectTimeout")
+        monkeypatch.setattr(http_client, "_breaker",
+                            CircuitBreaker(cooldown=0.05))
+        with pytest.raises(HostUnavailable):
+            http_client.get("https://dead.com/")
+        time.sleep(0.06)
+        assert http_client.get("https://dead.com/").status_code == 200
+        assert failing_send["calls"] == ["https://dead.com/"]
+        assert not dead_table().is_dead("dead.com")
+
+    def test_read_timeout_never_marks_dead(self, failing_send, dead_table):
+        failing_send["down"]["slow.com"] = requests.ReadTimeout("slow page")
+        for _ in range(3):
+            with pytest.raises(requests.ReadTimeout):
+                http_client.get("https://slow.com/slow")
+        assert not dead_table().is_dead("slow.com")
+
+    def test_dns_failure_recorded_as_dns(self, failing_send, dead_table):
+        failing_send["down"]["gone.de"] = _dns_error("https://gone.de/")
+        with pytest.raises(requests.ConnectionError):
+            http_client.get("https://gone.de/")
+        row = dead_table()._db.execute(
+            "SELECT failed_at, expires_at FROM dead_hosts WHERE host = 'gone.de'"
+        ).fetchone()
+        assert row[1] - row[0] == pytest.approx(DNS_DEAD_HOST_TTL)
+
+    def test_breaker_threshold_respected(self, failing_send, dead_table,
+                                         monkeypatch):
+        monkeypatch.setattr(http_client, "_breaker", CircuitBreaker(threshold=3))
+        failing_send["down"]["flaky.com"] = requests.ConnectTimeout("slow")
+        for _ in range(2):
+            with pytest.raises(requests.ConnectTimeout):
+                http_client.get("https://flaky.com/")
+        assert not dead_table().is_dead("flaky.com")
+        with pytest.raises(requests.ConnectTimeout):
+            http_client.get("https://flaky.com/")
+        assert dead_table().is_dead("flaky.com")
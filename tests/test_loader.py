@@ -0,0 +1,128 @@
+"""Tests for loader.py — input loading and the Parquet sidecar cache."""
+import os
+import pandas as pd
+import pytest
+import loader
+from loader import load_table, sidecar_path
+
+pytest.importorskip("pyarrow")
+
+FRAME = pd.DataFrame({
+    "Company Name": ["Acme GmbH", "Beta B.V.", None],
+    "Website": ["https://acme.de", None, "https://gamma.io"],
+    "Employees": [10, 250, 3],
+})
+
+
+@pytest.fixture
+def sidecars(monkeypatch, tmp_path):
+    """Enable the sidecar cache in an isolated directory."""
+    monkeypatch.setattr(loader, "SIDECAR_CACHE", True)
+    monkeypatch.setattr(loader, "SIDECAR_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "companies.xlsx"
+    FRAME.to_excel(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def excel_reads(monkeypatch):
+    """Count workbook parses."""
+    calls = []
+    real = pd.read_excel
+
+    def _read_excel(*args, **kwargs):
+        calls.append(args[0])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(loader.pd, "read_excel", _read_excel)
+    return calls
+
+
+# ── sidecar cache ──────────────────────────────────────────────
+class TestSidecar:
+    def test_second_load_skips_the_workbook(self, sidecars, workbook, excel_reads):
+        first = load_table(workbook)
+        second = load_table(workbook)
+        assert len(excel_reads) == 1
+        assert os.path.exists(sidecar_path(workbook))
+        pd.testing.assert_frame_equal(first, second)
+        pd.testing.assert_frame_equal(second, pd.read_excel(workbook))
+
+    def test_column_subset_from_sidecar(self, sidecars, workbook, excel_reads):
+        load_table(workbook)
+        df = load_table(workbook, columns=["Website", "Company Name", "Missing"])
+        assert list(df.columns) == ["Website", "Company Name"]
+        assert len(excel_reads) == 1
+
+    def test_changed_workbook_rebuilds(self, sidecars, workbook, excel_reads):
+        load_table(workbook)
+        FRAME.head(1).to_excel(workbook, index=False)
+        stat = os.stat(workbook)
+        os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert len(load_table(workbook)) == 1
+        assert len(excel_reads) == 2
+
+    def test_headerless_sheet(self, sidecars, tmp_path, excel_reads):
+        path = tmp_path / "list.xlsx"
+        pd.DataFrame([["acme.de", "a@acme.de"], ["beta.nl", "b@beta.nl"]]).to_excel(
+            path, index=False, header=False)
+        first = load_table(str(path), header=False)
+        second = load_table(str(path), header=False)
+        assert list(second.columns) == [0, 1]
+        assert second.iloc[1, 1] == "b@beta.nl"
+        pd.testing.assert_frame_equal(first, second)
+        assert len(excel_reads) == 1
+
+    def test_unstorable_frame_is_still_returned(self, sidecars, workbook, monkeypatch):
+        monkeypatch.setattr(loader, "_write_sidecar", lambda *args: False)
+        assert len(load_table(workbook)) == 3
+
+    def test_disabled(self, workbook, excel_reads, tmp_path):
+        load_table(workbook, columns=["Website"])
+        df = load_table(workbook, columns=["Website"])
+        assert list(df.columns) == ["Website"]
+        assert len(excel_reads) == 2
+
+    def test_without_pyarrow(self, sidecars, workbook, monkeypatch):
+        monkeypatch.setattr(loader, "pq", None)
+        assert len(load_table(workbook)) == 3
+        assert not sidecars.exists()
+
+
+# ── other formats ──────────────────────────────────────────────
+class TestFormats:
+    def test_csv_as_text(self, tmp_path):
+        path = tmp_path / "in.csv"
+        FRAME.to_csv(path, index=False)
+        df = load_table(str(path), columns=["Company Name", "Employees"])
+        assert list(df.columns) == ["Company Name", "Employees"]
+        assert df.loc[1, "Employees"] == "250"
+
+    def test_parquet(self, tmp_path):
+        path = tmp_path / "in.parquet"
+        FRAME.to_parquet(path)
+        df = load_table(str(path), columns=["Website", "Missing"])
+        assert list(df.columns) == ["Website"]
+
+    def test_jsonl(self, tmp_path):
+        path = tmp_path / "in.jsonl"
+        FRAME.to_json(path, orient="records", lines=True)
+        df = load_table(str(path))
+        assert df["Company Name"].tolist()[:2] == ["Acme GmbH", "Beta B.V."]
+        assert df["Employees"].tolist() == [10, 250, 3]
+
+    def test_unsupported(self, tmp_path):
+        with pytest.raises(ValueError):
+            load_table(str(tmp_path / "in.txt"))
+
+
+def test_engine_selection(monkeypatch):
+    monkeypatch.setattr(loader, "EXCEL_ENGINE", "openpyxl")
+    assert loader.excel_engine() == "openpyxl"
+    monkeypatch.setattr(loader, "EXCEL_ENGINE", "auto")
+    assert loader.excel_engine() in ("calamine", "openpyxl")
@@ -1,10 +1,23 @@
-"""Tests for merge helper functions across merge modules."""
+"""Tests for merge.py — the unified contacts merge engine."""
+import json
+import pandas as pd
 import pytest
-from merge_by_domain import extract_domain as domain_extract_domain
-from merge_emails import normalize_company, normalize_email
+import merge
+from merge import (
+    MergeConfig,
+    canonical_domain as domain_extract_domain,
+    canonicalize_domains,
+    emails_by_key,
+    load_config,
+    merge_contacts,
+    normalize_companies,
+    normalize_company,
+    normalize_email,
+    normalize_emails,
+)
 
 
-# ── extract_domain (merge_by_domain.py) ────────────────────────
+# ── canonical_domain ───────────────────────────────────────────
 class TestExtractDomain:
     def test_basic_url(self):
         assert domain_extract_domain("https://www.example.com/about") == "example.com"
@@ -29,6 +42,23 @@ class TestExtractDomain:
         result = domain_extract_domain("")
         assert result is None or result == ""
 
+    @pytest.mark.parametrize("value", [
+        "acme.de", "ACME.de ", "www.acme.de", "https://WWW.Acme.de/x?y=1",
+        "http://acme.de:8080/", "info@acme.de", "www2.acme.de.",
+    ])
+    def test_every_form_canonicalizes_alike(self, value):
+        assert domain_extract_domain(value) == "acme.de"
+
+    def test_www_only_stripped_as_prefix(self):
+        assert domain_extract_domain("shop.www.de") == "shop.www.de"
+
+    def test_vectorized_keeps_index(self):
+        values = pd.Series(["https://a.de", None, "b.com", "https://a.de/x"],
+                           index=[10, 11, 12, 13])
+        out = canonicalize_domains(values)
+        assert out.tolist() == ["a.de", None, "b.com", "a.de"]
+        assert out.index.tolist() == [10, 11, 12, 13]
+
 
 # ── normalize_company ──────────────────────────────────────────
 class TestNormalizeCompany:
@@ -68,3 +98,168 @@ class TestNormalizeEmail:
 
     def test_int_returns_none(self):
         assert normalize_email(123) is None
+
+
+# ── non-string columns ─────────────────────────────────────────
+@pytest.mark.parametrize("values", [
+    pd.Series([12345, 678]),                        # numeric IDs
+    pd.Series([1.5, float("nan")]),
+    pd.Series([float("nan"), float("nan")]),        # empty Excel column
+    pd.Series([None, None], dtype=object),
+])
+class TestNonStringColumns:
+    def test_domains(self, values):
+        assert canonicalize_domains(values).tolist() == [None, None]
+
+    def test_companies(self, values):
+        assert normalize_companies(values).tolist() == ["", ""]
+
+    def test_emails(self, values):
+        assert normalize_emails(values).tolist() == [None, None]
+
+    def test_merge_on_numeric_key(self, values):
+        companies = pd.DataFrame({"Website": values})
+        contacts = pd.DataFrame({"Website": ["acme.de"], "Email": ["a@acme.de"]})
+        out = merge_contacts(companies, contacts, MergeConfig())
+        assert out["Email"].isna().all()
+
+
+# ── emails_by_key ──────────────────────────────────────────────
+class TestEmailsByKey:
+    def test_aggregates_sorted_unique(self):
+        keys = pd.Series(["a.de", "a.de", "b.de", "a.de", None])
+        emails = pd.Series(["Zed@a.de", "amy@a.de", "bo@b.de", "zed@a.de ", "x@y.de"])
+        out = emails_by_key(keys, emails)
+        assert out.to_dict() == {"a.de": "amy@a.de, zed@a.de", "b.de": "bo@b.de"}
+
+    def test_first_email_only(self):
+        keys = pd.Series(["a.de", "a.de", "b.de"])
+        emails = pd.Series([None, "second@a.de", "bo@b.de"])
+        out = emails_by_key(keys, emails, aggregate=False)
+        assert out.to_dict() == {"a.de": "second@a.de", "b.de": "bo@b.de"}
+
+    def test_empty(self):
+        assert emails_by_key(pd.Series([None]), pd.Series(["x@y.de"])).empty
+
+
+# ── merge_contacts ─────────────────────────────────────────────
+@pytest.fixture
+def companies():
+    return pd.DataFrame({
+        "Company Name": ["Acme GmbH", "Beta B.V.", "Gamma"],
+        "Website": ["https://www.acme.de", "http://beta.nl/home", None],
+        "Final_Email": [None, "sales@beta.nl", None],
+        "Inferred_Email": ["info@acme.de", None, None],
+    })
+
+
+class TestMergeContacts:
+    def test_by_website_with_missing_domains(self, companies):
+        contacts = pd.DataFrame({
+            "Website": ["acme.de", "www.acme.de/x", "new.com"],
+            "Email": ["b@acme.de", "a@acme.de", "hi@new.com"],
+        })
+        out = merge_contacts(companies, contacts, load_config("by-website"))
+        assert out["Email"].tolist() == ["a@acme.de, b@acme.de", None, None,
+                                         "hi@new.com"]
+        assert out.loc[3, "Company Name"] == "new.com"
+        assert out.loc[3, "Website"] == "new.com"
+
+    def test_by_domain_fills_final_email(self, companies):
+        contacts = pd.DataFrame({"Domain": ["beta.nl", "acme.de"],
+                                 "Mail": ["x@beta.nl", "a@acme.de"]})
+        out = merge_contacts(companies, contacts, load_config("by-domain"))
+        assert out["Final_Email"].tolist() == ["a@acme.de", "sales@beta.nl", None]
+        assert "Email" not in out.columns
+        assert len(out) == len(companies)
+
+    def test_join_never_duplicates_company_rows(self, companies):
+        contacts = pd.DataFrame({"Domain": ["acme.de"] * 3,
+                                 "Mail": ["a@acme.de", "b@acme.de", "c@acme.de"]})
+        out = merge_contacts(companies, contacts, load_config("by-domain"))
+        assert len(out) == len(companies)
+
+    def test_by_company_prefers_inferred_email(self, companies):
+        contacts = pd.DataFrame({
+            "Company Name": ["ACME GmbH", "beta b.v", "Gamma"],
+            "Email": ["ext@acme.de", "EXT@beta.nl", "hello@gamma.io"],
+        })
+        out = merge_contacts(companies, contacts, load_config("by-company"))
+        assert out["External_Email"].tolist() == ["ext@acme.de", "ext@beta.nl",
+                                                  "hello@gamma.io"]
+        assert out["Final_Email"].tolist() == ["info@acme.de", "ext@beta.nl",
+                                               "hello@gamma.io"]
+
+    def test_fuzzy_company_match_with_scores(self, companies):
+        contacts = pd.DataFrame({
+            "Company Name": ["ACME Limited", "Beta BV Netherlands", "Omega"],
+            "Email": ["ext@acme.de", "ext@beta.nl", "o@omega.io"],
+        })
+        config = load_config("by-company", fuzzy=True, append_missing=True)
+        out = merge_contacts(companies, contacts, config)
+        assert out["External_Email"].tolist()[:3] == ["ext@acme.de", None, None]
+        assert out["Match_Score"].tolist()[0] == 1.0
+        assert pd.isna(out["Match_Score"].tolist()[2])
+        # Unmatched contacts are appended under their own spelling
+        assert set(out["Company Name"][3:]) == {"Beta BV Netherlands", "Omega"}
+
+    def test_fuzzy_threshold_lowered(self, companies):
+        contacts = pd.DataFrame({"Company Name": ["Beta BV Netherlands"],
+                                 "Email": ["ext@beta.nl"]})
+        config = load_config("by-company", fuzzy=True, match_threshold=0.4)
+        out = merge_contacts(companies, contacts, config)
+        assert out["External_Email"].tolist() == [None, "ext@beta.nl", None]
+        assert 0.4 <= out.loc[1, "Match_Score"] < 1.0
+
+    def test_fuzzy_needs_company_key(self, companies):
+        contacts = pd.DataFrame({"Website": ["acme.de"], "Email": ["a@acme.de"]})
+        with pytest.raises(ValueError):
+            merge_contacts(companies, contacts, MergeConfig(fuzzy=True))
+
+    def test_input_frame_untouched(self, companies):
+        before = companies.copy()
+        contacts = pd.DataFrame({"Website": ["acme.de"], "Email": ["a@acme.de"]})
+        merge_contacts(companies, contacts, MergeConfig())
+        pd.testing.assert_frame_equal(companies, before)
+
+
+# ── configuration / CLI ────────────────────────────────────────
+class TestConfig:
+    def test_layering(self, tmp_path):
+        cfg = tmp_path / "merge.json"
+        cfg.write_text(json.dumps({"append_missing": False, "email_column": "Mail"}))
+        config = load_config("by-website", str(cfg), output_file="out.csv")
+        assert config.append_missing is False
+        assert config.email_column == "Mail"
+        assert config.output_file == "out.csv"
+
+    def test_presets_keep_their_original_outputs(self):
+        assert load_config("by-domain").output_file == \
+            "data/companies_enriched_WITH_PITAGONE.xlsx"
+        assert load_config("by-website").output_file == \
+            "data/companies_merged_FINAL.xlsx"
+
+    def test_unknown_setting(self, tmp_path):
+        cfg = tmp_path / "merge.json"
+        cfg.write_text(json.dumps({"apend_missing": True}))
+        with pytest.raises(ValueError, match="apend_missing"):
+            load_config(config_file=str(cfg))
+
+    def test_unknown_preset(self):
+        with pytest.raises(ValueError):
+            load_config("by-magic")
+
+    def test_cli_round_trip(self, tmp_path, companies, capsys):
+        companies_file = tmp_path / "companies.xlsx"
+        contacts_file = tmp_path / "contacts.csv"
+        output_file = tmp_path / "out" / "merged.xlsx"
+        companies.to_excel(companies_file, index=False)
+        contacts_file.write_text("acme.de,a@acme.de\nnew.com,hi@new.com\n")
+        merge.main(["--preset", "domains-and-emails",
+                    "--companies", str(companies_file),
+                    "--contacts", str(contacts_file),
+                    "--output", str(output_file)])
+        out = pd.read_excel(output_file)
+        assert out["Email"].tolist()[0] == "a@acme.de"
+        assert out["Company Name"].tolist()[-1] == "new.com"
+        assert "Merged 4 rows" in capsys.readouterr().out
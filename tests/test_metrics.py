@@ -0,0 +1,110 @@
+"""Tests for metrics.py — stage histograms, outcomes and reports."""
+import json
+import time
+import pytest
+import requests
+import metrics
+from metrics import Histogram, Metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+# ── Histogram ──────────────────────────────────────────────────
+class TestHistogram:
+    def test_buckets_and_totals(self):
+        h = Histogram()
+        for ms in [0.5, 3, 3, 40, 20000]:
+            h.add(ms)
+        assert h.count == 5
+        assert h.max == 20000
+        assert h.buckets[0] == 1                  # <= 1 ms
+        assert h.buckets[-1] == 1                 # overflow
+        assert sum(h.buckets) == 5
+
+    def test_percentiles_are_bucket_bounds(self):
+        h = Histogram()
+        for _ in range(90):
+            h.add(4)
+        for _ in range(10):
+            h.add(900)
+        assert h.percentile(0.5) == 5
+        assert h.percentile(0.95) == 1000
+
+    def test_empty(self):
+        assert Histogram().percentile(0.5) == 0.0
+
+
+# ── stage() ────────────────────────────────────────────────────
+class TestStage:
+    def test_ok_outcome_and_latency(self):
+        with metrics.stage("parse"):
+            time.sleep(0.01)
+        s = metrics.snapshot()["stages"]["parse"]
+        assert s["outcomes"] == {"ok": 1}
+        assert s["max_ms"] >= 10
+
+    def test_custom_outcome(self):
+        with metrics.stage("search") as timer:
+            timer.outcome = "no_result"
+        assert metrics.snapshot()["stages"]["search"]["outcomes"] == {"no_result": 1}
+
+    @pytest.mark.parametrize("exc, outcome", [
+        (requests.ReadTimeout("slow"), "timeout"),
+        (TimeoutError(), "timeout"),
+        (ValueError("bad"), "error"),
+    ])
+    def test_exceptions_classified_and_reraised(self, exc, outcome):
+        with pytest.raises(type(exc)):
+            with metrics.stage("fetch /"):
+                raise exc
+        assert metrics.snapshot()["stages"]["fetch /"]["outcomes"] == {outcome: 1}
+
+    def test_counters(self):
+        metrics.count("search_cache_hits")
+        metrics.count("search_cache_hits", 2)
+        assert metrics.snapshot()["counters"] == {"search_cache_hits": 3}
+
+
+# ── reporting ──────────────────────────────────────────────────
+class TestReporting:
+    def test_summary_table_lists_stages_and_counters(self):
+        metrics.record("search", 0.2, "ok")
+        metrics.record("search", 10.0, "timeout")
+        metrics.count("http.requests", 7)
+        table = metrics.summary_table()
+        lines = table.splitlines()
+        assert lines[0].startswith("stage")
+        assert any(line.startswith("search") and "timeout=1" in line
+                   and "ok=1" in line for line in lines)
+        assert lines[-1].split() == ["http.requests", "7"]
+
+    def test_json_round_trip(self, tmp_path):
+        metrics.record("country", 0.001)
+        path = tmp_path / "out" / "metrics.json"
+        metrics.write_json(str(path))
+        data = json.loads(path.read_text())
+        assert data["stages"]["country"]["count"] == 1
+        assert data["stages"]["country"]["buckets_ms"] == metrics.BUCKETS_MS
+
+    def test_thread_safety(self):
+        import threading
+        m = Metrics()
+
+        def _work():
+            for _ in range(500):
+                m.record("x", 0.001)
+                m.count("n")
+
+        threads = [threading.Thread(target=_work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        snap = m.snapshot()
+        assert snap["stages"]["x"]["count"] == 4000
+        assert snap["counters"]["n"] == 4000
@@ -0,0 +1,88 @@
+"""Tests for page_document.py — parse-once page views."""
+import pytest
+from country_enrich import detect_country
+from email_enrich import extract_email_from_soups
+from page_document import PageDocument, as_document
+
+PAGE = (
+    '<html lang="de-AT"><body>'
+    '<p>Willkommen +49 30 123456</p>'
+    '<a href="mailto:info@firma.de?subject=Hi">Mail</a>'
+    '<footer>Berlin, Deutschland</footer>'
+    '</body></html>'
+)
+
+
+@pytest.fixture
+def doc(make_soup):
+    return PageDocument(make_soup(PAGE))
+
+
+# ── views ──────────────────────────────────────────────────────
+class TestViews:
+    def test_text(self, doc):
+        assert doc.text == "Willkommen +49 30 123456 Mail Berlin, Deutschland"
+
+    def test_text_lower(self, doc):
+        assert doc.text_lower == doc.text.lower()
+
+    def test_lang(self, doc):
+        assert doc.lang == "de-at"
+
+    def test_missing_lang(self, make_soup):
+        assert PageDocument(make_soup("<html><body>x</body></html>")).lang is None
+
+    def test_mailto_addresses(self, doc):
+        assert doc.mailto_addresses == ["info@firma.de"]
+
+    def test_anchors(self, doc):
+        assert doc.anchors == [("mailto:info@firma.de?subject=Hi", "Mail")]
+
+    def test_title_and_site_name(self, make_soup):
+        d = PageDocument(make_soup(
+            '<html><head><title> Acme | Home </title>'
+            '<meta property="og:site_name" content="Acme Tools"></head></html>'))
+        assert d.title == "Acme | Home"
+        assert d.site_name == "Acme Tools"
+
+    def test_title_missing(self, doc):
+        assert doc.title == ""
+        assert doc.site_name == ""
+
+    def test_address_texts_prefer_structured_elements(self, doc):
+        assert doc.address_texts == ["berlin, deutschland"]
+
+    def test_address_texts_fall_back_to_page(self, make_soup):
+        d = PageDocument(make_soup("<html><body><p>Made in Italy</p></body></html>"))
+        assert d.address_texts == ["made in italy"]
+
+
+# ── parse-once behaviour ───────────────────────────────────────
+class TestParseOnce:
+    def test_text_computed_once_across_extractors(self, doc, monkeypatch):
+        calls = []
+        real = doc.soup.get_text
+
+        def counting_get_text(*args, **kwargs):
+            calls.append(args)
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(doc.soup, "get_text", counting_get_text)
+        extract_email_from_soups({"": doc})
+        detect_country("Firma GmbH", "https://firma.com", None, [doc])
+        extract_email_from_soups({"": doc})
+        assert len(calls) == 1
+
+    def test_as_document_passes_documents_through(self, doc):
+        assert as_document(doc) is doc
+
+    def test_as_document_wraps_soup(self, make_soup):
+        soup = make_soup(PAGE)
+        assert as_document(soup).soup is soup
+
+    def test_extractors_agree_on_documents_and_soups(self, make_soup):
+        soup = make_soup(PAGE)
+        assert extract_email_from_soups({"": soup}) == \
+            extract_email_from_soups({"": PageDocument(soup)})
+        assert detect_country("Firma", "https://f.com", None, [soup]) == \
+            detect_country("Firma", "https://f.com", None, [PageDocument(soup)])
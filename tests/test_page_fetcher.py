@@ -0,0 +1,220 @@
+"""Tests for page_fetcher.py — fetching standard company pages."""
+import threading
+import time
+import pytest
+from tests.conftest import FakeResponse
+import page_fetcher
+from page_fetcher import fetch_pages, iter_pages, PAGES
+
+
+# ── fetch_pages ────────────────────────────────────────────────
+@pytest.mark.parametrize("concurrent", [True, False])
+class TestFetchPages:
+    def test_only_200_pages_returned(self, monkeypatch, fake_send, concurrent):
+        monkeypatch.setattr(page_fetcher, "CONCURRENT_FETCH", concurrent)
+        fake_send({
+            "https://acme.de": FakeResponse(200, "<html>home</html>"),
+            "https://acme.de/impressum": FakeResponse(200, "<html>imp</html>"),
+            "https://acme.de/about": FakeResponse(500),
+        })
+        soups = fetch_pages("https://acme.de")
+        assert list(soups) == ["", "/impressum"]
+        assert soups["/impressum"].text == "imp"
+
+    def test_empty_bodies_are_skipped(self, monkeypatch, fake_send, concurrent):
+        monkeypatch.setattr(page_fetcher, "CONCURRENT_FETCH", concurrent)
+        fake_send({
+            "https://acme.de": FakeResponse(200, "<html>home</html>"),
+            "https://acme.de/about": FakeResponse(200, ""),
+        })
+        assert list(fetch_pages("https://acme.de")) == [""]
+
+    def test_exceptions_are_skipped(self, monkeypatch, fake_send, concurrent):
+        monkeypatch.setattr(page_fetcher, "CONCURRENT_FETCH", concurrent)
+        fake_send({
+            "https://acme.de": FakeResponse(200, "<html>home</html>"),
+            "https://acme.de/contact": TimeoutError("slow"),
+        })
+        assert list(fetch_pages("https://acme.de")) == [""]
+
+    def test_requests_every_path(self, monkeypatch, fake_send, concurrent):
+        monkeypatch.setattr(page_fetcher, "CONCURRENT_FETCH", concurrent)
+        calls = fake_send({})
+        assert fetch_pages("https://acme.de") == {}
+        assert sorted(calls) == sorted(f"https://acme.de{p}" for p in PAGES)
+
+    def test_paths_limit_the_fetch(self, monkeypatch, fake_send, concurrent):
+        monkeypatch.setattr(page_fetcher, "CONCURRENT_FETCH", concurrent)
+        calls = fake_send({})
+        fetch_pages("https://acme.de", paths=["/contact"])
+        assert calls == ["https://acme.de/contact"]
+
+    def test_empty_paths_make_no_requests(self, monkeypatch, fake_send, concurrent):
+        monkeypatch.setattr(page_fetcher, "CONCURRENT_FETCH", concurrent)
+        calls = fake_send({})
+        assert fetch_pages("https://acme.de", paths=[]) == {}
+        assert calls == []
+
+
+def test_concurrent_fetch_takes_about_one_round_trip(monkeypatch, fake_send):
+    monkeypatch.setattr(page_fetcher, "CONCURRENT_FETCH", True)
+    fake_send({}, delay=0.2)
+    start = time.perf_counter()
+    fetch_pages("https://acme.de")
+    assert time.perf_counter() - start < 0.2 * len(PAGES) / 2
+
+
+# ── iter_pages ─────────────────────────────────────────────────
+@pytest.fixture
+def fetch_stats():
+    page_fetcher.reset_fetch_stats()
+    yield page_fetcher.fetch_stats
+    page_fetcher.reset_fetch_stats()
+
+
+class TestIterPages:
+    def test_yields_200_pages_in_priority_order(self, fake_send, fetch_stats):
+        fake_send({
+            "https://acme.de": FakeResponse(200, "<html>home</html>"),
+            "https://acme.de/about": FakeResponse(200, "<html>about</html>"),
+            "https://acme.de/contact": FakeResponse(500),
+        }, delay=0.01)
+        assert [path for path, _ in iter_pages("https://acme.de")] == ["", "/about"]
+        stats = fetch_stats()
+        assert stats["pages_requested"] == len(PAGES)
+        assert stats["pages_skipped"] == 0
+
+    def test_early_stop_skips_remaining_paths(self, monkeypatch, fake_send,
+                                              fetch_stats):
+        monkeypatch.setattr(page_fetcher, "LAZY_PREFETCH", 1)
+        fake_send({"https://early.de": FakeResponse(200, "<html>home</html>")})
+        stream = iter_pages("https://early.de")
+        path, doc = next(stream)
+        stream.close()
+        assert path == "" and doc.text == "home"
+        # the homepage is fetched on its own, so nothing else was requested
+        assert fetch_stats()["pages_skipped"] == len(PAGES) - 1
+
+    def test_early_stop_without_discovery(self, monkeypatch, fake_send,
+                                          fetch_stats):
+        monkeypatch.setattr(page_fetcher, "DISCOVERY", False)
+        monkeypatch.setattr(page_fetcher, "LAZY_PREFETCH", 1)
+        fake_send({"https://nodisc.de": FakeResponse(200, "<html>home</html>")})
+        stream = iter_pages("https://nodisc.de")
+        next(stream)
+        stream.close()
+        # the homepage plus the one page prefetched behind it
+        assert fetch_stats()["pages_skipped"] == len(PAGES) - 2
+
+    def test_no_prefetch_outlives_close(self, monkeypatch, fake_send,
+                                        fetch_stats):
+        monkeypatch.setattr(page_fetcher, "DISCOVERY", False)
+        monkeypatch.setattr(page_fetcher, "LAZY_PREFETCH", 3)
+        state = {"active": 0, "finished": 0}
+        lock = threading.Lock()
+
+        def _slow(url):
+            with lock:
+                state["active"] += 1
+            time.sleep(0 if url == "https://slow.de" else 0.1)
+            with lock:
+                state["active"] -= 1
+                state["finished"] += 1
+            return FakeResponse(200, "<html>page</html>")
+
+        calls = fake_send(_slow)
+        stream = iter_pages("https://slow.de")
+        next(stream)
+        stream.close()
+        assert state["active"] == 0
+        sent = list(calls)
+        time.sleep(0.15)
+        assert calls == sent
+        assert state["finished"] == len(sent)
+
+    def test_paths_subset(self, fake_send, fetch_stats):
+        calls = fake_send({})
+        assert list(iter_pages("https://subset.de", paths=["/impressum"])) == []
+        assert [url for url in calls if "subset.de" in url] == [
+            "https://subset.de/impressum"]
+
+
+# ── link discovery ─────────────────────────────────────────────
+HOME = """<html><body><nav>
+<a href="/">Home</a>
+<a href="/en/products">Products</a>
+<a href="https://www.acme.de/company/about.html">Who we are</a>
+<a href="/en/kontakt">Kontakt</a>
+<a href="/de/kontakt">Kontakt (DE)</a>
+<a href="/legal?page=imprint">Legal</a>
+<a href="https://facebook.com/acme/contact">Facebook</a>
+<a href="/files/contact-form.pdf">Form</a>
+<a href="mailto:info@acme.de">Mail us</a>
+</nav></body></html>"""
+
+
+class TestDiscoverLinks:
+    def test_ranked_one_per_kind(self, make_soup):
+        from page_document import PageDocument
+        links = page_fetcher.discover_links(
+            PageDocument(make_soup(HOME)), "https://acme.de")
+        assert links == ["/en/kontakt", "/legal?page=imprint",
+                         "/company/about.html"]
+
+    def test_link_text_counts(self, make_soup):
+        from page_document import PageDocument
+        home = PageDocument(make_soup('<a href="/p/17">Impressum</a>'))
+        assert page_fetcher.discover_links(home, "https://acme.de") == ["/p/17"]
+
+    def test_no_links(self, make_soup):
+        from page_document import PageDocument
+        home = PageDocument(make_soup('<a href="/shop">Shop</a>'))
+        assert page_fetcher.discover_links(home, "https://acme.de") == []
+
+
+@pytest.mark.parametrize("mode", ["concurrent", "sequential", "lazy"])
+class TestDiscoveryFetch:
+    def _fetch(self, monkeypatch, mode, base_url):
+        monkeypatch.setattr(page_fetcher, "CONCURRENT_FETCH", mode == "concurrent")
+        if mode == "lazy":
+            return dict(iter_pages(base_url))
+        return fetch_pages(base_url)
+
+    def test_follows_homepage_links(self, monkeypatch, fake_send, mode):
+        calls = fake_send({
+            "https://links.de": FakeResponse(200, HOME.replace("acme.de", "links.de")),
+            "https://links.de/en/kontakt": FakeResponse(200, "<html>k</html>"),
+            "https://links.de/company/about.html": FakeResponse(200, "<html>a</html>"),
+        })
+        pages = self._fetch(monkeypatch, mode, "https://links.de")
+        assert sorted(pages) == ["", "/company/about.html", "/en/kontakt"]
+        assert sorted(calls) == sorted([
+            "https://links.de", "https://links.de/en/kontakt",
+            "https://links.de/legal?page=imprint",
+            "https://links.de/company/about.html",
+        ])
+
+    def test_falls_back_to_static_pages(self, monkeypatch, fake_send, mode):
+        calls = fake_send({
+            "https://static.de": FakeResponse(200, "<html>no links</html>"),
+        })
+        self._fetch(monkeypatch, mode, "https://static.de")
+        assert sorted(calls) == sorted(f"https://static.de{p}" for p in PAGES)
+
+
+# ── metrics ────────────────────────────────────────────────────
+def test_fetch_metrics_per_path(monkeypatch, fake_send):
+    import metrics
+    metrics.reset()
+    monkeypatch.setattr(page_fetcher, "DISCOVERY", False)
+    fake_send({
+        "https://stats.de": FakeResponse(200, "<html>home</html>"),
+        "https://stats.de/impressum": TimeoutError("slow"),
+    })
+    fetch_pages("https://stats.de")
+    stages = metrics.snapshot()["stages"]
+    assert stages["fetch /"]["outcomes"] == {"ok": 1}
+    assert stages["fetch /contact"]["outcomes"] == {"http_404": 1}
+    assert stages["fetch /impressum"]["outcomes"] == {"timeout": 1}
+    assert stages["parse"]["count"] == 1
+    metrics.reset()
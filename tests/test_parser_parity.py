@@ -0,0 +1,101 @@
+"""Parity suite: every parser backend must yield the same signals."""
+from pathlib import Path
+import pytest
+from country_enrich import (
+    infer_country_from_html_lang,
+    infer_country_from_phone_numbers,
+    infer_country_from_address_text,
+)
+from email_enrich import emails_in_page, select_best_email
+from page_document import BACKENDS, available_backends, parse_document
+
+CORPUS = sorted((Path(__file__).parent / "fixtures" / "pages").glob("*.html"))
+REFERENCE = "html.parser"
+
+# Expected reference-backend signals for each saved page
+EXPECTED = {
+    "gmbh_impressum.html": {
+        "email": "info@mueller-kabel.de", "lang": "Germany",
+        "phone": "Germany", "address": "Germany",
+    },
+    "turkish_as.html": {
+        "email": "satis@anadolu-elektrik.com.tr", "lang": "Turkey",
+        "phone": "Turkey", "address": "Turkey",
+    },
+    "dubai_fzco.html": {
+        "email": "Sales@GulfSecure.ae", "lang": None,
+        "phone": "United Arab Emirates", "address": "United Arab Emirates",
+    },
+    "israel_he.html": {
+        "email": "office@bitahon.co.il", "lang": "Israel",
+        "phone": "Israel", "address": "Israel",
+    },
+    "english_no_signals.html": {
+        "email": "hello@acme-widgets.com", "lang": None,
+        "phone": None, "address": None,   # "Indiana" is not India
+    },
+    "malformed_nl.html": {
+        "email": "contact@vandijk-techniek.nl", "lang": "Netherlands",
+        "phone": "Netherlands", "address": "Netherlands",
+    },
+}
+
+
+def signals(html: str, backend: str) -> dict:
+    doc = parse_document(html, backend=backend)
+    return {
+        "emails": emails_in_page(doc),
+        "email": select_best_email(emails_in_page(doc)),
+        "lang": infer_country_from_html_lang([doc]),
+        "phone": infer_country_from_phone_numbers([doc]),
+        "address": infer_country_from_address_text([doc]),
+        "anchors": doc.anchors,
+        "title": (doc.title, doc.site_name),
+    }
+
+
+def backend_param(backend):
+    return pytest.param(
+        backend,
+        marks=pytest.mark.skipif(backend not in available_backends(),
+                                 reason=f"{backend} not installed"),
+    )
+
+
+def test_corpus_covers_expectations():
+    assert sorted(p.name for p in CORPUS) == sorted(EXPECTED)
+
+
+@pytest.mark.parametrize("page", CORPUS, ids=lambda p: p.name)
+def test_reference_backend_signals(page):
+    got = signals(page.read_text(encoding="utf-8"), REFERENCE)
+    expected = EXPECTED[page.name]
+    assert {key: got[key] for key in expected} == expected
+
+
+@pytest.mark.parametrize("backend", [backend_param(b) for b in BACKENDS
+                                     if b != REFERENCE])
+@pytest.mark.parametrize("page", CORPUS, ids=lambda p: p.name)
+def test_backend_matches_reference(page, backend):
+    html = page.read_text(encoding="utf-8")
+    assert signals(html, backend) == signals(html, REFERENCE)
+
+
+@pytest.mark.parametrize("backend", [backend_param(b) for b in BACKENDS])
+def test_search_result_links(backend):
+    html = (
+        '<div class="results">'
+        '<a class="result__a" href="//duckduckgo.com/l/?uddg=https%3A%2F%2Facme.de">Acme</a>'
+        '<a class="result__snippet" href="https://ignored.com">x</a>'
+        '<a class="result__a big" href="https://acme.com/about">Acme</a>'
+        '</div>'
+    )
+    assert parse_document(html, backend=backend).hrefs("a.result__a") == [
+        "//duckduckgo.com/l/?uddg=https%3A%2F%2Facme.de",
+        "https://acme.com/about",
+    ]
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        parse_document("<html></html>", backend="regex")
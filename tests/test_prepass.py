@@ -0,0 +1,115 @@
+"""Tests for prepass.py — planning network stages from free signals."""
+import pandas as pd
+import prepass
+from page_fetcher import PAGES
+from prepass import EMAIL_PAGES, plan_rows, summarize_plan
+
+
+def _frame(**columns):
+    return pd.DataFrame(columns)
+
+
+# ── plan_rows ──────────────────────────────────────────────────
+class TestPlanRows:
+    def test_nothing_known_runs_everything(self):
+        plan = plan_rows(_frame(**{"Company Name": ["Acme"]}))
+        row = plan.loc[0]
+        assert row["Needs_Search"]
+        assert row["Pages"] == PAGES
+        assert row["Prepass_Confidence"] == "low"
+
+    def test_known_website_skips_search(self):
+        plan = plan_rows(_frame(**{"Company Name": ["Acme"],
+                                   "Website": ["https://acme.com"]}))
+        assert not plan.loc[0, "Needs_Search"]
+        assert plan.loc[0, "Pages"] == PAGES
+
+    def test_settled_country_and_email_need_nothing(self):
+        plan = plan_rows(_frame(**{"Company Name": ["Bosch GmbH"],
+                                   "Website": ["https://bosch.de"],
+                                   "Email": ["info@bosch.de"]}))
+        row = plan.loc[0]
+        assert not row["Needs_Search"]
+        assert row["Pages"] == []
+        assert row["Prepass_Country"] == "Germany"
+        assert row["Prepass_Confidence"] == "high"
+
+    def test_settled_country_fetches_only_email_pages(self):
+        plan = plan_rows(_frame(**{"Company Name": ["Bosch GmbH"],
+                                   "Website": ["https://bosch.de"]}))
+        assert plan.loc[0, "Pages"] == EMAIL_PAGES
+
+    def test_suffix_alone_is_medium_and_unsettled(self):
+        plan = plan_rows(_frame(**{"Company Name": ["Bosch GmbH"],
+                                   "Email": ["info@bosch.com"]}))
+        row = plan.loc[0]
+        assert row["Prepass_Country"] == "Germany"
+        assert row["Prepass_Confidence"] == "medium"
+        assert row["Needs_Search"]
+        assert row["Pages"] == PAGES
+
+    def test_settled_confidence_is_configurable(self, monkeypatch):
+        monkeypatch.setattr(prepass, "SETTLED_CONFIDENCE", {"high", "medium"})
+        plan = plan_rows(_frame(**{"Company Name": ["Bosch GmbH"],
+                                   "Email": ["info@bosch.com"]}))
+        assert not plan.loc[0, "Needs_Search"]
+        assert plan.loc[0, "Pages"] == []
+
+    def test_blank_and_missing_values_are_unknown(self):
+        plan = plan_rows(_frame(**{"Company Name": ["A", "B", "C"],
+                                   "Website": ["  ", None, float("nan")]}))
+        assert plan["Known_Website"].isna().all()
+        assert plan["Needs_Search"].all()
+
+    def test_bare_domains_normalized(self):
+        plan = plan_rows(_frame(**{"Company Name": ["A", "B", "C"],
+                                   "Website": ["acme.de", "WWW.Beta.com/kontakt",
+                                               "http://gamma.fr/"]}))
+        assert list(plan["Known_Website"]) == [
+            "https://acme.de", "https://www.beta.com", "http://gamma.fr"]
+        assert not plan["Needs_Search"].any()
+        assert plan.loc[0, "Prepass_Country"] == "Germany"
+
+    def test_unusable_website_is_unknown(self):
+        plan = plan_rows(_frame(**{"Company Name": ["A", "B", "C"],
+                                   "Website": ["n/a", "mailto:x@a.de",
+                                               "acme.de:port"]}))
+        assert plan["Known_Website"].isna().all()
+        assert plan["Needs_Search"].all()
+
+    def test_unusable_inferred_website_falls_back(self):
+        plan = plan_rows(_frame(**{"Company Name": ["A"],
+                                   "Inferred_Website": ["-"],
+                                   "Website": ["a.com"]}))
+        assert plan.loc[0, "Known_Website"] == "https://a.com"
+
+    def test_inferred_columns_take_priority(self):
+        plan = plan_rows(_frame(**{"Company Name": ["A"],
+                                   "Inferred_Website": ["https://a.fr"],
+                                   "Website": ["https://a.com"]}))
+        assert plan.loc[0, "Known_Website"] == "https://a.fr"
+        assert plan.loc[0, "Prepass_Country"] == "France"
+
+    def test_index_preserved(self):
+        df = _frame(**{"Company Name": ["A", "B"]})
+        df.index = [10, 20]
+        assert list(plan_rows(df).index) == [10, 20]
+
+
+# ── summarize_plan ─────────────────────────────────────────────
+class TestSummarizePlan:
+    def test_counts_avoided_requests(self):
+        plan = plan_rows(_frame(**{
+            "Company Name": ["Acme", "Bosch GmbH", "Bosch GmbH"],
+            "Website": [None, "https://bosch.de", "https://bosch.de"],
+            "Email": [None, None, "info@bosch.de"],
+        }))
+        summary = summarize_plan(plan)
+        assert summary["rows"] == 3
+        assert summary["offline_rows"] == 1
+        assert summary["searches_avoided"] == 2
+        assert summary["page_fetches_avoided"] == (
+            (len(PAGES) - len(EMAIL_PAGES)) + len(PAGES))
+        assert summary["requests_planned"] == 1 + len(PAGES) + len(EMAIL_PAGES)
+        assert (summary["requests_planned"] + summary["requests_avoided"]
+                == 3 * (1 + len(PAGES)))
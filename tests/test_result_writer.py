@@ -0,0 +1,139 @@
+"""Tests for result_writer.py — streamed results and xlsx conversion."""
+import pandas as pd
+import pytest
+from result_writer import (
+    ROW_COLUMN,
+    CsvResultWriter,
+    open_result_writer,
+    read_results,
+    write_xlsx,
+)
+
+COLUMNS = [ROW_COLUMN, "Company Name", "Employees",
+           "Inferred_Country", "Country_Confidence"]
+
+
+def _rows():
+    return [
+        {ROW_COLUMN: 2, "Company Name": "C", "Employees": 30,
+         "Inferred_Country": "Germany", "Country_Confidence": "high"},
+        {ROW_COLUMN: 0, "Company Name": "A", "Employees": 10,
+         "Inferred_Country": None, "Country_Confidence": "low"},
+        {ROW_COLUMN: 1, "Company Name": "B", "Employees": None,
+         "Inferred_Country": "Germany", "Country_Confidence": "high"},
+    ]
+
+
+@pytest.fixture(params=["csv", "parquet"])
+def stream_path(request, tmp_path):
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    return str(tmp_path / f"results.{request.param}")
+
+
+# ── streaming round trip ───────────────────────────────────────
+class TestResultStream:
+    def test_rows_come_back_in_input_order(self, stream_path):
+        writer = open_result_writer(stream_path, COLUMNS)
+        for row in _rows():
+            writer.append(row)
+        writer.close()
+        df = read_results(stream_path)
+        assert list(df["Company Name"]) == ["A", "B", "C"]
+        assert ROW_COLUMN not in df.columns
+
+    def test_compact_dtypes(self, stream_path):
+        writer = open_result_writer(stream_path, COLUMNS)
+        for row in _rows():
+            writer.append(row)
+        writer.close()
+        df = read_results(stream_path, numeric_columns=["Employees"])
+        assert isinstance(df["Inferred_Country"].dtype, pd.CategoricalDtype)
+        assert isinstance(df["Country_Confidence"].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_numeric_dtype(df["Employees"])
+        assert pd.isna(df.loc[0, "Inferred_Country"])
+
+    def test_text_columns_stay_text(self, stream_path):
+        writer = open_result_writer(stream_path, [ROW_COLUMN, "Zip", "Phone"])
+        writer.append({ROW_COLUMN: 0, "Zip": "01234", "Phone": "0049301234"})
+        writer.close()
+        df = read_results(stream_path)
+        assert df.loc[0, "Zip"] == "01234"
+        assert df.loc[0, "Phone"] == "0049301234"
+
+    def test_append_keeps_last_copy_of_row(self, stream_path):
+        writer = open_result_writer(stream_path, COLUMNS)
+        writer.append({ROW_COLUMN: 0, "Company Name": "A",
+                       "Country_Confidence": "low"})
+        writer.close()
+        writer = open_result_writer(stream_path, COLUMNS, append=True)
+        writer.append({ROW_COLUMN: 0, "Company Name": "A",
+                       "Country_Confidence": "high"})
+        writer.close()
+        df = read_results(stream_path)
+        assert len(df) == 1
+        assert df.loc[0, "Country_Confidence"] == "high"
+
+    def test_fresh_stream_truncates(self, stream_path):
+        for _ in range(2):
+            writer = open_result_writer(stream_path, COLUMNS)
+            writer.append({ROW_COLUMN: 0, "Company Name": "A"})
+            writer.close()
+        assert len(read_results(stream_path)) == 1
+
+
+class TestParquetResultWriter:
+    def test_crashed_stream_moved_aside_on_resume(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        path = str(tmp_path / "results.parquet")
+        writer = open_result_writer(path, COLUMNS)
+        writer.append({ROW_COLUMN: 0, "Company Name": "A"})
+        writer.flush()   # row group on disk, footer never written
+        writer._writer.file_handle.flush()
+
+        writer = open_result_writer(path, COLUMNS, append=True)
+        writer.append({ROW_COLUMN: 1, "Company Name": "B"})
+        writer.close()
+        assert list(read_results(path)["Company Name"]) == ["B"]
+        assert (tmp_path / "results.parquet.corrupt").exists()
+
+    def test_changed_columns_start_fresh_on_resume(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        path = str(tmp_path / "results.parquet")
+        writer = open_result_writer(path, COLUMNS)
+        writer.append({ROW_COLUMN: 0, "Company Name": "A"})
+        writer.close()
+
+        columns = [*COLUMNS, "Industry"]
+        writer = open_result_writer(path, columns, append=True)
+        writer.append({ROW_COLUMN: 1, "Company Name": "B", "Industry": "IT"})
+        writer.close()
+        results = read_results(path)
+        assert list(results["Company Name"]) == ["B"]
+        assert list(results["Industry"]) == ["IT"]
+        assert (tmp_path / "results.parquet.stale").exists()
+
+
+class TestCsvResultWriter:
+    def test_rows_hit_disk_every_flush_every(self, tmp_path):
+        path = str(tmp_path / "r.csv")
+        writer = CsvResultWriter(path, ["Row", "X"], flush_every=2)
+        writer.append({"Row": 0, "X": "a"})
+        writer.append({"Row": 1, "X": "b"})
+        writer.append({"Row": 2, "X": "c"})
+        assert open(path, encoding="utf-8").read().count("\n") == 3
+        writer.close()
+        assert open(path, encoding="utf-8").read().count("\n") == 4
+
+
+# ── write_xlsx ─────────────────────────────────────────────────
+class TestWriteXlsx:
+    def test_round_trip(self, tmp_path):
+        df = pd.DataFrame({"Company Name": ["A", "B"],
+                           "Inferred_Country": pd.Categorical(["Germany", None])})
+        path = tmp_path / "out.xlsx"
+        write_xlsx(df, str(path))
+        back = pd.read_excel(path)
+        assert list(back.columns) == ["Company Name", "Inferred_Country"]
+        assert back.loc[0, "Inferred_Country"] == "Germany"
+        assert pd.isna(back.loc[1, "Inferred_Country"])
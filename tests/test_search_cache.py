@@ -0,0 +1,53 @@
+"""Tests for search_cache.py — memoized website search results."""
+import pytest
+import search_cache
+from search_cache import SearchCache, normalize_company_name
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = SearchCache(str(tmp_path / "search.sqlite"))
+    yield c
+    c.close()
+
+
+# ── normalize_company_name ─────────────────────────────────────
+class TestNormalizeCompanyName:
+    @pytest.mark.parametrize("a, b", [
+        ("Acme GmbH", "ACME  gmbh"),
+        ("A&B Ltd.", "a and b ltd"),
+        ("Ｓｉｅｍｅｎｓ AG", "siemens ag"),
+        ("  Bosch, Inc ", "bosch inc"),
+    ])
+    def test_equivalent_names(self, a, b):
+        assert normalize_company_name(a) == normalize_company_name(b)
+
+    def test_non_string(self):
+        assert normalize_company_name(None) == ""
+
+
+# ── SearchCache ────────────────────────────────────────────────
+class TestSearchCache:
+    def test_unknown_name_is_miss(self, cache):
+        assert cache.lookup("Acme") == (False, None)
+
+    def test_resolved_website(self, cache):
+        cache.store("Acme GmbH", "https://acme.de")
+        assert cache.lookup("ACME GmbH") == (True, "https://acme.de")
+
+    def test_cached_no_result(self, cache):
+        cache.store("Ghost Corp", None)
+        assert cache.lookup("Ghost Corp") == (True, None)
+
+    def test_no_result_expires_before_result(self, cache, monkeypatch):
+        cache.store("Acme", "https://acme.de")
+        cache.store("Ghost", None)
+        now = search_cache.time.time()
+        monkeypatch.setattr(search_cache.time, "time",
+                            lambda: now + cache.no_result_ttl + 1)
+        assert cache.lookup("Acme") == (True, "https://acme.de")
+        assert cache.lookup("Ghost") == (False, None)
+
+    def test_empty_name_never_cached(self, cache):
+        cache.store("", "https://x.com")
+        assert cache.lookup("") == (False, None)
@@ -0,0 +1,91 @@
+"""Tests for search_limiter.py — adaptive search pacing."""
+import threading
+import pytest
+import search_limiter
+from search_limiter import AdaptiveRateLimiter, backoff_delay
+
+
+class FakeClock:
+    """Deterministic clock; sleep() advances time instead of blocking."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _limiter(clock, **kwargs):
+    return AdaptiveRateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+# ── token bucket ───────────────────────────────────────────────
+class TestTokenBucket:
+    def test_burst_then_paced(self, clock):
+        limiter = _limiter(clock, rate=2.0, burst=2)
+        for _ in range(6):
+            limiter.acquire()
+        # 2 free, then one every 0.5 s
+        assert clock.now == pytest.approx(2.0)
+
+    def test_idle_time_refills_up_to_burst(self, clock):
+        limiter = _limiter(clock, rate=1.0, burst=2)
+        limiter.acquire()
+        limiter.acquire()
+        clock.now += 100
+        limiter.acquire()
+        limiter.acquire()
+        assert clock.sleeps == []
+
+
+# ── AIMD ───────────────────────────────────────────────────────
+class TestAdaptiveRate:
+    def test_additive_increase_capped(self, clock):
+        limiter = _limiter(clock, rate=1.0, step=0.5, max_rate=2.0)
+        for _ in range(5):
+            limiter.success()
+        assert limiter.rate == 2.0
+
+    def test_multiplicative_decrease_floored(self, clock):
+        limiter = _limiter(clock, rate=1.0, backoff_factor=0.5, min_rate=0.2)
+        for _ in range(5):
+            limiter.throttled(0)
+        assert limiter.rate == 0.2
+
+    def test_throttle_pauses_every_caller(self, clock):
+        limiter = _limiter(clock, rate=100.0, burst=5)
+        limiter.throttled(pause=10.0)
+        limiter.acquire()
+        assert clock.now >= 10.0
+
+
+# ── backoff ────────────────────────────────────────────────────
+class TestBackoff:
+    def test_full_jitter_within_cap(self):
+        for attempt in range(10):
+            delay = backoff_delay(attempt, base=1.0, cap=8.0)
+            assert 0 <= delay <= min(8.0, 2 ** attempt)
+
+    def test_default_cap(self):
+        assert backoff_delay(50) <= search_limiter.BACKOFF_MAX
+
+
+def test_thread_safe_acquire():
+    limiter = AdaptiveRateLimiter(rate=1000, max_rate=1000, burst=1000)
+    threads = [threading.Thread(target=lambda: [limiter.acquire() for _ in range(50)])
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert limiter._tokens <= limiter.burst
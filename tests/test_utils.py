@@ -80,3 +80,50 @@ class TestEdgeCases:
         """Ambiguous TLDs must not appear in the country map."""
         for tld in AMBIGUOUS_TLDS:
             assert tld not in CC_TLD_MAP, f"{tld} is in both AMBIGUOUS and CC_TLD_MAP"
+
+
+# ── offline extractor / memo ───────────────────────────────────
+class TestOfflineExtraction:
+    def test_never_fetches_suffix_list(self, monkeypatch):
+        import utils
+
+        def _no_network(*args, **kwargs):
+            raise AssertionError("suffix list download attempted")
+
+        monkeypatch.setattr("requests.adapters.HTTPAdapter.send", _no_network)
+        utils._country_for_website.cache_clear()
+        monkeypatch.setattr(utils, "_extractor", None)
+        assert infer_country_from_domain("https://firma.co.uk") == "United Kingdom"
+
+    def test_suffix_list_set_at_runtime(self, monkeypatch, tmp_path):
+        import utils
+        suffixes = tmp_path / "public_suffix_list.dat"
+        suffixes.write_text("de\n", encoding="utf-8")
+        monkeypatch.setattr(utils, "SUFFIX_LIST_URLS", (suffixes.as_uri(),))
+        monkeypatch.setattr(utils, "_extractor", None)
+        utils._country_for_website.cache_clear()
+        assert infer_country_from_domain("https://firma.de") == "Germany"
+        # Not in the local list, so no suffix and no country
+        assert infer_country_from_domain("https://firma.fr") is None
+        utils._country_for_website.cache_clear()
+
+    def test_results_are_memoized(self):
+        import utils
+        utils._country_for_website.cache_clear()
+        for _ in range(3):
+            infer_country_from_domain("https://memo.de")
+        info = utils._country_for_website.cache_info()
+        assert info.hits == 2 and info.misses == 1
+
+
+# ── batch variant ──────────────────────────────────────────────
+class TestInferCountryFromDomains:
+    def test_matches_scalar(self):
+        import pandas as pd
+        from utils import infer_country_from_domains
+        sites = pd.Series(["https://a.de", None, "b.co.uk", "https://a.de",
+                           "https://c.io", float("nan")], index=list("uvwxyz"))
+        out = infer_country_from_domains(sites)
+        assert list(out.index) == list("uvwxyz")
+        assert out.tolist() == [
+            "Germany", None, "United Kingdom", "Germany", None, None]
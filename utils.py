@@ -1,5 +1,29 @@
+import threading
+from functools import lru_cache
+
+import pandas as pd
 import tldextract
 
+# Offline-only suffix parsing: () never fetches the public suffix list
+# and uses the snapshot bundled with tldextract; point this at a local
+# file ("file:///.../public_suffix_list.dat") to use a newer snapshot.
+# Read when the first domain is parsed.
+SUFFIX_LIST_URLS = ()
+DOMAIN_MEMO_SIZE = 65536   # distinct websites remembered per process
+
+_extractor: tldextract.TLDExtract | None = None
+_extractor_lock = threading.Lock()
+
+
+def _get_extractor() -> tldextract.TLDExtract:
+    """The shared suffix parser, built from SUFFIX_LIST_URLS on first use."""
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = tldextract.TLDExtract(
+                suffix_list_urls=SUFFIX_LIST_URLS, cache_dir=None)
+        return _extractor
+
 CC_TLD_MAP = {
     "il": "Israel",
     "tr": "Turkey",
@@ -60,8 +84,15 @@ def infer_country_from_domain(website: str) -> str | None:
     Infer country from domain ccTLD using tldextract.
     Returns country name or None if uncertain.
     """
+    if not isinstance(website, str):
+        return None
+    return _country_for_website(website)
+
+
+@lru_cache(maxsize=DOMAIN_MEMO_SIZE)
+def _country_for_website(website: str) -> str | None:
     try:
-        extracted = tldextract.extract(website)
+        extracted = _get_extractor()(website)
         suffix = extracted.suffix.lower()
         # Handle compound TLDs like "co.uk" -> last part is "uk"
         tld = suffix.split(".")[-1]
@@ -75,3 +106,16 @@ def infer_country_from_domain(website: str) -> str | None:
         return None
     except Exception:
         return None
+
+
+def infer_country_from_domains(websites: pd.Series) -> pd.Series:
+    """
+    Batch infer_country_from_domain over a Series of websites, parsing
+    each distinct value once. Missing values map to None.
+    """
+    codes, distinct = pd.factorize(websites)
+    countries = [infer_country_from_domain(site) for site in distinct]
+    return pd.Series(
+        pd.array(countries + [None], dtype=object)[codes],
+        index=websites.index, dtype=object,
+    )